@@ -0,0 +1,245 @@
+"""API load-testing benchmark.
+
+Seeds a synthetic dataset, starts the app in-process against local fakes of the
+LLM and marketplace APIs (see fake_services.py), drives the hot endpoints at a
+fixed concurrency and reports latency percentiles, throughput, error counts and
+SQL queries per request. Results are written as a JSON baseline that later runs
+can be compared against.
+
+Usage (from the backend directory, DATABASE_URL pointing at a scratch database
+that has been migrated with `flask db upgrade`):
+    python benchmarks/api_benchmark.py --users 200 --months 12 --output baseline.json
+    python benchmarks/api_benchmark.py --skip-seed --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from fake_services import FakeServices  # noqa: E402
+
+# The app reports SQL statements per request as `db;dur=...;desc="N queries"`.
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+# Endpoint name -> (method, path template, JSON body). {username} and {goal_id}
+# are filled per request from the seeded dataset.
+ENDPOINTS = {
+    "dashboard": ("GET", "/api/dashboard/?username={username}", None),
+    "dashboard_insights": ("GET", "/api/dashboard/insights?username={username}", None),
+    "goal_timeline": ("GET", "/api/goals/{goal_id}/timeline?username={username}", None),
+    "transactions": ("GET", "/api/transactions/?username={username}", None),
+    "shop_search": ("POST", "/api/shop/search", {"query": "Samsung Galaxy phone"}),
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def query_count_from_server_timing(header):
+    """Extract the SQL statement count from the app's Server-Timing header."""
+    match = SERVER_TIMING_QUERIES.search(header or "")
+    return int(match.group(1)) if match else 0
+
+
+def load_fixtures(app, prefix, limit):
+    """Pick benchmark users and one active goal per user from the database."""
+    from configurations.database_config import db
+    from entities.goal import Goal
+    from entities.user import User
+
+    with app.app_context():
+        rows = (
+            db.session.query(User.username, Goal.id)
+            .join(Goal, Goal.user_id == User.id)
+            .filter(User.username.like(f"{prefix}_%"))
+            .order_by(User.username)
+            .limit(limit)
+            .all()
+        )
+    fixtures = {}
+    for username, goal_id in rows:
+        fixtures.setdefault(username, str(goal_id))
+    return list(fixtures.items())
+
+
+def run_endpoint(base_url, name, fixtures, total_requests, concurrency):
+    """Fire total_requests at one endpoint and summarize the results."""
+    method, template, body = ENDPOINTS[name]
+    latencies, queries, errors = [], [], 0
+    lock = threading.Lock()
+
+    def one_request(i):
+        nonlocal errors
+        username, goal_id = fixtures[i % len(fixtures)]
+        url = base_url + template.format(username=username, goal_id=goal_id)
+        started = time.perf_counter()
+        try:
+            response = requests.request(method, url, json=body, timeout=120)
+            ok = response.status_code < 400
+            query_count = query_count_from_server_timing(
+                response.headers.get("Server-Timing")
+            )
+        except requests.RequestException:
+            ok, query_count = False, 0
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed_ms)
+            queries.append(query_count)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one_request, range(total_requests)))
+    wall_seconds = time.perf_counter() - started
+
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(total_requests / wall_seconds, 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_queries": round(statistics.mean(queries), 2),
+        "max_queries": max(queries),
+    }
+
+
+def print_report(results, baseline=None):
+    """Print a table of results, with percentage change against a baseline."""
+    columns = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "mean_queries", "errors")
+    print(f"{'endpoint':<20}" + "".join(f"{c:>22}" for c in columns))
+    for name, stats in results["endpoints"].items():
+        cells = []
+        for column in columns:
+            cell = f"{stats[column]}"
+            previous = (baseline or {}).get("endpoints", {}).get(name, {}).get(column)
+            if previous:
+                cell += f" ({(stats[column] - previous) / previous * 100:+.1f}%)"
+            cells.append(f"{cell:>22}")
+        print(f"{name:<20}" + "".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--users", type=int, default=200, help="Synthetic users to seed."
+    )
+    parser.add_argument(
+        "--months", type=int, default=12, help="Months of history per user."
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Random seed for the dataset."
+    )
+    parser.add_argument(
+        "--skip-seed",
+        action="store_true",
+        help="Reuse a dataset seeded by an earlier run.",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel clients.")
+    parser.add_argument(
+        "--requests", type=int, default=100, help="Requests per endpoint."
+    )
+    parser.add_argument(
+        "--endpoints",
+        default=",".join(ENDPOINTS),
+        help="Comma-separated subset of: " + ", ".join(ENDPOINTS),
+    )
+    parser.add_argument(
+        "--llm-latency-ms", type=int, default=300, help="Fake LLM latency."
+    )
+    parser.add_argument(
+        "--llm-tokens", type=int, default=120, help="Fake completion tokens."
+    )
+    parser.add_argument(
+        "--output", help="Write results as a JSON baseline to this path."
+    )
+    parser.add_argument("--compare", help="Baseline JSON to compare results against.")
+    args = parser.parse_args()
+
+    # 1. Start the fakes and point the app at them before it is imported.
+    fakes = FakeServices(
+        llm_latency_ms=args.llm_latency_ms, completion_tokens=args.llm_tokens
+    ).start()
+    os.environ["USE_LOCAL_LLM"] = "true"
+    os.environ["LOCAL_LLM_URL"] = f"{fakes.base_url}/v1"
+    os.environ["TEXNOMART_API_URL"] = f"{fakes.base_url}/texnomart/search"
+    os.environ["CHAKANA_API_URL"] = f"{fakes.base_url}/chakana/search"
+
+    from werkzeug.serving import make_server
+
+    from app import create_app
+    from configurations.database_config import db
+    from services.seedings.synthetic_data_seeding import SyntheticDataSeedingService
+
+    app = create_app()
+
+    # 2. Seed the dataset.
+    prefix = "benchmark"
+    if not args.skip_seed:
+        with app.app_context():
+            try:
+                SyntheticDataSeedingService(
+                    args.users, args.months, seed=args.seed, prefix=prefix
+                ).seed()
+            except ValueError as e:
+                sys.exit(f"{e} Pass --skip-seed to reuse them.")
+            db.engine.dispose()
+    fixtures = load_fixtures(app, f"{prefix}_{args.seed}", args.users)
+    if not fixtures:
+        sys.exit("No benchmark users found; run without --skip-seed first.")
+
+    # 3. Serve the app in-process.
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    # 4. Drive each endpoint.
+    results = {
+        "config": {
+            "users": args.users,
+            "months": args.months,
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "llm_latency_ms": args.llm_latency_ms,
+        },
+        "endpoints": {},
+    }
+    for name in args.endpoints.split(","):
+        print(f"Benchmarking {name}...", file=sys.stderr)
+        results["endpoints"][name] = run_endpoint(
+            base_url, name, fixtures, args.requests, args.concurrency
+        )
+    results["llm_calls"] = fakes.llm_calls
+    server.shutdown()
+    fakes.shutdown()
+
+    # 5. Report and persist.
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(results, baseline)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
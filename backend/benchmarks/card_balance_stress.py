@@ -0,0 +1,228 @@
+"""Concurrency stress test for card balance updates.
+
+Creates a scratch user with one card, then fires many concurrent OUTGOING
+payments at that card through POST /api/transactions/. Together the payments ask
+for more than the card holds. The run passes when:
+- the number of approved payments equals balance // amount,
+- the final balance equals the starting balance minus the approved payments, and
+  is never negative,
+- one transaction row exists per approved payment,
+- folding the card's ledger entries into a snapshot leaves the balance unchanged.
+
+A lost update (two payments reading the same balance) would show up as more
+approved payments than the balance allows, or as a final balance that is too high.
+`--legacy` runs the old read-check-write update (SELECT, compare in Python,
+assign, commit) directly against the same card for comparison.
+
+Usage (from the backend directory, DATABASE_URL pointing at a migrated database):
+    python benchmarks/card_balance_stress.py --payments 400 --concurrency 32
+    python benchmarks/card_balance_stress.py --legacy
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from fake_services import FakeServices  # noqa: E402
+
+
+def payment_body(user_id, card_id, amount, index):
+    """TransactionCreateModel JSON for one card-to-merchant payment."""
+    return {
+        "user_id": user_id,
+        "external_id": f"stress-{uuid.uuid4()}",
+        "transaction_type": "P2M_PAYMENT",
+        "transaction_status": "APPROVED",
+        "transaction_direction": "OUTGOING",
+        "amount": amount,
+        "currency": "UZS",
+        "fee": 0,
+        "description": f"Stress payment {index}",
+        "card": {
+            "card_id": card_id,
+            "masked": "8600****0000",
+            "brand": "Uzcard",
+            "hash": "stress",
+            "token": "stress",
+        },
+        "sender": {"type": "CARD", "card_id": card_id},
+        "receiver": {"type": "MERCHANT", "merchant_name": "Stress Test Shop"},
+        "merchant_name": "Stress Test Shop",
+        "network": "Uzcard",
+        "gateway": "stress",
+        "rrn": f"{index:012d}",
+        "approval_code": "000000",
+        "response_code": "00",
+        "metadata": {},
+    }
+
+
+def create_fixture(app, balance):
+    """Scratch user and card; returns (user_id, card_id)."""
+    from configurations.database_config import db
+    from entities.card import Card
+    from entities.user import User
+
+    with app.app_context():
+        user = User(username=f"stress_{uuid.uuid4().hex[:8]}", first_name="Stress")
+        db.session.add(user)
+        db.session.flush()
+        card = Card(
+            user_id=user.id,
+            card_name="Stress card",
+            card_number="8600000000000000",
+            balance=balance,
+        )
+        db.session.add(card)
+        db.session.commit()
+        return str(user.id), str(card.id)
+
+
+def read_state(app, user_id, card_id):
+    """(card balance, transaction rows) for the fixture."""
+    from entities.transaction import Transaction
+    from services.core.card_ledger_service import CardLedgerService
+
+    with app.app_context():
+        balance = CardLedgerService.get_balance(card_id)
+        rows = Transaction.query.filter_by(user_id=user_id).count()
+        return balance, rows
+
+
+def compact_fixture(app, card_id):
+    """Fold the fixture's ledger entries into a snapshot; returns the new balance."""
+    from services.core.card_ledger_service import CardLedgerService
+
+    with app.app_context():
+        CardLedgerService.compact(card_ids=[card_id], lag_seconds=0)
+        return CardLedgerService.get_balance(card_id)
+
+
+def drop_fixture(app, user_id, card_id):
+    from configurations.database_config import db
+    from entities.card import Card
+    from entities.card_ledger import CardBalanceSnapshot, CardLedgerEntry
+    from entities.monthly_category_spend import UserMonthlyCategorySpend
+    from entities.transaction import Transaction
+    from entities.user import User
+    from entities.user_data_version import UserDataVersion
+
+    with app.app_context():
+        Transaction.query.filter_by(user_id=user_id).delete()
+        UserMonthlyCategorySpend.query.filter_by(user_id=user_id).delete()
+        CardBalanceSnapshot.query.filter_by(card_id=card_id).delete()
+        CardLedgerEntry.query.filter_by(card_id=card_id).delete()
+        Card.query.filter_by(id=card_id).delete()
+        UserDataVersion.query.filter_by(user_id=user_id).delete()
+        User.query.filter_by(id=user_id).delete()
+        db.session.commit()
+
+
+def legacy_debit(app, card_id, amount):
+    """The original CardService.update_balance: read, check in Python, write."""
+    from configurations.database_config import db
+    from entities.card import Card
+
+    with app.app_context():
+        card = db.session.get(Card, card_id)
+        if card.balance < amount:
+            return False
+        card.balance -= amount
+        db.session.commit()
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--balance", type=float, default=1_000_000, help="Starting card balance."
+    )
+    parser.add_argument(
+        "--amount", type=float, default=5_000, help="Amount of each payment."
+    )
+    parser.add_argument(
+        "--payments", type=int, default=400, help="Payments fired at the card."
+    )
+    parser.add_argument("--concurrency", type=int, default=32, help="Parallel clients.")
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Run the old read-check-write update instead of the API.",
+    )
+    args = parser.parse_args()
+
+    # 1. Start the LLM fake (categorization) and the app.
+    fakes = FakeServices(llm_latency_ms=0).start()
+    os.environ["USE_LOCAL_LLM"] = "true"
+    os.environ["LOCAL_LLM_URL"] = f"{fakes.base_url}/v1"
+
+    from werkzeug.serving import make_server
+
+    from app import create_app
+
+    app = create_app()
+    user_id, card_id = create_fixture(app, args.balance)
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    # 2. Fire the payments concurrently.
+    def pay(index):
+        if args.legacy:
+            return legacy_debit(app, card_id, args.amount)
+        response = requests.post(
+            f"{base_url}/api/transactions/",
+            json=payment_body(user_id, card_id, args.amount, index),
+            timeout=120,
+        )
+        return response.status_code == 201
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        approved = sum(pool.map(pay, range(args.payments)))
+    elapsed = time.perf_counter() - started
+
+    # 3. Check the invariants.
+    balance, rows = read_state(app, user_id, card_id)
+    expected_approved = min(args.payments, int(args.balance // args.amount))
+    checks = {
+        "approved payments": (approved, expected_approved),
+        "final balance": (balance, args.balance - approved * args.amount),
+        "balance never negative": (balance >= 0, True),
+    }
+    if not args.legacy:
+        checks["transaction rows"] = (rows, approved)
+        checks["balance after compaction"] = (compact_fixture(app, card_id), balance)
+
+    print(
+        f"{'legacy' if args.legacy else 'api'}: {args.payments} payments of "
+        f"{args.amount:,.0f} against {args.balance:,.0f} at concurrency "
+        f"{args.concurrency} in {elapsed:.2f}s"
+    )
+    failed = False
+    for name, (actual, expected) in checks.items():
+        ok = actual == expected
+        failed |= not ok
+        print(f"  {'OK  ' if ok else 'FAIL'} {name}: {actual} (expected {expected})")
+
+    server.shutdown()
+    fakes.shutdown()
+    drop_fixture(app, user_id, card_id)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Local fakes for the external services the API calls during benchmarks.
+
+One threaded HTTP server provides:
+- POST /v1/chat/completions: OpenAI-compatible chat endpoint with a fixed latency
+  and a fixed completion token count. Structured-output requests (json_schema
+  response_format or function tools) get a minimal valid instance of the schema.
+- GET /texnomart/search: Texnomart search API shaped response.
+- GET /chakana/search: Chakana search API shaped response.
+
+Point the app at it with USE_LOCAL_LLM=true, LOCAL_LLM_URL=<base>/v1,
+TEXNOMART_API_URL=<base>/texnomart/search and CHAKANA_API_URL=<base>/chakana/search.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+def example_from_schema(schema: dict, root: dict):
+    """Build the smallest valid instance of a JSON schema (refs, enums, anyOf)."""
+    if "$ref" in schema:
+        name = schema["$ref"].split("/")[-1]
+        return example_from_schema(root.get("$defs", {})[name], root)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "anyOf" in schema:
+        options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+        return example_from_schema(options[0], root) if options else None
+    if "allOf" in schema:
+        return example_from_schema(schema["allOf"][0], root)
+
+    schema_type = schema.get("type", "object")
+    if schema_type == "object":
+        return {
+            key: example_from_schema(value, root)
+            for key, value in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        return [example_from_schema(schema.get("items", {}), root)]
+    if schema_type == "string":
+        return "Benchmark placeholder text."
+    if schema_type == "integer":
+        return 1
+    if schema_type == "number":
+        return 1.0
+    if schema_type == "boolean":
+        return False
+    return None
+
+
+class FakeServicesHandler(BaseHTTPRequestHandler):
+    """Request handler; behaviour is configured on the server instance."""
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable.
+        pass
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.startswith("/texnomart"):
+            products = [
+                {
+                    "id": 1000 + i,
+                    "name": f"Benchmark Product {i}",
+                    "sale_price": 1_000_000 + i * 250_000,
+                    "image": "",
+                    "all_count": 3,
+                }
+                for i in range(20)
+            ]
+            self._send_json({"success": True, "data": {"products": products}})
+        elif path.startswith("/chakana"):
+            products = [
+                {
+                    "id": 2000 + i,
+                    "name_ru": f"Benchmark Chakana Product {i}",
+                    "price_full": 900_000 + i * 200_000,
+                    "offers_count": 2,
+                }
+                for i in range(5)
+            ]
+            self._send_json({"status": 1, "data": {"products": products}})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not urlparse(self.path).path.endswith("/chat/completions"):
+            self._send_json({"error": "not found"}, 404)
+            return
+
+        time.sleep(self.server.llm_latency_ms / 1000)
+        self.server.record_llm_call()
+
+        message = {"role": "assistant", "content": "Benchmark placeholder text."}
+        response_format = request.get("response_format") or {}
+        tools = request.get("tools") or []
+        if response_format.get("type") == "json_schema":
+            schema = response_format["json_schema"]["schema"]
+            message["content"] = json.dumps(example_from_schema(schema, schema))
+        elif tools:
+            function = tools[0]["function"]
+            schema = function.get("parameters", {})
+            message["content"] = None
+            message["tool_calls"] = [
+                {
+                    "id": "call_benchmark",
+                    "type": "function",
+                    "function": {
+                        "name": function["name"],
+                        "arguments": json.dumps(example_from_schema(schema, schema)),
+                    },
+                }
+            ]
+
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in request["messages"])
+        self._send_json(
+            {
+                "id": "chatcmpl-benchmark",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "benchmark"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": message,
+                        "finish_reason": "tool_calls" if tools else "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_chars // 4,
+                    "completion_tokens": self.server.completion_tokens,
+                    "total_tokens": prompt_chars // 4 + self.server.completion_tokens,
+                },
+            }
+        )
+
+
+class FakeServices(ThreadingHTTPServer):
+    """Threaded fake server for the LLM and marketplace APIs."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, port: int = 0, llm_latency_ms: int = 300, completion_tokens: int = 120
+    ):
+        super().__init__(("127.0.0.1", port), FakeServicesHandler)
+        self.llm_latency_ms = llm_latency_ms
+        self.completion_tokens = completion_tokens
+        self.llm_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def record_llm_call(self):
+        with self._lock:
+            self.llm_calls += 1
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
@@ -0,0 +1,141 @@
+"""Check read-replica routing against two local databases.
+
+Point DATABASE_URL at the primary and DATABASE_REPLICA_URLS at a second database,
+e.g. a copy made with `CREATE DATABASE ff_replica TEMPLATE ff`. The copy does not
+replicate, which makes routing visible: rows written to the primary never show up
+on the "replica". The script serves the app in-process (LLM faked) and checks that
+- analytic GETs (dashboard, goal timelines, transaction listing) run their SELECTs
+  on the replica,
+- a new transaction is written to the primary, and the same user's next listing
+  reads the primary and sees it (read-your-writes),
+- reads fall back to the primary when the replica lags or is unreachable.
+
+Usage (from the backend directory):
+    DATABASE_REPLICA_URLS=postgresql://.../ff_replica python benchmarks/replica_routing_check.py
+"""
+
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from card_balance_stress import (  # noqa: E402
+    create_fixture,
+    drop_fixture,
+    payment_body,
+)
+from fake_services import FakeServices  # noqa: E402
+
+DEMO_USERNAME = "khasanrashidov"
+
+
+def main():
+    if not os.getenv("DATABASE_REPLICA_URLS"):
+        sys.exit("Set DATABASE_REPLICA_URLS to a second database.")
+
+    fakes = FakeServices(llm_latency_ms=0).start()
+    os.environ["USE_LOCAL_LLM"] = "true"
+    os.environ["LOCAL_LLM_URL"] = f"{fakes.base_url}/v1"
+
+    from sqlalchemy import event
+
+    import configurations.database_config as database_config
+    from app import create_app
+    from configurations.database_config import db
+
+    app = create_app()
+    client = app.test_client()
+
+    # 1. Count statements per engine (bind key None is the primary).
+    statements = Counter()
+    with app.app_context():
+        for key, engine in db.engines.items():
+
+            def count(conn, cursor, statement, *args, name=key or "primary"):
+                if not statement.lstrip().upper().startswith("SELECT CASE"):
+                    statements[name] += 1
+
+            event.listen(engine, "before_cursor_execute", count)
+
+    def run(label, method, path, **kwargs):
+        statements.clear()
+        response = getattr(client, method)(path, **kwargs)
+        print(f"  {label}: HTTP {response.status_code}, statements {dict(statements)}")
+        return response, dict(statements)
+
+    checks = {}
+    user_id, card_id = create_fixture(app, 1_000_000)
+    with app.app_context():
+        from entities.user import User
+
+        username = db.session.get(User, user_id).username
+
+    try:
+        # 2. Analytic reads go to the replica (user lookups stay on the primary).
+        print("analytic reads:")
+        for label, path in [
+            ("dashboard", f"/api/dashboard/?username={DEMO_USERNAME}"),
+            ("timelines", f"/api/goals/timelines?username={DEMO_USERNAME}"),
+            ("transactions", f"/api/transactions/?username={DEMO_USERNAME}"),
+        ]:
+            _, counts = run(label, "get", path)
+            checks[f"{label} on replica"] = counts.get("replica_0", 0) > 0
+
+        # 3. Writes go to the primary; the writer's next read stays there.
+        print("read-your-writes:")
+        response, counts = run(
+            "create transaction",
+            "post",
+            "/api/transactions/",
+            json=payment_body(user_id, card_id, 5_000, 1),
+        )
+        checks["write on primary"] = (
+            response.status_code == 201 and "replica_0" not in counts
+        )
+        response, counts = run(
+            "writer's listing", "get", f"/api/transactions/?username={username}"
+        )
+        checks["writer reads own write"] = (
+            len(response.get_json()["data"]) == 1 and "replica_0" not in counts
+        )
+
+        # 4. Fallbacks.
+        print("fallbacks:")
+        database_config.REPLICA_MAX_LAG_SECONDS = -1
+        database_config._replica_lag.clear()
+        _, counts = run(
+            "replica lagging", "get", f"/api/dashboard/?username={DEMO_USERNAME}"
+        )
+        checks["lagging replica skipped"] = "replica_0" not in counts
+        database_config.REPLICA_MAX_LAG_SECONDS = 5
+        database_config._replica_lag.clear()
+
+        def unreachable(engine):
+            raise ConnectionError("connection refused")
+
+        measure_lag = database_config._replica_lag_seconds
+        database_config._replica_lag_seconds = unreachable
+        database_config._replica_lag.clear()
+        _, counts = run(
+            "replica down", "get", f"/api/dashboard/?username={DEMO_USERNAME}"
+        )
+        checks["unreachable replica skipped"] = "replica_0" not in counts
+        database_config._replica_lag_seconds = measure_lag
+    finally:
+        drop_fixture(app, user_id, card_id)
+        fakes.shutdown()
+
+    failed = False
+    for name, ok in checks.items():
+        failed |= not ok
+        print(f"  {'OK  ' if ok else 'FAIL'} {name}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Transaction serialization benchmark.
+
+Serializes N transactions (10,000 by default) to a JSON response body three ways:
+- legacy:   Transaction.to_dict() per row, encoded by Flask's default provider
+            (stdlib json, sorted keys, ASCII escapes),
+- to_dict:  Transaction.to_dict() per row, encoded by the orjson provider,
+- rows:     SUMMARY_ROWS dicts built from result tuples, encoded by the orjson
+            provider (what the transaction listing does).
+
+With `--source memory` (default) the rows are built in memory, so only
+serialization is timed. With `--source db` the first N rows of `transactions` are
+loaded from DATABASE_URL on every run (ORM entities for legacy/to_dict, a plain
+SELECT for rows), so row construction is timed as well. Both produce the same
+JSON document once decoded; the script checks that.
+
+Usage (from the backend directory):
+    python benchmarks/serialization_benchmark.py --rows 10000 --runs 7
+    python benchmarks/serialization_benchmark.py --source db
+"""
+
+import argparse
+import datetime
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+MERCHANTS = ["Korzinka", "Makro", "Texnomart", "Yandex Go", "Evos", "Uzum Market"]
+CATEGORIES = ["Food", "Groceries", "Transport", "Shopping", "Entertainment", "Bills"]
+
+
+def build_transactions(n_rows: int):
+    """Transient Transaction entities and the matching SUMMARY_ROWS tuples."""
+    from entities.transaction import SUMMARY_ROWS, Transaction
+    from enums import (
+        TransactionDirectionEnum,
+        TransactionStatusEnum,
+        TransactionTypeEnum,
+    )
+
+    rng = random.Random(42)
+    user_id, card_id = uuid.uuid4(), uuid.uuid4()
+    start = datetime.datetime(2025, 1, 1)
+    entities, tuples = [], []
+    for i in range(n_rows):
+        date = start + datetime.timedelta(
+            minutes=37 * i, microseconds=rng.randint(0, 999_999)
+        )
+        merchant = rng.choice(MERCHANTS)
+        transaction = Transaction(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            amount=float(rng.randint(5, 500) * 1000),
+            currency="UZS",
+            merchant=merchant,
+            date=date,
+            category=rng.choice(CATEGORIES),
+            card_id=card_id,
+            status=TransactionStatusEnum.APPROVED,
+            external_id=f"ext_{i:08d}",
+            transaction_type=TransactionTypeEnum.P2M_PAYMENT,
+            transaction_direction=TransactionDirectionEnum.OUTGOING,
+            fee=0.0,
+            processed_at=date,
+            gateway="HUMO",
+            rrn=f"{i:012d}",
+            is_recurring=False,
+            created_at=date,
+        )
+        entities.append(transaction)
+        tuples.append(tuple(getattr(transaction, c.key) for c in SUMMARY_ROWS.columns))
+    return entities, tuples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--source", choices=("memory", "db"), default="memory")
+    args = parser.parse_args()
+
+    from flask import Flask
+    from flask.json.provider import DefaultJSONProvider
+
+    from configurations.json_provider import OrjsonProvider
+    from entities.transaction import SUMMARY_ROWS, Transaction
+
+    if args.source == "db":
+        from app import create_app
+        from configurations.database_config import db
+
+        app = create_app()
+    else:
+        app = Flask(__name__)
+        entities, tuples = build_transactions(args.rows)
+    legacy_json, orjson_json = DefaultJSONProvider(app), OrjsonProvider(app)
+
+    def load_entities():
+        if args.source == "memory":
+            return entities
+        db.session.expunge_all()
+        return Transaction.query.order_by(Transaction.date).limit(args.rows).all()
+
+    def load_tuples():
+        if args.source == "memory":
+            return tuples
+        query = SUMMARY_ROWS.select().order_by(Transaction.date).limit(args.rows)
+        return db.session.execute(query).all()
+
+    variants = {
+        "legacy": lambda: legacy_json.response(
+            data=[t.to_dict(detail=False) for t in load_entities()]
+        ),
+        "to_dict": lambda: orjson_json.response(
+            data=[t.to_dict(detail=False) for t in load_entities()]
+        ),
+        "rows": lambda: orjson_json.response(data=SUMMARY_ROWS(load_tuples())),
+    }
+
+    with app.app_context():
+        bodies = {name: run().get_data() for name, run in variants.items()}
+        documents = {name: legacy_json.loads(body) for name, body in bodies.items()}
+        n_rows = len(documents["legacy"]["data"])
+        same = documents["legacy"] == documents["to_dict"] == documents["rows"]
+
+        print(f"{n_rows:,} transactions from {args.source}, {args.runs} runs")
+        print(
+            f"{'variant':<10}{'median ms':>12}{'min ms':>10}{'rows/s':>14}{'bytes':>12}"
+        )
+        baseline = None
+        for name, run in variants.items():
+            timings = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            median = statistics.median(timings)
+            baseline = baseline or median
+            print(
+                f"{name:<10}{median:>12.1f}{min(timings):>10.1f}"
+                f"{n_rows / median * 1000:>14,.0f}{len(bodies[name]):>12,}"
+                f"   x{baseline / median:.1f}"
+            )
+        print(f"decoded documents identical: {same}")
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Worker boot-time benchmark.
+
+Measures how long a fresh interpreter needs to import the application and
+build a WSGI app object, which is what every gunicorn worker pays at boot.
+
+Usage (from the backend directory):
+    python benchmarks/startup_benchmark.py --runs 10
+    python benchmarks/startup_benchmark.py --target "app:app"   # legacy layout.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Child process script: import the target and build the app, then report timing.
+BOOT_SCRIPT = """
+import importlib
+import json
+import sys
+import time
+
+start = time.perf_counter()
+module_name, _, attr = sys.argv[1].partition(":")
+module = importlib.import_module(module_name)
+if attr.endswith("()"):
+    getattr(module, attr[:-2])()
+else:
+    getattr(module, attr)
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in ("langchain_core", "langchain_openai", "openai") if m in sys.modules)
+print(json.dumps({"seconds": elapsed, "heavy_modules": heavy}))
+"""
+
+
+def run_once(target: str, env: dict) -> dict:
+    """Boot the app once in a fresh interpreter and return its timing report."""
+    result = subprocess.run(
+        [sys.executable, "-c", BOOT_SCRIPT, target],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # The app logs to stdout as well, the report is always the last line.
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="app:create_app()")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Optional path to write the JSON report.")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    samples = []
+    heavy_modules = []
+    for i in range(args.runs):
+        report = run_once(args.target, env)
+        samples.append(report["seconds"])
+        heavy_modules = report["heavy_modules"]
+        print(f"run {i + 1}/{args.runs}: {report['seconds'] * 1000:.1f} ms")
+
+    summary = {
+        "target": args.target,
+        "runs": args.runs,
+        "min_ms": round(min(samples) * 1000, 1),
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+        "heavy_modules_loaded": heavy_modules,
+    }
+    print(json.dumps(summary, indent=2))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
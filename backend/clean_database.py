@@ -11,17 +11,22 @@ os.chdir(src_dir)
 # Add src directory to path so we can import from it
 sys.path.insert(0, str(src_dir))
 
-# Add a flag to prevent seeding when importing app
-sys.argv.append("db")  # Trick the app into thinking we're running a db command
-
 from dotenv import load_dotenv
-from app import app
+from app import create_app
 from configurations.database_config import db
 from configurations.logging_config import get_logger
 from entities.transaction import Transaction
+from entities.transaction_archive import TransactionArchiveSegment
 from entities.goal import Goal
 from entities.card import Card
+from entities.card_ledger import CardBalanceSnapshot, CardLedgerEntry
 from entities.user import User
+from entities.user_data_version import UserDataVersion
+from entities.monthly_category_spend import UserMonthlyCategorySpend
+from entities.precomputed_insight import PrecomputedInsight
+from entities.spending_anomaly import SpendingAnomaly
+from entities.spending_anomaly_scan import SpendingAnomalyScan
+from entities.user_subscription import UserSubscription
 
 # Load environment variables from project root
 load_dotenv(dotenv_path=project_root / ".env")
@@ -30,6 +35,7 @@ logger = get_logger(__name__)
 
 def clean_database():
     """Remove all transactions and goals from database."""
+    app = create_app()
     with app.app_context():
         try:
             logger.info("=== Starting Database Cleanup ===")
@@ -46,6 +52,16 @@ def clean_database():
             logger.info(f"  - Transactions: {transaction_count}")
             logger.info(f"  - Goals: {goal_count}")
 
+            # Delete derived data (rollup, stored insights, anomalies, subscriptions)
+            UserMonthlyCategorySpend.query.delete()
+            PrecomputedInsight.query.delete()
+            SpendingAnomaly.query.delete()
+            SpendingAnomalyScan.query.delete()
+            UserSubscription.query.delete()
+            # Segment files without an index row are never read; the next
+            # archive run overwrites them.
+            TransactionArchiveSegment.query.delete()
+
             # Delete transactions (they depend on cards and users)
             if transaction_count > 0:
                 Transaction.query.delete()
@@ -56,12 +72,15 @@ def clean_database():
                 Goal.query.delete()
                 logger.info(f"✓ Deleted {goal_count} goals")
 
-            # Delete cards (they depend on users)
+            # Delete card ledger and cards (they depend on users)
+            CardBalanceSnapshot.query.delete()
+            CardLedgerEntry.query.delete()
             if card_count > 0:
                 Card.query.delete()
                 logger.info(f"✓ Deleted {card_count} cards")
 
             # Delete users
+            UserDataVersion.query.delete()
             if user_count > 0:
                 User.query.delete()
                 logger.info(f"✓ Deleted {user_count} users")
@@ -0,0 +1,36 @@
+"""Gunicorn configuration for the Fast Forward API.
+
+Run from the `src` directory:
+    gunicorn -c ../deploy/gunicorn.conf.py "app:create_app()"
+
+Migrations and seeding run once in the master process (`on_starting`) before any
+worker is forked, instead of in every worker at import time. Set
+RUN_MIGRATIONS_ON_START=false / SEED_ON_START=false to skip them, e.g. when a
+separate release step already ran `flask bootstrap`.
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", "127.0.0.1:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def on_starting(server):
+    """Leader hook: runs once in the gunicorn master before workers start."""
+    from app import create_app
+    from commands.db_commands import (
+        RUN_MIGRATIONS_ON_START,
+        SEED_ON_START,
+        run_bootstrap,
+    )
+
+    if not (RUN_MIGRATIONS_ON_START or SEED_ON_START):
+        server.log.info("Skipping bootstrap (disabled by environment).")
+        return
+
+    try:
+        run_bootstrap(create_app(), migrate=RUN_MIGRATIONS_ON_START, seed=SEED_ON_START)
+    except Exception as e:
+        # Keep serving with the existing schema/data, like the old import-time hook.
+        server.log.error(f"Bootstrap failed: {e}")
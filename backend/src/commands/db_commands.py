@@ -0,0 +1,241 @@
+import os
+
+import click
+from flask import Flask
+from flask_migrate import upgrade
+from sqlalchemy import text
+
+from configurations.database_config import db
+from configurations.logging_config import get_logger
+from entities.user import User
+from services.core.card_ledger_service import CardLedgerService
+from services.core.insight_precompute_service import InsightPrecomputeService
+from services.core.recurring_payment_service import RecurringPaymentService
+from services.core.spending_anomaly_batch_service import (
+    DEFAULT_CHUNK_SIZE,
+    SpendingAnomalyBatchService,
+)
+from services.core.spending_rollup_service import SpendingRollupService
+from services.core.transaction_archive_service import (
+    TRANSACTION_ARCHIVE_HORIZON_MONTHS,
+    TransactionArchiveService,
+)
+from services.core.transaction_partition_service import (
+    TRANSACTION_PARTITION_MONTHS_AHEAD,
+    TRANSACTION_RETENTION_MONTHS,
+    TransactionPartitionService,
+)
+from services.seedings.seeding_service import SeedingService
+from services.seedings.synthetic_data_seeding import SyntheticDataSeedingService
+
+logger = get_logger(__name__)
+
+# Arbitrary but fixed key for the Postgres advisory lock that elects a single
+# bootstrap leader when several processes (or hosts) start at the same time.
+BOOTSTRAP_LOCK_KEY = 500_026
+
+# Environment switches for the gunicorn `on_starting` hook.
+RUN_MIGRATIONS_ON_START = os.getenv("RUN_MIGRATIONS_ON_START", "true").lower() == "true"
+SEED_ON_START = os.getenv("SEED_ON_START", "true").lower() == "true"
+
+
+def run_bootstrap(app: Flask, migrate: bool = True, seed: bool = True):
+    """Apply migrations and seed default data exactly once.
+
+    On PostgreSQL a session-level advisory lock makes concurrent callers wait
+    for the leader and then find nothing left to do (migrations are already at
+    head and seeding is idempotent). Other databases run without the lock.
+    """
+    with app.app_context():
+        connection = db.engine.connect()
+        use_lock = connection.dialect.name == "postgresql"
+        try:
+            if use_lock:
+                logger.info("Waiting for bootstrap advisory lock.")
+                connection.execute(
+                    text("SELECT pg_advisory_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY}
+                )
+
+            if migrate:
+                logger.info("Running database migrations.")
+                upgrade()
+                logger.info("Database migrations completed successfully.")
+
+            if seed:
+                SeedingService.seed_all_data(app)
+        finally:
+            if use_lock:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": BOOTSTRAP_LOCK_KEY},
+                )
+            connection.close()
+            # Do not leak pooled connections into forked gunicorn workers.
+            db.engine.dispose()
+
+
+def register_db_commands(app: Flask):
+    """Register database CLI commands on the app."""
+
+    @app.cli.command("seed")
+    def seed_command():
+        """Seed default users, cards, transactions and goals."""
+        SeedingService.seed_all_data(app)
+
+    @app.cli.command("bootstrap")
+    @click.option("--skip-migrations", is_flag=True, help="Do not run migrations.")
+    @click.option("--skip-seed", is_flag=True, help="Do not seed default data.")
+    def bootstrap_command(skip_migrations, skip_seed):
+        """Apply migrations and seed data once (safe to run concurrently)."""
+        run_bootstrap(app, migrate=not skip_migrations, seed=not skip_seed)
+
+    @app.cli.command("seed-synthetic")
+    @click.option("--users", type=int, default=100, show_default=True)
+    @click.option("--months", type=int, default=12, show_default=True)
+    @click.option("--seed", type=int, default=42, show_default=True)
+    @click.option(
+        "--method",
+        type=click.Choice(["auto", "copy", "bulk"]),
+        default="auto",
+        show_default=True,
+        help="copy = Postgres COPY, bulk = bulk_insert_mappings.",
+    )
+    @click.option("--batch-size", type=int, default=20000, show_default=True)
+    def seed_synthetic_command(users, months, seed, method, batch_size):
+        """Generate N users x M months of synthetic transactions for load testing."""
+        try:
+            SyntheticDataSeedingService(users=users, months=months, seed=seed).seed(
+                method=method, batch_size=batch_size
+            )
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        # Back-dated rows land in the default partition; give them their months.
+        TransactionPartitionService.ensure_partitions()
+
+    @app.cli.command("rebuild-spend-rollup")
+    @click.option("--username", help="Only rebuild this user (default: all users).")
+    def rebuild_spend_rollup_command(username):
+        """Recompute user_monthly_category_spend from raw transactions."""
+        user_ids = None
+        if username:
+            user = User.query.filter_by(username=username).first()
+            if not user:
+                raise click.ClickException(f"User not found: {username}")
+            user_ids = [user.id]
+        rows = SpendingRollupService.rebuild(user_ids)
+        click.echo(f"Rebuilt {rows} rollup rows.")
+
+    @app.cli.command("precompute-insights")
+    @click.option(
+        "--since-hours",
+        type=int,
+        default=168,
+        show_default=True,
+        help="Users with new transactions in this window are considered active.",
+    )
+    @click.option(
+        "--languages",
+        default="en",
+        show_default=True,
+        help="Comma-separated language codes to generate insights for.",
+    )
+    @click.option("--limit", type=int, help="Maximum number of users to process.")
+    def precompute_insights_command(since_hours, languages, limit):
+        """Generate and store dashboard and goal insights for recently active users."""
+        counts = InsightPrecomputeService.precompute_recent(
+            since_hours=since_hours,
+            languages=[lang.strip() for lang in languages.split(",") if lang.strip()],
+            limit=limit,
+        )
+        click.echo(f"Precomputed insights: {counts}")
+
+    @app.cli.command("detect-anomalies")
+    @click.option(
+        "--workers",
+        type=int,
+        default=1,
+        show_default=True,
+        help="Worker processes; users are split into this many shards.",
+    )
+    @click.option(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        show_default=True,
+        help="Users scored per vectorized batch.",
+    )
+    def detect_anomalies_command(workers, chunk_size):
+        """Score spending anomalies for all active users and store them."""
+        counts = SpendingAnomalyBatchService.run(workers=workers, chunk_size=chunk_size)
+        click.echo(f"Anomaly scan finished: {counts}")
+
+    @app.cli.command("detect-recurring")
+    @click.option("--username", help="Only scan this user (default: all active users).")
+    def detect_recurring_command(username):
+        """Flag recurring transactions and rebuild the user_subscriptions index."""
+        user_ids = None
+        if username:
+            user = User.query.filter_by(username=username).first()
+            if not user:
+                raise click.ClickException(f"User not found: {username}")
+            user_ids = [user.id]
+        counts = RecurringPaymentService.rebuild(user_ids)
+        click.echo(f"Recurring payment detection finished: {counts}")
+
+    @app.cli.command("compact-card-ledger")
+    @click.option(
+        "--min-entries",
+        type=int,
+        default=1,
+        show_default=True,
+        help="Only snapshot cards with at least this many new ledger entries.",
+    )
+    def compact_card_ledger_command(min_entries):
+        """Fold new card ledger entries into card_balance_snapshots."""
+        counts = CardLedgerService.compact(min_entries=min_entries)
+        click.echo(f"Card ledger compaction finished: {counts}")
+
+    @app.cli.command("partition-transactions")
+    @click.option(
+        "--months-ahead",
+        type=int,
+        default=TRANSACTION_PARTITION_MONTHS_AHEAD,
+        show_default=True,
+        help="Create monthly partitions up to this many months after the current one.",
+    )
+    @click.option(
+        "--detach-older-than",
+        type=int,
+        default=TRANSACTION_RETENTION_MONTHS,
+        show_default=True,
+        help="Detach partitions of months older than this many months (0 = never).",
+    )
+    @click.option(
+        "--drop", is_flag=True, help="Drop detached partitions instead of keeping them."
+    )
+    def partition_transactions_command(months_ahead, detach_older_than, drop):
+        """Create upcoming transactions partitions and detach expired ones."""
+        counts = TransactionPartitionService.ensure_partitions(months_ahead)
+        click.echo(f"Transactions partitions: {counts}")
+        if detach_older_than > 0:
+            detached = TransactionPartitionService.detach_older_than(
+                detach_older_than, drop=drop
+            )
+            click.echo(
+                f"{'Dropped' if drop else 'Detached'}: {', '.join(detached) or 'none'}"
+            )
+
+    @app.cli.command("archive-transactions")
+    @click.option(
+        "--horizon-months",
+        type=int,
+        default=TRANSACTION_ARCHIVE_HORIZON_MONTHS,
+        show_default=True,
+        help="Archive months older than this many full months.",
+    )
+    def archive_transactions_command(horizon_months):
+        """Move old transactions into compressed per-user monthly segment files."""
+        if horizon_months < 1:
+            raise click.ClickException("--horizon-months must be at least 1.")
+        counts = TransactionArchiveService.archive(horizon_months)
+        click.echo(f"Transaction archive finished: {counts}")
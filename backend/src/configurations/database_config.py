@@ -1,50 +1,294 @@
+"""
+Database setup and read-replica routing.
+
+Read-only analytic work (functions decorated with `replica_reads`) sends its SELECTs
+to the replicas in DATABASE_REPLICA_URLS (comma-separated, round robin). Everything
+else stays on the primary (DATABASE_URL), and so do reads in a replica scope when:
+- the statement is not a plain SELECT (DML, SELECT ... FOR UPDATE, raw SQL) or
+  runs under `primary_reads()` (e.g. user lookups),
+- this session already wrote something (the request reads its own writes),
+- a user resolved in this request wrote within REPLICA_READ_YOUR_WRITES_SECONDS in
+  this worker (default 10),
+- no replica is within REPLICA_MAX_LAG_SECONDS of the primary (default 5). Replica
+  lag is measured at most every REPLICA_LAG_CHECK_SECONDS per worker (default 2).
+
+Without DATABASE_REPLICA_URLS every query goes to the primary.
+"""
+
+import contextlib
+import contextvars
+import functools
+import itertools
 import os
-import sys
+import threading
+import time
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select, event, text
 
+from configurations.db_pool import get_engine_options, init_pool_events
 from configurations.logging_config import get_logger
+from services.monitoring.metrics_registry import metrics
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "2"))
+REPLICA_READ_YOUR_WRITES_SECONDS = float(
+    os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "10")
+)
 logger = get_logger(__name__)
 
+# Bind keys of the replica engines in SQLALCHEMY_BINDS.
+REPLICA_BIND_KEYS = [f"replica_{index}" for index in range(len(DATABASE_REPLICA_URLS))]
+
+# Seconds the replica is behind the primary; 0 when it has replayed everything it
+# received (an idle primary would otherwise look like growing lag) or when it is not
+# a standby at all (e.g. a second local database used for testing).
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+metrics.counter(
+    "db_replica_routing_total",
+    "Statements in replica-eligible scopes by target and reason.",
+)
+
+# True inside `replica_reads` functions.
+_replica_scope = contextvars.ContextVar("replica_scope", default=False)
+
+# bind key -> (checked_at, lag seconds or None when unreachable).
+_replica_lag: Dict[str, tuple] = {}
+_replica_lag_lock = threading.Lock()
+_replica_cycle = itertools.count()
+
+# user_id -> monotonic time until which the user's reads stay on the primary.
+_recent_writers: Dict[str, float] = {}
+_recent_writers_lock = threading.Lock()
+
+# Session.info keys.
+_WROTE = "wrote_to_primary"
+_WRITTEN_USERS = "written_user_ids"
+_REQUEST_USERS = "request_user_ids"
+
+
+def replica_reads(func):
+    """Route the function's plain SELECTs to a read replica when one is usable."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _replica_scope.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _replica_scope.reset(token)
+
+    return wrapper
+
+
+@contextlib.contextmanager
+def primary_reads():
+    """Keep reads on the primary inside a `replica_reads` function."""
+    token = _replica_scope.set(False)
+    try:
+        yield
+    finally:
+        _replica_scope.reset(token)
+
+
+def track_request_user(user_id):
+    """Note a user resolved in this request for the read-your-writes check."""
+    db.session.info.setdefault(_REQUEST_USERS, set()).add(str(user_id))
+
+
+def note_written_users(user_ids):
+    """Note users whose rows a bulk statement (not tracked by the flush) wrote."""
+    users = db.session.info.setdefault(_WRITTEN_USERS, set())
+    users.update(str(user_id) for user_id in user_ids)
+
+
+def get_written_user_ids(session) -> set:
+    """Ids (str) of users whose rows this session wrote since its last commit."""
+    return session.info.get(_WRITTEN_USERS, set())
+
+
+def _replica_lag_seconds(engine) -> float:
+    if engine.dialect.name != "postgresql":
+        return 0.0
+    with engine.connect() as conn:
+        return float(conn.execute(text(REPLICA_LAG_SQL)).scalar())
+
+
+def _usable_replica(engines) -> Optional[str]:
+    """Bind key of the next replica within the lag limit, or None."""
+    now = time.monotonic()
+    keys = REPLICA_BIND_KEYS
+    start = next(_replica_cycle)
+    for offset in range(len(keys)):
+        key = keys[(start + offset) % len(keys)]
+        with _replica_lag_lock:
+            checked = _replica_lag.get(key)
+            stale = checked is None or now - checked[0] > REPLICA_LAG_CHECK_SECONDS
+            if stale:
+                # Claim the refresh; other threads keep using the previous value.
+                _replica_lag[key] = (now, checked[1] if checked else None)
+        if stale:
+            try:
+                lag = _replica_lag_seconds(engines[key])
+            except Exception as e:
+                logger.warning(f"Replica {key} unavailable: {str(e)}")
+                lag = None
+            with _replica_lag_lock:
+                _replica_lag[key] = (now, lag)
+        else:
+            lag = checked[1]
+        if lag is not None and lag <= REPLICA_MAX_LAG_SECONDS:
+            return key
+    return None
+
+
+def get_replica_status() -> Dict[str, dict]:
+    """Last measured lag per replica in this worker."""
+    with _replica_lag_lock:
+        lags = dict(_replica_lag)
+    now = time.monotonic()
+    return {
+        key: {
+            "lag_seconds": lags[key][1] if key in lags else None,
+            "checked_seconds_ago": (
+                round(now - lags[key][0], 1) if key in lags else None
+            ),
+        }
+        for key in REPLICA_BIND_KEYS
+    }
+
+
+class RoutingSession(Session):
+    """Session that sends plain SELECTs in `replica_reads` scopes to a replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and REPLICA_BIND_KEYS
+            and _replica_scope.get()
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            key, reason = self._route_read()
+            metrics.inc("db_replica_routing_total", {"target": key, "reason": reason})
+            if key != "primary":
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _route_read(self):
+        if self.info.get(_WROTE):
+            return "primary", "own_writes"
+        request_users = self.info.get(_REQUEST_USERS)
+        if request_users:
+            now = time.monotonic()
+            with _recent_writers_lock:
+                if any(_recent_writers.get(u, 0) > now for u in request_users):
+                    return "primary", "recent_writes"
+        key = _usable_replica(self._db.engines)
+        if key is None:
+            return "primary", "replica_lag"
+        return key, "replica"
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _note_flushed_writes(session, flush_context):
+    session.info[_WROTE] = True
+    users = session.info.setdefault(_WRITTEN_USERS, set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        user_id = getattr(obj, "user_id", None)
+        if user_id is None and obj.__class__.__name__ == "User":
+            user_id = obj.id
+        if user_id is not None:
+            users.add(str(user_id))
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _note_bulk_writes(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_recent_writers(session):
+    users = session.info.pop(_WRITTEN_USERS, None)
+    if users:
+        until = time.monotonic() + REPLICA_READ_YOUR_WRITES_SECONDS
+        with _recent_writers_lock:
+            now = time.monotonic()
+            for user_id in [u for u, t in _recent_writers.items() if t <= now]:
+                del _recent_writers[user_id]
+            for user_id in users:
+                _recent_writers[user_id] = until
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_rolled_back_writes(session):
+    session.info.pop(_WRITTEN_USERS, None)
+
 
 # Initialize SQLAlchemy.
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 
 
 def init_db(app):
+    """Configure SQLAlchemy and Flask-Migrate for the app.
+
+    Migrations are not applied here; run `flask db upgrade` or `flask bootstrap`
+    (see commands/db_commands.py) as an explicit deploy step.
+    """
     logger.info("Initializing database connection...")
 
     app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # Pool sizing, pre-ping and statement timeout (see configurations/db_pool.py).
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = get_engine_options()
+    app.config["SQLALCHEMY_BINDS"] = dict(zip(REPLICA_BIND_KEYS, DATABASE_REPLICA_URLS))
 
     # Initialize extensions with app.
     db.init_app(app)
     migrate.init_app(app, db)
+    with app.app_context():
+        for engine in db.engines.values():
+            init_pool_events(engine)
+    if REPLICA_BIND_KEYS:
+        logger.info(f"Routing analytic reads to {len(REPLICA_BIND_KEYS)} replica(s)")
 
-    logger.info("Database and migration extensions initialized successfully")
+    # Import entities so their tables are registered on db.metadata
+    # (needed by Alembic autogenerate and `flask db` commands).
+    import entities.card  # noqa: F401
+    import entities.card_ledger  # noqa: F401
+    import entities.goal  # noqa: F401
+    import entities.monthly_category_spend  # noqa: F401
+    import entities.precomputed_insight  # noqa: F401
+    import entities.spending_anomaly  # noqa: F401
+    import entities.spending_anomaly_scan  # noqa: F401
+    import entities.transaction  # noqa: F401
+    import entities.transaction_archive  # noqa: F401
+    import entities.user  # noqa: F401
+    import entities.user_data_version  # noqa: F401
+    import entities.user_subscription  # noqa: F401
 
-    # Apply database migrations on startup.
-    # Skip if we are running flask db commands to avoid circular dependency/errors
-    # when the migrations folder doesn't exist yet (e.g. during flask db init).
-    if not any(
-        arg in sys.argv for arg in ["db", "migrate", "upgrade", "downgrade", "init"]
-    ):
-        with app.app_context():
-            from flask_migrate import upgrade
+    # Registers the commit hook that bumps per-user data versions.
+    import services.core.user_data_version_service  # noqa: F401
 
-            try:
-                logger.info("Running database migrations.")
-                upgrade()
-                logger.info("Database migrations completed successfully.")
-            except Exception as e:
-                logger.error(f"Failed to run database migrations: {str(e)}.")
-                # We might want to raise here if we want the app to fail fast on migration error
-                # raise
-    else:
-        logger.info("Skipping automatic migration execution (detected db command).")
+    logger.info("Database and migration extensions initialized successfully")
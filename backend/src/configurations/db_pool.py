@@ -0,0 +1,201 @@
+"""
+SQLAlchemy connection pool settings and per-worker pool metrics.
+
+Every gunicorn worker has its own pool, so the database sees up to
+GUNICORN_WORKERS x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections from the API.
+Configurable via environment variables:
+- DB_POOL_SIZE=5                    -> Connections kept open per worker.
+- DB_MAX_OVERFLOW=10                -> Extra connections opened under load, closed when returned.
+- DB_POOL_TIMEOUT=30                -> Seconds to wait for a free connection before failing.
+- DB_POOL_RECYCLE=1800              -> Reopen connections older than this (seconds, -1 = never).
+- DB_POOL_PRE_PING=true             -> Test connections on checkout (drops dead ones after a DB restart).
+- DB_STATEMENT_TIMEOUT_MS=0         -> Cancel statements running longer than this (0 = no limit).
+- DB_PGBOUNCER_TRANSACTION_MODE=false -> Connecting through PgBouncer in transaction pooling mode.
+
+PgBouncer in transaction mode hands a different server connection to every
+transaction and rejects the `options` startup parameter, so the statement timeout is
+then applied with SET LOCAL at the start of each transaction instead of once per
+connection. Session state (SET, session advisory locks) does not survive there, so
+run `flask bootstrap` against Postgres directly.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from sqlalchemy import event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from configurations.logging_config import get_logger
+from services.monitoring.metrics_registry import metrics
+
+logger = get_logger(__name__)
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+DB_PGBOUNCER_TRANSACTION_MODE = (
+    os.getenv("DB_PGBOUNCER_TRANSACTION_MODE", "false").lower() == "true"
+)
+GUNICORN_WORKERS = int(os.getenv("GUNICORN_WORKERS", "4"))
+
+# Checkout waits kept for percentiles.
+RECENT_WAITS_KEPT = 1000
+
+metrics.histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled DB connection.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+metrics.counter(
+    "db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT."
+)
+
+
+class PoolWaitStats:
+    """Checkout count and wait times of this worker's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self._recent = deque(maxlen=RECENT_WAITS_KEPT)
+
+    def record(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self._recent.append(wait_ms)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            recent = np.array(self._recent)
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "mean_wait_ms": (
+                    round(self.total_wait_ms / attempts, 3) if attempts else 0.0
+                ),
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "recent_p50_wait_ms": (
+                    round(float(np.percentile(recent, 50)), 3) if recent.size else 0.0
+                ),
+                "recent_p95_wait_ms": (
+                    round(float(np.percentile(recent, 95)), 3) if recent.size else 0.0
+                ),
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            wait = time.perf_counter() - started
+            pool_wait_stats.record(wait * 1000, timed_out=True)
+            metrics.inc("db_pool_timeouts_total", {})
+            raise
+        wait = time.perf_counter() - started
+        pool_wait_stats.record(wait * 1000)
+        metrics.observe("db_pool_wait_seconds", {}, wait)
+        return connection
+
+
+def get_engine_options() -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS built from the environment."""
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if DB_STATEMENT_TIMEOUT_MS > 0 and not DB_PGBOUNCER_TRANSACTION_MODE:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
+
+def _set_local_statement_timeout(conn):
+    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {DB_STATEMENT_TIMEOUT_MS}")
+
+
+def init_pool_events(engine):
+    """Per-transaction statement timeout when running behind PgBouncer."""
+    if DB_STATEMENT_TIMEOUT_MS > 0 and DB_PGBOUNCER_TRANSACTION_MODE:
+        if not event.contains(engine, "begin", _set_local_statement_timeout):
+            event.listen(engine, "begin", _set_local_statement_timeout)
+
+
+def get_pool_stats(engine) -> dict:
+    """Pool configuration, occupancy and wait times for this worker."""
+    pool = engine.pool
+    stats = {
+        "pid": os.getpid(),
+        "config": {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout_s": DB_POOL_TIMEOUT,
+            "pool_recycle_s": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+            "statement_timeout_ms": DB_STATEMENT_TIMEOUT_MS,
+            "pgbouncer_transaction_mode": DB_PGBOUNCER_TRANSACTION_MODE,
+        },
+        "pool": {"class": type(pool).__name__},
+        "wait": pool_wait_stats.to_dict(),
+    }
+    if isinstance(pool, QueuePool):
+        stats["pool"].update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                # Connections opened beyond pool_size (negative while the pool is
+                # still filling up).
+                "overflow": pool.overflow(),
+            }
+        )
+
+    # Capacity across all workers against the server limit.
+    per_worker = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    capacity = {
+        "workers": GUNICORN_WORKERS,
+        "max_connections_per_worker": per_worker,
+        "max_connections_all_workers": per_worker * GUNICORN_WORKERS,
+    }
+    try:
+        with engine.connect() as conn:
+            capacity["postgres_max_connections"] = int(
+                conn.execute(text("SHOW max_connections")).scalar()
+            )
+            capacity["postgres_connections"] = conn.execute(
+                text(
+                    "SELECT count(*) FROM pg_stat_activity "
+                    "WHERE datname = current_database()"
+                )
+            ).scalar()
+    except Exception as e:
+        logger.warning(f"Could not read Postgres connection limits: {str(e)}")
+    stats["capacity"] = capacity
+    return stats
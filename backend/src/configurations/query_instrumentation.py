@@ -0,0 +1,183 @@
+"""
+Per-request SQL instrumentation built on SQLAlchemy engine events.
+
+Records the number of statements, total DB time and the slowest statements for every
+Flask request. Results are exposed in a `Server-Timing` response header, kept in a
+bounded in-memory buffer for the /internal/queries debug endpoint, and logged when a
+request crosses one of the thresholds below (configurable via environment variables):
+- SLOW_REQUEST_MS=500          -> Log requests slower than this (wall time).
+- SLOW_REQUEST_QUERY_COUNT=20  -> Log requests issuing more statements than this.
+- SLOW_QUERY_MS=100            -> Log requests containing a statement slower than this.
+"""
+
+import heapq
+import os
+import threading
+import time
+from collections import deque
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from configurations.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_QUERY_COUNT = int(os.getenv("SLOW_REQUEST_QUERY_COUNT", "20"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+
+# Number of slowest statements kept per request and of request profiles kept in memory.
+SLOWEST_STATEMENTS_KEPT = 5
+RECENT_PROFILES_KEPT = 200
+
+# Statements are truncated in logs and debug output.
+MAX_STATEMENT_LENGTH = 500
+
+
+class RequestQueryProfile:
+    """SQL statistics collected while handling a single request."""
+
+    __slots__ = ("query_count", "db_time_ms", "_slowest", "_sequence")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time_ms = 0.0
+        self._slowest = []  # Min-heap of (duration_ms, sequence, statement).
+        self._sequence = 0
+
+    def record(self, statement: str, duration_ms: float):
+        """Add one executed statement to the profile."""
+        self.query_count += 1
+        self.db_time_ms += duration_ms
+        self._sequence += 1
+        entry = (duration_ms, self._sequence, statement)
+        if len(self._slowest) < SLOWEST_STATEMENTS_KEPT:
+            heapq.heappush(self._slowest, entry)
+        elif duration_ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest_statements(self) -> list:
+        """Slowest statements first, as dicts with duration and truncated SQL."""
+        return [
+            {
+                "duration_ms": round(duration_ms, 2),
+                "statement": statement[:MAX_STATEMENT_LENGTH],
+            }
+            for duration_ms, _, statement in sorted(self._slowest, reverse=True)
+        ]
+
+
+# Recently completed request profiles, newest last.
+_recent_profiles = deque(maxlen=RECENT_PROFILES_KEPT)
+_recent_lock = threading.Lock()
+
+
+def get_recent_profiles(path_filter: str = None) -> list:
+    """Return recently recorded request profiles, newest first."""
+    with _recent_lock:
+        profiles = list(_recent_profiles)
+    if path_filter:
+        profiles = [p for p in profiles if path_filter in p["path"]]
+    return profiles[::-1]
+
+
+def get_endpoint_summary() -> dict:
+    """Aggregate recent profiles per endpoint (count, mean/max queries, DB time)."""
+    summary = {}
+    for profile in get_recent_profiles():
+        stats = summary.setdefault(
+            profile["endpoint"],
+            {"requests": 0, "total_queries": 0, "max_queries": 0, "total_db_ms": 0.0},
+        )
+        stats["requests"] += 1
+        stats["total_queries"] += profile["query_count"]
+        stats["max_queries"] = max(stats["max_queries"], profile["query_count"])
+        stats["total_db_ms"] += profile["db_time_ms"]
+
+    return {
+        endpoint: {
+            "requests": stats["requests"],
+            "mean_queries": round(stats["total_queries"] / stats["requests"], 2),
+            "max_queries": stats["max_queries"],
+            "mean_db_ms": round(stats["total_db_ms"] / stats["requests"], 2),
+        }
+        for endpoint, stats in summary.items()
+    }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "query_started_at", None)
+    if started is None or not has_request_context() or "query_profile" not in g:
+        return
+    g.query_profile.record(statement, (time.perf_counter() - started) * 1000)
+
+
+def _start_request_profile():
+    g.query_profile = RequestQueryProfile()
+    g.request_started_at = time.perf_counter()
+
+
+def _finish_request_profile(response):
+    profile = g.pop("query_profile", None)
+    if profile is None:
+        return response
+
+    total_ms = (time.perf_counter() - g.request_started_at) * 1000
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={profile.db_time_ms:.2f};desc="{profile.query_count} queries", '
+        f"total;dur={total_ms:.2f}",
+    )
+
+    slowest = profile.slowest_statements()
+    rule = request.url_rule.rule if request.url_rule else request.path
+    endpoint = f"{request.method} {rule}"
+    record = {
+        "endpoint": endpoint,
+        "path": request.full_path.rstrip("?"),
+        "status": response.status_code,
+        "total_ms": round(total_ms, 2),
+        "query_count": profile.query_count,
+        "db_time_ms": round(profile.db_time_ms, 2),
+        "slowest_statements": slowest,
+        "recorded_at": time.time(),
+    }
+    with _recent_lock:
+        _recent_profiles.append(record)
+
+    # Log requests over the configured thresholds together with the offending SQL.
+    reasons = []
+    if total_ms > SLOW_REQUEST_MS:
+        reasons.append(f"took {total_ms:.0f} ms")
+    if profile.query_count > SLOW_REQUEST_QUERY_COUNT:
+        reasons.append(f"issued {profile.query_count} queries")
+    if slowest and slowest[0]["duration_ms"] > SLOW_QUERY_MS:
+        reasons.append(f"ran a {slowest[0]['duration_ms']:.0f} ms query")
+    if reasons:
+        statements = "\n".join(
+            f"  [{s['duration_ms']} ms] {s['statement']}" for s in slowest
+        )
+        logger.warning(
+            f"Slow request {record['path']} ({', '.join(reasons)}; "
+            f"DB time {profile.db_time_ms:.0f} ms). Slowest statements:\n{statements}"
+        )
+
+    return response
+
+
+def init_query_instrumentation(app):
+    """Attach the engine listeners (to every engine) and request hooks to the app."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    app.before_request(_start_request_profile)
+    app.after_request(_finish_request_profile)
+    logger.info("SQL query instrumentation enabled")
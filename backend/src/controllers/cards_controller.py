@@ -1,6 +1,9 @@
+from datetime import datetime, timezone
+
 from flask import Blueprint, jsonify, request
 
 from services.core.card_service import CardService
+from services.core.user_data_version_service import conditional_on_data_version
 
 cards_bp = Blueprint("cards", __name__, url_prefix="/api/cards")
 
@@ -17,6 +20,7 @@ def create_card():
 
 
 @cards_bp.route("/", methods=["GET"])
+@conditional_on_data_version
 def get_cards():
     username = request.args.get("username")
     if not username:
@@ -30,3 +34,19 @@ def get_cards():
 def get_card(card_id):
     response, status_code = CardService.get_card_by_id(card_id)
     return jsonify(response), status_code
+
+
+@cards_bp.route("/<card_id>/balance", methods=["GET"])
+def get_card_balance(card_id):
+    at = request.args.get("at")
+    if at:
+        try:
+            at = datetime.fromisoformat(at)
+        except ValueError:
+            return jsonify({"error": "at must be an ISO 8601 datetime"}), 400
+        if at.tzinfo is not None:
+            # Stored timestamps are naive UTC.
+            at = at.astimezone(timezone.utc).replace(tzinfo=None)
+
+    response, status_code = CardService.get_balance_at(card_id, at or None)
+    return jsonify(response), status_code
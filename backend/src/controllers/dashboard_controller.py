@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 
 from configurations.logging_config import get_logger
 from services.core.dashboard_service import DashboardService
+from services.core.user_data_version_service import conditional_on_data_version
 
 logger = get_logger(__name__)
 
@@ -40,6 +41,7 @@ def _get_language_from_request() -> str:
 
 
 @dashboard_bp.route("/", methods=["GET"])
+@conditional_on_data_version
 def get_dashboard():
     """Get dashboard data for a user (fast, no LLM calls)
 
@@ -320,6 +320,7 @@ HTML_TEMPLATE = """
                     <span class="url">/api/cards/?username=&lt;username&gt;</span>
                 </div>
                 <div class="desc"><strong>Get User Cards</strong></div>
+                <p>Sends an <code>ETag</code> tied to the user's data version; polling with <code>If-None-Match</code> returns <code>304 Not Modified</code> until the user's transactions, goals, cards or profile change (or the day does).</p>
                 <p class="section-title">Response (200 OK):</p>
                 <pre>{
   "cards": [
@@ -361,6 +362,20 @@ HTML_TEMPLATE = """
     "created_at": "2024-01-01T00:00:00",
     "updated_at": "2024-01-01T00:00:00"
   }
+}</pre>
+            </div>
+
+            <div class="endpoint">
+                <div class="header">
+                    <span class="method get">GET</span>
+                    <span class="url">/api/cards/&lt;card_id&gt;/balance?at=&lt;ISO datetime&gt;</span>
+                </div>
+                <div class="desc"><strong>Get Card Balance</strong> (current, or at a past time when <code>at</code> is given)</div>
+                <p class="section-title">Response (200 OK):</p>
+                <pre>{
+  "card_id": "uuid",
+  "balance": 1000000,
+  "as_of": "2024-01-31T23:59:59"
 }</pre>
             </div>
         </div>
@@ -373,9 +388,10 @@ HTML_TEMPLATE = """
             <div class="endpoint">
                 <div class="header">
                     <span class="method get">GET</span>
-                    <span class="url">/api/transactions/?username=&lt;username&gt;</span>
+                    <span class="url">/api/transactions/?username=&lt;username&gt;&amp;start_date=&lt;ISO date&gt;&amp;end_date=&lt;ISO date&gt;</span>
                 </div>
-                <div class="desc"><strong>Get User Transactions</strong></div>
+                <div class="desc"><strong>Get User Transactions</strong> (newest first; dates optional, archived months included; without sender_info, receiver_info, metadata and description)</div>
+                <p>Sends an <code>ETag</code> tied to the user's data version; polling with <code>If-None-Match</code> returns <code>304 Not Modified</code> until the user's transactions, goals, cards or profile change (or the day does).</p>
                 <p class="section-title">Response (200 OK):</p>
                 <pre>{
   "is_success": true,
@@ -396,12 +412,8 @@ HTML_TEMPLATE = """
       "transaction_direction": "OUTGOING",
       "fee": 0,
       "processed_at": "2023-11-01T10:00:05",
-      "sender_info": { "type": "CARD", "name": "Khasan" },
-      "receiver_info": { "type": "MERCHANT", "merchant_name": "Korzinka" },
-      "metadata": {},
       "gateway": "HUMO",
       "rrn": "123456789",
-      "description": "Groceries",
       "is_recurring": false,
       "created_at": "2023-11-01T10:00:00"
     }
@@ -409,6 +421,41 @@ HTML_TEMPLATE = """
 }</pre>
             </div>
 
+            <div class="endpoint">
+                <div class="header">
+                    <span class="method get">GET</span>
+                    <span class="url">/api/transactions/&lt;transaction_id&gt;</span>
+                </div>
+                <div class="desc"><strong>Get Transaction Detail</strong> (full row, including sender_info, receiver_info, metadata and description)</div>
+                <p class="section-title">Response (200 OK):</p>
+                <pre>{
+  "is_success": true,
+  "message": "Transaction retrieved successfully.",
+  "data": {
+    "id": "uuid",
+    "amount": 50000,
+    "merchant": "Korzinka",
+    "date": "2023-11-01T10:00:00",
+    ...
+    "sender_info": { "type": "CARD", "name": "Khasan" },
+    "receiver_info": { "type": "MERCHANT", "merchant_name": "Korzinka" },
+    "metadata": {},
+    "description": "Groceries"
+  }
+}</pre>
+            </div>
+
+            <div class="endpoint">
+                <div class="header">
+                    <span class="method get">GET</span>
+                    <span class="url">/api/transactions/export?username=&lt;username&gt;&amp;format=ndjson|csv&amp;start_date=&lt;ISO date&gt;&amp;end_date=&lt;ISO date&gt;</span>
+                </div>
+                <div class="desc"><strong>Export User Transactions</strong> (streamed attachment, oldest first, archived months included)</div>
+                <p class="section-title">Response (200 OK, application/x-ndjson):</p>
+                <pre>{"id": "uuid", "user_id": "user-uuid", "amount": 50000, "date": "2023-11-01T10:00:00", ...}
+{"id": "uuid", "user_id": "user-uuid", "amount": 12000, "date": "2023-11-02T18:30:00", ...}</pre>
+            </div>
+
             <div class="endpoint">
                 <div class="header">
                     <span class="method post">POST</span>
@@ -481,6 +528,7 @@ HTML_TEMPLATE = """
                     <span class="url">/api/dashboard/?username=&lt;username&gt;</span>
                 </div>
                 <div class="desc"><strong>Get Dashboard Data</strong> (Fast, no LLM)</div>
+                <p>Sends an <code>ETag</code> tied to the user's data version; polling with <code>If-None-Match</code> returns <code>304 Not Modified</code> until the user's transactions, goals, cards or profile change (or the day does).</p>
                 <p>Returns summary, category distribution, alerts, and health score. For AI-generated insights, use the separate <code>/insights</code> endpoint.</p>
                 <p class="section-title">Query Parameters:</p>
                 <pre>username (string) - required</pre>
@@ -604,6 +652,7 @@ language (string) - optional: "en", "uz", "ru" (default: "en")</pre>
                     <span class="url">/api/goals/?username=&lt;username&gt;</span>
                 </div>
                 <div class="desc"><strong>Get User Goals</strong></div>
+                <p>Sends an <code>ETag</code> tied to the user's data version; polling with <code>If-None-Match</code> returns <code>304 Not Modified</code> until the user's transactions, goals, cards or profile change (or the day does).</p>
                 <p class="section-title">Response (200 OK):</p>
                 <pre>{
   "is_success": true,
@@ -673,6 +722,7 @@ language (string) - optional: "en", "uz", "ru" (default: "en")</pre>
                     <span class="url">/api/goals/&lt;goal_id&gt;?username=&lt;username&gt;</span>
                 </div>
                 <div class="desc"><strong>Get Goal By ID</strong></div>
+                <p>Sends an <code>ETag</code> tied to the user's data version; polling with <code>If-None-Match</code> returns <code>304 Not Modified</code> until the user's transactions, goals, cards or profile change (or the day does).</p>
                 <p class="section-title">Query Parameters:</p>
                 <pre>username (string) - required</pre>
                 <p class="section-title">Response (200 OK):</p>
@@ -701,9 +751,11 @@ language (string) - optional: "en", "uz", "ru" (default: "en")</pre>
                     <span class="url">/api/goals/&lt;goal_id&gt;/timeline?username=&lt;username&gt;</span>
                 </div>
                 <div class="desc"><strong>Predict Goal Timeline</strong> (Fast, no LLM)</div>
-                <p>Uses Monte Carlo simulation to predict when a goal will be reached. For AI interpretation, use the separate <code>/timeline/interpretation</code> endpoint.</p>
+                <p>Sends an <code>ETag</code> tied to the user's data version; polling with <code>If-None-Match</code> returns <code>304 Not Modified</code> until the user's transactions, goals, cards or profile change (or the day does).</p>
+                <p>Uses Monte Carlo simulation to predict when a goal will be reached. <code>timeline</code> holds one array per series; the P10/P50/P90 series are percentile bands of the simulated balance paths. For AI interpretation, use the separate <code>/timeline/interpretation</code> endpoint.</p>
                 <p class="section-title">Query Parameters:</p>
-                <pre>username (string) - required</pre>
+                <pre>username (string) - required
+timeline_view (string) - optional: "rows" also returns per-month <code>timeline_data</code> objects</pre>
                 <p class="section-title">Response (200 OK):</p>
                 <pre>{
   "is_success": true,
@@ -717,20 +769,49 @@ language (string) - optional: "en", "uz", "ru" (default: "en")</pre>
     },
     "success_probability": 95.0,
     "real_monthly_contribution": 2000000,
-    "timeline_data": [
-      {
-        "month": 0,
-        "deterministic": 1000000,
-        "p10_optimistic": 1000000,
-        "p50_median": 1000000,
-        "p90_pessimistic": 1000000
-      },
+    "timeline": {
+      "month": [0, 1, 2],
+      "deterministic": [1000000, 3000000, 5000000],
+      "p10_optimistic": [1000000, 3300000, 5650000],
+      "p50_median": [1000000, 3000000, 5010000],
+      "p90_pessimistic": [1000000, 2700000, 4380000]
+    }
+  }
+}</pre>
+            </div>
+
+            <div class="endpoint">
+                <div class="header">
+                    <span class="method get">GET</span>
+                    <span class="url">/api/goals/timelines?username=&lt;username&gt;</span>
+                </div>
+                <div class="desc"><strong>Predict All Goal Timelines</strong> (Fast, no LLM)</div>
+                <p>Sends an <code>ETag</code> tied to the user's data version; polling with <code>If-None-Match</code> returns <code>304 Not Modified</code> until the user's transactions, goals, cards or profile change (or the day does).</p>
+                <p>Simulates every active goal in one Monte Carlo run. Monthly savings are shared between goals by priority (High 3 : Medium 2 : Low 1 among unfinished goals), so use this for the goals list instead of one <code>/timeline</code> call per goal.</p>
+                <p class="section-title">Query Parameters:</p>
+                <pre>username (string) - required</pre>
+                <p class="section-title">Response (200 OK):</p>
+                <pre>{
+  "is_success": true,
+  "message": "Goal timelines prediction completed.",
+  "data": {
+    "real_monthly_contribution": 5885543.07,
+    "forecast": {
+      "method": "ses",
+      "months_observed": 3,
+      "expected_income": 9000000.0,
+      "expected_spending": 3114456.93
+    },
+    "goals": [
       {
-        "month": 1,
-        "deterministic": 3000000,
-        "p10_optimistic": 3300000,
-        "p50_median": 3000000,
-        "p90_pessimistic": 2700000
+        "goal_id": "3f1621aa-...",
+        "name": "New Macbook Pro",
+        "priority": "High",
+        "remaining_amount": 20000000.0,
+        "monthly_allocation": 2210245.33,
+        "deterministic_months": 9.0,
+        "monte_carlo": {"p10": 8.0, "p50": 10.0, "p90": 14.0},
+        "success_probability": 62.5
       }
     ]
   }
@@ -5,6 +5,7 @@ from configurations.logging_config import get_logger
 from models.goal_create_model import GoalCreateModel
 from models.goal_update_model import GoalUpdateModel
 from services.core.goal_service import GoalService
+from services.core.user_data_version_service import conditional_on_data_version
 
 logger = get_logger(__name__)
 
@@ -73,6 +74,7 @@ def create_goal():
 
 
 @goals_bp.route("/", methods=["GET"])
+@conditional_on_data_version
 def get_goals():
     """Get goals for a user"""
     username = request.args.get("username")
@@ -115,22 +117,47 @@ def update_goal():
     return jsonify(response.dict()), 200 if response.is_success else 500
 
 
+@goals_bp.route("/timelines", methods=["GET"])
+@conditional_on_data_version
+def predict_timelines():
+    """Predict timelines for all active goals in one simulation (fast, no LLM)
+
+    Query params:
+        username (required): The username of the goals owner
+
+    Monthly savings are split across goals by priority, so one request replaces
+    a /<goal_id>/timeline call per goal on the goals page.
+    """
+    username = request.args.get("username")
+
+    if not username:
+        return jsonify({"is_success": False, "message": "username is required"}), 400
+
+    logger.info(f"Predicting timelines for all goals, user: {username}")
+    response = GoalService.predict_goal_timelines(username)
+    return jsonify(response.dict()), 200 if response.is_success else 500
+
+
 @goals_bp.route("/<goal_id>/timeline", methods=["GET"])
+@conditional_on_data_version
 def predict_timeline(goal_id):
     """Predict goal timeline using Monte Carlo simulation (fast, no LLM calls)
 
     Query params:
         username (required): The username of the goal owner
+        timeline_view (optional): "rows" to also return per-month `timeline_data`
+            rows next to the column-oriented `timeline`
 
     Note: AI-generated interpretation is available via GET /api/goals/<goal_id>/timeline/interpretation
     """
     username = request.args.get("username")
+    timeline_view = request.args.get("timeline_view", "columns")
 
     if not username:
         return jsonify({"is_success": False, "message": "username is required"}), 400
 
     logger.info(f"Predicting timeline for goal {goal_id}, user: {username}")
-    response = GoalService.predict_goal_timeline(goal_id, username)
+    response = GoalService.predict_goal_timeline(goal_id, username, timeline_view)
     return jsonify(response.dict()), 200 if response.is_success else 500
 
 
@@ -183,6 +210,7 @@ def get_product_recommendations(goal_id):
 
 
 @goals_bp.route("/<goal_id>", methods=["GET"])
+@conditional_on_data_version
 def get_goal_by_id(goal_id):
     """Get a single goal by id for a user (requires `username` query param)."""
     username = request.args.get("username")
@@ -0,0 +1,57 @@
+import os
+
+from flask import Blueprint, abort, jsonify, request
+
+from configurations.database_config import db, get_replica_status
+from configurations.db_pool import get_pool_stats
+from configurations.query_instrumentation import (
+    get_endpoint_summary,
+    get_recent_profiles,
+)
+
+# Operational/debug endpoints. Disabled (404) unless ENABLE_INTERNAL_ENDPOINTS=true.
+ENABLE_INTERNAL_ENDPOINTS = (
+    os.getenv("ENABLE_INTERNAL_ENDPOINTS", "false").lower() == "true"
+)
+
+internal_bp = Blueprint("internal", __name__, url_prefix="/internal")
+
+
+@internal_bp.before_request
+def require_internal_endpoints_enabled():
+    if not ENABLE_INTERNAL_ENDPOINTS:
+        abort(404)
+
+
+@internal_bp.route("/queries", methods=["GET"])
+def get_query_profiles():
+    """
+    Recent per-request SQL profiles and per-endpoint aggregates.
+
+    Query Parameters:
+        path (str, optional): Only include requests whose path contains this value.
+        limit (int, optional): Maximum number of recent requests to return (default 50).
+    """
+    limit = request.args.get("limit", 50, type=int)
+    profiles = get_recent_profiles(request.args.get("path"))
+    return (
+        jsonify(
+            {
+                "endpoints": get_endpoint_summary(),
+                "recent_requests": profiles[:limit],
+            }
+        ),
+        200,
+    )
+
+
+@internal_bp.route("/db-pool", methods=["GET"])
+def get_db_pool_stats():
+    """
+    Connection pool occupancy and checkout wait times of the worker serving the
+    request (each gunicorn worker has its own pool), plus the connection budget of
+    all workers against Postgres max_connections and the last measured replica lag.
+    """
+    stats = get_pool_stats(db.engine)
+    stats["replicas"] = get_replica_status()
+    return jsonify(stats), 200
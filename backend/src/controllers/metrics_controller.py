@@ -0,0 +1,15 @@
+from flask import Blueprint, Response
+
+from services.monitoring.metrics_registry import metrics
+
+# Prometheus scrape endpoint (per-process registry, see services/monitoring).
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Expose in-process metrics in the Prometheus text format."""
+    return Response(
+        metrics.render_prometheus(),
+        mimetype="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -6,7 +6,17 @@ from services.shop_services.shop_service import ShopService
 logger = get_logger(__name__)
 
 shop_bp = Blueprint("shop", __name__, url_prefix="/api/shop")
-shop_service = ShopService()
+
+# Created on first use so importing the app does not build an LLM client.
+_shop_service = None
+
+
+def _get_shop_service() -> ShopService:
+    """Get or create the ShopService instance."""
+    global _shop_service
+    if _shop_service is None:
+        _shop_service = ShopService()
+    return _shop_service
 
 
 @shop_bp.route("/search", methods=["POST"])
@@ -28,7 +38,7 @@ def search_products():
         if not query:
             return jsonify({"error": "Query is required"}), 400
 
-        result = shop_service.search_products(query, language)
+        result = _get_shop_service().search_products(query, language)
 
         return jsonify({"status": "success", "data": result})
 
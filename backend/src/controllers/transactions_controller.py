@@ -1,28 +1,159 @@
-from flask import Blueprint, jsonify, request
+import csv
+import enum
+import io
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from pydantic import ValidationError
 
+from configurations.json_provider import dumps_bytes
 from configurations.logging_config import get_logger
 from models.transaction_create_model import TransactionCreateModel
 from services.core.transaction_service import TransactionService
+from services.core.user_data_version_service import conditional_on_data_version
 
 logger = get_logger(__name__)
 
 transactions_bp = Blueprint("transactions", __name__, url_prefix="/api/transactions")
 
 
+# Nested JSON columns, written as JSON strings in CSV exports.
+CSV_JSON_FIELDS = ("sender_info", "receiver_info", "metadata")
+
+
+def _parse_date_range():
+    """start_date / end_date query args as naive UTC datetimes ([start, end)).
+
+    A plain date as end_date includes that whole day. Raises ValueError.
+    """
+    bounds = []
+    for name in ("start_date", "end_date"):
+        value = request.args.get(name)
+        if not value:
+            bounds.append(None)
+            continue
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"{name} must be an ISO 8601 date or datetime")
+        if parsed.tzinfo is not None:
+            # Stored timestamps are naive UTC.
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        if name == "end_date" and len(value) == 10:
+            parsed += timedelta(days=1)
+        bounds.append(parsed)
+    return bounds
+
+
+def _csv_value(key, value):
+    """A transaction field as written in CSV exports (as in the JSON responses)."""
+    if value is None:
+        return None
+    if key in CSV_JSON_FIELDS:
+        return dumps_bytes(value).decode("utf-8")
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
 @transactions_bp.route("/", methods=["GET"])
+@conditional_on_data_version
 def get_transactions():
     """Get transactions for a user"""
     username = request.args.get("username")
 
     if not username:
         return jsonify({"is_success": False, "message": "username is required"}), 400
+    try:
+        start, end = _parse_date_range()
+    except ValueError as e:
+        return jsonify({"is_success": False, "message": str(e)}), 400
 
     logger.info(f"Getting transactions for user: {username}")
-    response = TransactionService.get_user_transactions(username)
+    response = TransactionService.get_user_transactions(username, start, end)
     return jsonify(response.dict()), 200 if response.is_success else 500
 
 
+@transactions_bp.route("/<transaction_id>", methods=["GET"])
+def get_transaction(transaction_id):
+    """Get one transaction with its full detail"""
+    try:
+        uuid.UUID(transaction_id)
+    except ValueError:
+        return (
+            jsonify({"is_success": False, "message": "transaction_id must be a UUID"}),
+            400,
+        )
+
+    response = TransactionService.get_transaction(transaction_id)
+    if response.is_success:
+        return jsonify(response.dict()), 200
+    status_code = 404 if response.message == "Transaction not found." else 500
+    return jsonify(response.dict()), status_code
+
+
+@transactions_bp.route("/export", methods=["GET"])
+def export_transactions():
+    """Stream a user's transactions, archived months included, as NDJSON or CSV"""
+    username = request.args.get("username")
+    export_format = request.args.get("format", "ndjson")
+
+    if not username:
+        return jsonify({"is_success": False, "message": "username is required"}), 400
+    if export_format not in ("ndjson", "csv"):
+        return (
+            jsonify({"is_success": False, "message": "format must be ndjson or csv"}),
+            400,
+        )
+    try:
+        start, end = _parse_date_range()
+    except ValueError as e:
+        return jsonify({"is_success": False, "message": str(e)}), 400
+
+    logger.info(f"Exporting transactions for user: {username}")
+    response = TransactionService.export_user_transactions(username, start, end)
+    if not response.is_success:
+        status_code = 404 if response.message == "User not found." else 500
+        return jsonify(response.dict()), status_code
+
+    def ndjson_lines(transactions):
+        for transaction in transactions:
+            yield dumps_bytes(transaction, orjson.OPT_APPEND_NEWLINE)
+
+    def csv_lines(transactions):
+        buffer = io.StringIO()
+        writer = None
+        for transaction in transactions:
+            row = {key: _csv_value(key, value) for key, value in transaction.items()}
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if export_format == "csv":
+        body, mimetype = csv_lines(response.data), "text/csv"
+    else:
+        body, mimetype = ndjson_lines(response.data), "application/x-ndjson"
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=transactions-{username}.{export_format}"
+            )
+        },
+    )
+
+
 @transactions_bp.route("/", methods=["POST"])
 def create_transaction():
     """Create a new transaction"""
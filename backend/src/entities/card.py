@@ -16,6 +16,8 @@ class Card(db.Model):
     card_number = db.Column(
         db.String(16), nullable=False
     )  # Storing last 4 digits or masked is better practice, but for MVP full might be used. Let's assume masked or full.
+    # Opening balance. Balance changes are appended to card_ledger_entries, so the
+    # current balance is read through CardLedgerService.
     balance = db.Column(db.Float, nullable=False, default=0.0)
     currency = db.Column(db.String(3), nullable=False, default="UZS")
     card_type = db.Column(
@@ -39,13 +41,14 @@ class Card(db.Model):
     # Relationships.
     transactions = db.relationship("Transaction", backref="card", lazy=True)
 
-    def to_dict(self):
+    def to_dict(self, balance=None):
+        """Serialize the card; pass the ledger balance to report it as `balance`."""
         return {
             "id": str(self.id),
             "user_id": str(self.user_id),
             "card_name": self.card_name,
             "card_number": self.card_number,
-            "balance": self.balance,
+            "balance": self.balance if balance is None else balance,
             "currency": self.currency,
             "card_type": (
                 self.card_type.value
@@ -0,0 +1,67 @@
+import datetime
+
+from configurations.database_config import db
+
+
+class CardLedgerEntry(db.Model):
+    """One signed balance change of a card (append-only).
+
+    Entries are only ever inserted, so concurrent credits to a busy card do not
+    contend on a row lock. The sequential id orders entries per card; snapshots
+    refer to it.
+    """
+
+    __tablename__ = "card_ledger_entries"
+    __table_args__ = (db.Index("ix_card_ledger_entries_card_id_id", "card_id", "id"),)
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    card_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("cards.id"), nullable=False
+    )
+    # Transaction that caused the change; not a foreign key, so entries survive
+    # transaction cleanup and archiving.
+    transaction_id = db.Column(db.UUID(as_uuid=True), nullable=True)
+    amount = db.Column(db.Float, nullable=False)  # Positive credit, negative debit.
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "card_id": str(self.card_id),
+            "transaction_id": str(self.transaction_id) if self.transaction_id else None,
+            "amount": self.amount,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+class CardBalanceSnapshot(db.Model):
+    """Card balance after folding all ledger entries up to last_entry_id.
+
+    Written by `flask compact-card-ledger`. Snapshots are kept, so the balance at
+    any past time is the latest snapshot before it plus a short run of entries.
+    """
+
+    __tablename__ = "card_balance_snapshots"
+
+    card_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("cards.id"), primary_key=True
+    )
+    last_entry_id = db.Column(db.BigInteger, primary_key=True)
+    balance = db.Column(db.Float, nullable=False)
+    entry_count = db.Column(db.Integer, nullable=False)  # Entries folded in.
+    as_of = db.Column(db.DateTime, nullable=False)  # created_at of the last entry.
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
+
+    def to_dict(self):
+        return {
+            "card_id": str(self.card_id),
+            "last_entry_id": self.last_entry_id,
+            "balance": self.balance,
+            "entry_count": self.entry_count,
+            "as_of": self.as_of.isoformat() if self.as_of else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -0,0 +1,46 @@
+import datetime
+
+from configurations.database_config import db
+from enums import TransactionDirectionEnum
+
+
+class UserMonthlyCategorySpend(db.Model):
+    """Per-user monthly totals by category and direction (rollup of transactions).
+
+    Maintained incrementally by TransactionService.create_transaction and rebuilt in
+    bulk by `flask rebuild-spend-rollup`.
+    """
+
+    __tablename__ = "user_monthly_category_spend"
+
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), primary_key=True
+    )
+    month = db.Column(db.Date, primary_key=True)  # First day of the month.
+    category = db.Column(db.String(50), primary_key=True)
+    transaction_direction = db.Column(
+        db.Enum(
+            TransactionDirectionEnum, values_callable=lambda x: [e.value for e in x]
+        ),
+        primary_key=True,
+    )
+    total_amount = db.Column(db.Float, nullable=False, default=0.0)
+    transaction_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow, index=True
+    )
+
+    def to_dict(self):
+        return {
+            "user_id": str(self.user_id),
+            "month": self.month.isoformat() if self.month else None,
+            "category": self.category,
+            "transaction_direction": (
+                self.transaction_direction.value
+                if hasattr(self.transaction_direction, "value")
+                else self.transaction_direction
+            ),
+            "total_amount": self.total_amount,
+            "transaction_count": self.transaction_count,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,48 @@
+import datetime
+import uuid
+
+from configurations.database_config import db
+
+
+class PrecomputedInsight(db.Model):
+    """Stored LLM insight payload with the version stamp of the inputs it was built from.
+
+    kind is "dashboard" or "goal"; subject_key is the goal ID for goal insights and an
+    empty string for dashboard insights.
+    """
+
+    __tablename__ = "precomputed_insights"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "user_id",
+            "kind",
+            "subject_key",
+            "language",
+            name="uq_precomputed_insights_subject",
+        ),
+    )
+
+    id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False
+    )
+    kind = db.Column(db.String(20), nullable=False)
+    subject_key = db.Column(db.String(64), nullable=False, default="")
+    language = db.Column(db.String(5), nullable=False)
+    version = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    computed_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
+
+    def to_dict(self):
+        return {
+            "id": str(self.id),
+            "user_id": str(self.user_id),
+            "kind": self.kind,
+            "subject_key": self.subject_key,
+            "language": self.language,
+            "version": self.version,
+            "payload": self.payload,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+        }
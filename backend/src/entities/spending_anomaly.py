@@ -0,0 +1,46 @@
+import datetime
+import uuid
+
+from configurations.database_config import db
+
+
+class SpendingAnomaly(db.Model):
+    """Flagged category anomaly stored by the batch job (`flask detect-anomalies`).
+
+    Rows are replaced for a user on every scan; rank 1 is the most severe.
+    """
+
+    __tablename__ = "spending_anomalies"
+
+    id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False, index=True
+    )
+    rank = db.Column(db.Integer, nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    timeframe = db.Column(db.String(100), nullable=False)
+    spike_percent = db.Column(db.Float, nullable=False)
+    current_amount = db.Column(db.Float, nullable=False)
+    baseline_amount = db.Column(db.Float, nullable=False)
+    z_score = db.Column(db.Float, nullable=False)
+    severity = db.Column(db.String(10), nullable=False, index=True)
+    as_of = db.Column(db.Date, nullable=False)
+    computed_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
+
+    def to_dict(self):
+        return {
+            "id": str(self.id),
+            "user_id": str(self.user_id),
+            "rank": self.rank,
+            "category": self.category,
+            "timeframe": self.timeframe,
+            "spike_percent": self.spike_percent,
+            "current_amount": self.current_amount,
+            "baseline_amount": self.baseline_amount,
+            "z_score": self.z_score,
+            "severity": self.severity,
+            "as_of": self.as_of.isoformat() if self.as_of else None,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+        }
@@ -0,0 +1,30 @@
+import datetime
+
+from configurations.database_config import db
+
+
+class SpendingAnomalyScan(db.Model):
+    """Last anomaly batch scan per user.
+
+    Lets readers tell "scanned, nothing flagged" apart from "not scanned yet", and
+    detect scans that predate the user's latest transaction.
+    """
+
+    __tablename__ = "spending_anomaly_scans"
+
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), primary_key=True
+    )
+    as_of = db.Column(db.Date, nullable=False)
+    anomaly_count = db.Column(db.Integer, nullable=False, default=0)
+    computed_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
+
+    def to_dict(self):
+        return {
+            "user_id": str(self.user_id),
+            "as_of": self.as_of.isoformat() if self.as_of else None,
+            "anomaly_count": self.anomaly_count,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+        }
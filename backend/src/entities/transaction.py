@@ -1,12 +1,37 @@
 import datetime
 import uuid
 
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, undefer_group
+
 from configurations.database_config import db
+from configurations.json_provider import RowSerializer
 from enums import TransactionDirectionEnum, TransactionStatusEnum, TransactionTypeEnum
 
+# Keys of the deferred payload columns in to_dict().
+DETAIL_FIELDS = ("sender_info", "receiver_info", "metadata", "description")
+
+# JSONB on Postgres, plain JSON elsewhere (SQLite for local runs).
+JSON_PAYLOAD = db.JSON().with_variant(JSONB(), "postgresql")
+
 
 class Transaction(db.Model):
+    """Card transaction.
+
+    The table is partitioned by month on `date` (see
+    services/core/transaction_partition_service.py), so the primary key is
+    (id, date); filter on a date range to scan only the months involved.
+
+    The payload columns (sender/receiver info, metadata, description) are
+    deferred: list and aggregate loads skip them, and paths that return the full
+    row load them with `.options(FULL_DETAIL)`.
+    """
+
     __tablename__ = "transactions"
+    __table_args__ = (
+        db.Index("ix_transactions_user_id_date", "user_id", "date"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = db.Column(
@@ -15,7 +40,12 @@ class Transaction(db.Model):
     amount = db.Column(db.Float, nullable=False)
     currency = db.Column(db.String(3), nullable=False, default="UZS")
     merchant = db.Column(db.String(100), nullable=False)
-    date = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
+    date = db.Column(
+        db.DateTime,
+        primary_key=True,
+        nullable=False,
+        default=datetime.datetime.utcnow,
+    )
     category = db.Column(db.String(50), nullable=False)
     card_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey("cards.id"), nullable=True)
     status = db.Column(
@@ -38,22 +68,23 @@ class Transaction(db.Model):
     )
     fee = db.Column(db.Float, nullable=False, default=0.0)
     processed_at = db.Column(db.DateTime, nullable=True)
-    sender_info = db.Column(db.JSON, nullable=True)
-    receiver_info = db.Column(db.JSON, nullable=True)
-    metadata_info = db.Column(
-        db.JSON, nullable=True
+    sender_info = deferred(db.Column(JSON_PAYLOAD, nullable=True), group="detail")
+    receiver_info = deferred(db.Column(JSON_PAYLOAD, nullable=True), group="detail")
+    metadata_info = deferred(
+        db.Column(JSON_PAYLOAD, nullable=True), group="detail"
     )  # The 'metadata' is reserved in SQLAlchemy model sometimes, using metadata_info.
     gateway = db.Column(db.String(50), nullable=True)
     rrn = db.Column(db.String(50), nullable=True)
 
-    description = db.Column(db.Text, nullable=True)
+    description = deferred(db.Column(db.Text, nullable=True), group="detail")
     is_recurring = db.Column(db.Boolean, nullable=False, default=False)
     created_at = db.Column(
         db.DateTime, nullable=False, default=datetime.datetime.utcnow
     )
 
-    def to_dict(self):
-        return {
+    def to_dict(self, detail: bool = True):
+        """Serialize the row; detail=False leaves out the deferred payload columns."""
+        data = {
             "id": str(self.id),
             "user_id": str(self.user_id),
             "amount": self.amount,
@@ -80,12 +111,52 @@ class Transaction(db.Model):
             "processed_at": (
                 self.processed_at.isoformat() if self.processed_at else None
             ),
-            "sender_info": self.sender_info,
-            "receiver_info": self.receiver_info,
-            "metadata": self.metadata_info,
             "gateway": self.gateway,
             "rrn": self.rrn,
-            "description": self.description,
             "is_recurring": self.is_recurring,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+        if detail:
+            data.update(
+                {
+                    "sender_info": self.sender_info,
+                    "receiver_info": self.receiver_info,
+                    "metadata": self.metadata_info,
+                    "description": self.description,
+                }
+            )
+        return data
+
+
+# Loader option that loads the deferred payload columns with the row.
+FULL_DETAIL = undefer_group("detail")
+
+# Row serializers for list and export paths: the keys of to_dict(detail=False)
+# and to_dict(), read straight from SELECT tuples.
+SUMMARY_ROWS = RowSerializer(
+    id=Transaction.id,
+    user_id=Transaction.user_id,
+    amount=Transaction.amount,
+    currency=Transaction.currency,
+    merchant=Transaction.merchant,
+    date=Transaction.date,
+    category=Transaction.category,
+    card_id=Transaction.card_id,
+    status=Transaction.status,
+    external_id=Transaction.external_id,
+    transaction_type=Transaction.transaction_type,
+    transaction_direction=Transaction.transaction_direction,
+    fee=Transaction.fee,
+    processed_at=Transaction.processed_at,
+    gateway=Transaction.gateway,
+    rrn=Transaction.rrn,
+    is_recurring=Transaction.is_recurring,
+    created_at=Transaction.created_at,
+)
+DETAIL_ROWS = RowSerializer(
+    **dict(zip(SUMMARY_ROWS.keys, SUMMARY_ROWS.columns)),
+    sender_info=Transaction.sender_info,
+    receiver_info=Transaction.receiver_info,
+    metadata=Transaction.metadata_info,
+    description=Transaction.description,
+)
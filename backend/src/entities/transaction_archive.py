@@ -0,0 +1,39 @@
+import datetime
+
+from configurations.database_config import db
+
+
+class TransactionArchiveSegment(db.Model):
+    """Index of one archived (user, month) segment file.
+
+    The segment holds the user's transactions of that month as zstd-compressed
+    NDJSON under TRANSACTION_ARCHIVE_DIR; `path` is relative to it. Written by
+    `flask archive-transactions`.
+    """
+
+    __tablename__ = "transaction_archive_segments"
+
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), primary_key=True
+    )
+    month = db.Column(db.Date, primary_key=True)  # First day of the month.
+    path = db.Column(db.String(255), nullable=False)
+    row_count = db.Column(db.Integer, nullable=False)
+    first_date = db.Column(db.DateTime, nullable=False)
+    last_date = db.Column(db.DateTime, nullable=False)
+    compressed_bytes = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
+
+    def to_dict(self):
+        return {
+            "user_id": str(self.user_id),
+            "month": self.month.isoformat() if self.month else None,
+            "path": self.path,
+            "row_count": self.row_count,
+            "first_date": self.first_date.isoformat() if self.first_date else None,
+            "last_date": self.last_date.isoformat() if self.last_date else None,
+            "compressed_bytes": self.compressed_bytes,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -44,8 +44,12 @@ class User(db.Model):
     def __repr__(self):
         return f"<User {self.email}>"
 
-    def to_dict(self):
-        """Convert user object to dictionary (useful for JSON serialization)."""
+    def to_dict(self, balances):
+        """Convert user object to dictionary (useful for JSON serialization).
+
+        `balances` maps card id to the card's ledger balance (cards.balance is
+        only the opening balance), see CardLedgerService.get_balances.
+        """
         return {
             "id": str(self.id),  # Convert UUID to string for JSON serialization.
             "username": self.username,
@@ -60,7 +64,7 @@ class User(db.Model):
             "age": self.age,
             "family_size": self.family_size,
             "role": self.role.value if hasattr(self.role, "value") else self.role,
-            "cards": [card.to_dict() for card in self.cards],
+            "cards": [card.to_dict(balances[str(card.id)]) for card in self.cards],
             "is_deleted": self.is_deleted,
             "is_active": self.is_active,
             "created_at": self.created_at.isoformat() if self.created_at else None,
@@ -0,0 +1,22 @@
+import datetime
+
+from configurations.database_config import db
+
+
+class UserDataVersion(db.Model):
+    """Per-user counter bumped by every commit that changes the user's data.
+
+    Transaction, goal, card and profile writes (and the batch jobs that rewrite
+    derived data) increment it in the same DB transaction; conditional GETs use
+    it as their ETag. Users without a row are at version 0.
+    """
+
+    __tablename__ = "user_data_versions"
+
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), primary_key=True
+    )
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
@@ -0,0 +1,53 @@
+import datetime
+import uuid
+
+from configurations.database_config import db
+
+
+class UserSubscription(db.Model):
+    """Recurring payment series (subscription or bill) detected for a user.
+
+    Rebuilt per user by `flask detect-recurring`; new matching transactions advance
+    last_seen and next_expected as they are created.
+    """
+
+    __tablename__ = "user_subscriptions"
+
+    id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False, index=True
+    )
+    merchant = db.Column(db.String(100), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    cadence = db.Column(db.String(10), nullable=False)  # "weekly" or "monthly".
+    interval_days = db.Column(db.Float, nullable=False)
+    typical_amount = db.Column(db.Float, nullable=False)
+    monthly_amount = db.Column(db.Float, nullable=False)
+    occurrences = db.Column(db.Integer, nullable=False)
+    first_seen = db.Column(db.DateTime, nullable=False)
+    last_seen = db.Column(db.DateTime, nullable=False)
+    next_expected = db.Column(db.DateTime, nullable=False)
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
+
+    def to_dict(self):
+        return {
+            "id": str(self.id),
+            "user_id": str(self.user_id),
+            "merchant": self.merchant,
+            "category": self.category,
+            "cadence": self.cadence,
+            "interval_days": self.interval_days,
+            "typical_amount": self.typical_amount,
+            "monthly_amount": self.monthly_amount,
+            "occurrences": self.occurrences,
+            "first_seen": self.first_seen.isoformat() if self.first_seen else None,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "next_expected": (
+                self.next_expected.isoformat() if self.next_expected else None
+            ),
+            "is_active": self.is_active,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,51 @@
+"""Store transaction payload columns as JSONB
+
+Revision ID: 0a6d9c3e7f15
+Revises: f3a8c1e5b920
+Create Date: 2026-10-19 22:00:00.000000
+
+Converts sender_info, receiver_info and metadata_info from JSON to JSONB (the
+ALTER propagates to every partition and rewrites them). With
+TRANSACTION_METADATA_GIN_INDEX=true it also adds a jsonb_path_ops GIN index on
+metadata_info for containment lookups (`metadata_info @> '{"key": "value"}'`).
+
+"""
+
+import os
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0a6d9c3e7f15"
+down_revision = "f3a8c1e5b920"
+branch_labels = None
+depends_on = None
+
+PAYLOAD_COLUMNS = ("sender_info", "receiver_info", "metadata_info")
+GIN_INDEX = "ix_transactions_metadata_info_gin"
+
+
+def upgrade():
+    op.execute(
+        "ALTER TABLE transactions "
+        + ", ".join(
+            f"ALTER COLUMN {name} TYPE jsonb USING {name}::jsonb"
+            for name in PAYLOAD_COLUMNS
+        )
+    )
+    if os.getenv("TRANSACTION_METADATA_GIN_INDEX", "false").lower() == "true":
+        op.execute(
+            f"CREATE INDEX {GIN_INDEX} ON transactions "
+            f"USING gin (metadata_info jsonb_path_ops)"
+        )
+
+
+def downgrade():
+    op.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+    op.execute(
+        "ALTER TABLE transactions "
+        + ", ".join(
+            f"ALTER COLUMN {name} TYPE json USING {name}::json"
+            for name in PAYLOAD_COLUMNS
+        )
+    )
@@ -0,0 +1,34 @@
+"""Add user_data_versions
+
+Revision ID: 1c7e5a2b9d84
+Revises: 0a6d9c3e7f15
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1c7e5a2b9d84"
+down_revision = "0a6d9c3e7f15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_data_versions",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("user_data_versions")
@@ -0,0 +1,62 @@
+"""Add spending_anomalies and spending_anomaly_scans
+
+Revision ID: 5c7d2e8a9f14
+Revises: e91f3b6d2a47
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c7d2e8a9f14"
+down_revision = "e91f3b6d2a47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "spending_anomalies",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("timeframe", sa.String(length=100), nullable=False),
+        sa.Column("spike_percent", sa.Float(), nullable=False),
+        sa.Column("current_amount", sa.Float(), nullable=False),
+        sa.Column("baseline_amount", sa.Float(), nullable=False),
+        sa.Column("z_score", sa.Float(), nullable=False),
+        sa.Column("severity", sa.String(length=10), nullable=False),
+        sa.Column("as_of", sa.Date(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_spending_anomalies_user_id", "spending_anomalies", ["user_id"])
+    op.create_index(
+        "ix_spending_anomalies_severity", "spending_anomalies", ["severity"]
+    )
+    op.create_table(
+        "spending_anomaly_scans",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("as_of", sa.Date(), nullable=False),
+        sa.Column("anomaly_count", sa.Integer(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("spending_anomaly_scans")
+    op.drop_index("ix_spending_anomalies_severity", table_name="spending_anomalies")
+    op.drop_index("ix_spending_anomalies_user_id", table_name="spending_anomalies")
+    op.drop_table("spending_anomalies")
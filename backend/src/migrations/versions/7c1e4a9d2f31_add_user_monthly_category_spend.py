@@ -0,0 +1,61 @@
+"""Add user_monthly_category_spend rollup
+
+Revision ID: 7c1e4a9d2f31
+Revises: 3b02be3813b2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "7c1e4a9d2f31"
+down_revision = "3b02be3813b2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_monthly_category_spend",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column(
+            "transaction_direction",
+            postgresql.ENUM(
+                "OUTGOING", "INCOMING", name="transactiondirection", create_type=False
+            ),
+            nullable=False,
+        ),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint(
+            "user_id", "month", "category", "transaction_direction"
+        ),
+    )
+
+    # Backfill from existing transactions.
+    op.execute(
+        """
+        INSERT INTO user_monthly_category_spend
+            (user_id, month, category, transaction_direction,
+             total_amount, transaction_count, updated_at)
+        SELECT user_id, date_trunc('month', date)::date, category,
+               transaction_direction, SUM(amount), COUNT(*), now()
+        FROM transactions
+        GROUP BY user_id, date_trunc('month', date)::date, category,
+                 transaction_direction
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("user_monthly_category_spend")
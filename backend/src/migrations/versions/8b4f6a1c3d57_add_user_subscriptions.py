@@ -0,0 +1,47 @@
+"""Add user_subscriptions
+
+Revision ID: 8b4f6a1c3d57
+Revises: 5c7d2e8a9f14
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8b4f6a1c3d57"
+down_revision = "5c7d2e8a9f14"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_subscriptions",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("merchant", sa.String(length=100), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("cadence", sa.String(length=10), nullable=False),
+        sa.Column("interval_days", sa.Float(), nullable=False),
+        sa.Column("typical_amount", sa.Float(), nullable=False),
+        sa.Column("monthly_amount", sa.Float(), nullable=False),
+        sa.Column("occurrences", sa.Integer(), nullable=False),
+        sa.Column("first_seen", sa.DateTime(), nullable=False),
+        sa.Column("last_seen", sa.DateTime(), nullable=False),
+        sa.Column("next_expected", sa.DateTime(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_subscriptions_user_id", "user_subscriptions", ["user_id"])
+
+
+def downgrade():
+    op.drop_index("ix_user_subscriptions_user_id", table_name="user_subscriptions")
+    op.drop_table("user_subscriptions")
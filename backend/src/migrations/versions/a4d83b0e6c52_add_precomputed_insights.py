@@ -0,0 +1,55 @@
+"""Add precomputed_insights
+
+Revision ID: a4d83b0e6c52
+Revises: 7c1e4a9d2f31
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a4d83b0e6c52"
+down_revision = "7c1e4a9d2f31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "precomputed_insights",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("subject_key", sa.String(length=64), nullable=False),
+        sa.Column("language", sa.String(length=5), nullable=False),
+        sa.Column("version", sa.String(length=64), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "kind",
+            "subject_key",
+            "language",
+            name="uq_precomputed_insights_subject",
+        ),
+    )
+    op.create_index(
+        "ix_user_monthly_category_spend_updated_at",
+        "user_monthly_category_spend",
+        ["updated_at"],
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_user_monthly_category_spend_updated_at",
+        table_name="user_monthly_category_spend",
+    )
+    op.drop_table("precomputed_insights")
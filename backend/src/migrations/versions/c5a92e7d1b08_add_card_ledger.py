@@ -0,0 +1,69 @@
+"""Add card_ledger_entries and card_balance_snapshots
+
+Revision ID: c5a92e7d1b08
+Revises: 8b4f6a1c3d57
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c5a92e7d1b08"
+down_revision = "8b4f6a1c3d57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "card_ledger_entries",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("card_id", sa.UUID(), nullable=False),
+        sa.Column("transaction_id", sa.UUID(), nullable=True),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["card_id"],
+            ["cards.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_card_ledger_entries_card_id_id", "card_ledger_entries", ["card_id", "id"]
+    )
+    op.create_table(
+        "card_balance_snapshots",
+        sa.Column("card_id", sa.UUID(), nullable=False),
+        sa.Column("last_entry_id", sa.BigInteger(), nullable=False),
+        sa.Column("balance", sa.Float(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("as_of", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["card_id"],
+            ["cards.id"],
+        ),
+        sa.PrimaryKeyConstraint("card_id", "last_entry_id"),
+    )
+
+
+def downgrade():
+    # Fold the ledger back into cards.balance, which was the running balance
+    # before this revision.
+    op.execute(
+        """
+        UPDATE cards
+        SET balance = cards.balance + ledger.total
+        FROM (
+            SELECT card_id, SUM(amount) AS total
+            FROM card_ledger_entries
+            GROUP BY card_id
+        ) AS ledger
+        WHERE cards.id = ledger.card_id
+        """
+    )
+    op.drop_table("card_balance_snapshots")
+    op.drop_index("ix_card_ledger_entries_card_id_id", table_name="card_ledger_entries")
+    op.drop_table("card_ledger_entries")
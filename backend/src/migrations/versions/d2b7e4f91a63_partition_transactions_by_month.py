@@ -0,0 +1,105 @@
+"""Partition transactions by month
+
+Revision ID: d2b7e4f91a63
+Revises: c5a92e7d1b08
+Create Date: 2026-10-19 20:00:00.000000
+
+Recreates `transactions` as a table partitioned by RANGE (date) with one partition
+per month (from the oldest transaction to three months ahead) plus a default
+partition, and copies the rows over. The primary key becomes (id, date), since a
+partitioned table's unique constraints must include the partition key. The copy
+rewrites the whole table; run it in a maintenance window on large databases.
+
+"""
+
+from datetime import date
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d2b7e4f91a63"
+down_revision = "c5a92e7d1b08"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _shift_months(month, offset):
+    index = month.year * 12 + month.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade():
+    op.execute("ALTER TABLE transactions RENAME TO transactions_unpartitioned")
+    op.execute(
+        "ALTER INDEX transactions_pkey RENAME TO transactions_unpartitioned_pkey"
+    )
+    op.execute(
+        "ALTER INDEX ix_transactions_user_id_date "
+        "RENAME TO ix_transactions_unpartitioned_user_id_date"
+    )
+
+    # Same columns, defaults and NOT NULLs; keys are added below.
+    op.execute(
+        "CREATE TABLE transactions (LIKE transactions_unpartitioned "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (date)"
+    )
+    op.create_primary_key("transactions_pkey", "transactions", ["id", "date"])
+    op.create_foreign_key(
+        "transactions_user_id_fkey", "transactions", "users", ["user_id"], ["id"]
+    )
+    op.create_foreign_key(
+        "transactions_card_id_fkey", "transactions", "cards", ["card_id"], ["id"]
+    )
+    op.create_index("ix_transactions_user_id_date", "transactions", ["user_id", "date"])
+
+    # Monthly partitions from the oldest transaction to MONTHS_AHEAD months ahead.
+    today = date.today()
+    current = date(today.year, today.month, 1)
+    oldest = (
+        op.get_bind()
+        .execute(sa.text("SELECT min(date) FROM transactions_unpartitioned"))
+        .scalar()
+    )
+    month = date(oldest.year, oldest.month, 1) if oldest else current
+    month = min(month, current)
+    while month <= _shift_months(current, MONTHS_AHEAD):
+        upper = _shift_months(month, 1)
+        op.execute(
+            f"CREATE TABLE transactions_{month.year:04d}_{month.month:02d} "
+            f"PARTITION OF transactions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_unpartitioned")
+    op.drop_table("transactions_unpartitioned")
+
+
+def downgrade():
+    op.execute("ALTER TABLE transactions RENAME TO transactions_partitioned")
+    op.execute("ALTER INDEX transactions_pkey RENAME TO transactions_partitioned_pkey")
+    op.execute(
+        "ALTER INDEX ix_transactions_user_id_date "
+        "RENAME TO ix_transactions_partitioned_user_id_date"
+    )
+
+    op.execute(
+        "CREATE TABLE transactions (LIKE transactions_partitioned "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_partitioned")
+    op.create_primary_key("transactions_pkey", "transactions", ["id"])
+    op.create_foreign_key(
+        "transactions_user_id_fkey", "transactions", "users", ["user_id"], ["id"]
+    )
+    op.create_foreign_key(
+        "transactions_card_id_fkey", "transactions", "cards", ["card_id"], ["id"]
+    )
+    op.create_index("ix_transactions_user_id_date", "transactions", ["user_id", "date"])
+
+    # Dropping the parent drops its attached partitions; detached ones are kept.
+    op.drop_table("transactions_partitioned")
@@ -0,0 +1,23 @@
+"""Add transactions (user_id, date) index
+
+Revision ID: e91f3b6d2a47
+Revises: a4d83b0e6c52
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e91f3b6d2a47"
+down_revision = "a4d83b0e6c52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_transactions_user_id_date", "transactions", ["user_id", "date"])
+
+
+def downgrade():
+    op.drop_index("ix_transactions_user_id_date", table_name="transactions")
@@ -0,0 +1,40 @@
+"""Add transaction_archive_segments
+
+Revision ID: f3a8c1e5b920
+Revises: d2b7e4f91a63
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f3a8c1e5b920"
+down_revision = "d2b7e4f91a63"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "transaction_archive_segments",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("path", sa.String(length=255), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("first_date", sa.DateTime(), nullable=False),
+        sa.Column("last_date", sa.DateTime(), nullable=False),
+        sa.Column("compressed_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "month"),
+    )
+
+
+def downgrade():
+    # Segment files are left on disk; rows archived into them are not restored.
+    op.drop_table("transaction_archive_segments")
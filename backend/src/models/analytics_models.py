@@ -0,0 +1,189 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from enums.transaction_category_enum import TransactionCategoryEnum
+
+# Fixed category order backing CategoryBreakdown.amounts.
+CATEGORIES: Tuple[TransactionCategoryEnum, ...] = tuple(TransactionCategoryEnum)
+_CATEGORY_INDEX: Dict[str, int] = {
+    category.value: index for index, category in enumerate(CATEGORIES)
+}
+_OTHER_INDEX = _CATEGORY_INDEX[TransactionCategoryEnum.OTHER.value]
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryBreakdown:
+    """Amount per transaction category, stored in TransactionCategoryEnum order."""
+
+    amounts: Tuple[float, ...]
+
+    @classmethod
+    def from_mapping(
+        cls,
+        totals: Mapping[str, float],
+        exclude: Tuple[TransactionCategoryEnum, ...] = (
+            TransactionCategoryEnum.INCOME,
+        ),
+    ) -> "CategoryBreakdown":
+        """Build from {category: amount}; unknown category names count as Other."""
+        amounts = [0.0] * len(CATEGORIES)
+        for category, amount in totals.items():
+            amounts[_CATEGORY_INDEX.get(category, _OTHER_INDEX)] += amount or 0.0
+        for category in exclude:
+            amounts[_CATEGORY_INDEX[category.value]] = 0.0
+        return cls(tuple(amounts))
+
+    @classmethod
+    def empty(cls) -> "CategoryBreakdown":
+        return cls((0.0,) * len(CATEGORIES))
+
+    def __getitem__(self, category: TransactionCategoryEnum) -> float:
+        return self.amounts[_CATEGORY_INDEX[category.value]]
+
+    def __bool__(self) -> bool:
+        return any(self.amounts)
+
+    def total(self) -> float:
+        return sum(self.amounts)
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        """(category name, amount) for categories with spending."""
+        for category, amount in zip(CATEGORIES, self.amounts):
+            if amount:
+                yield category.value, amount
+
+    def top(self) -> Tuple[Optional[str], float]:
+        """Category with the highest amount, or (None, 0) when empty."""
+        return max(self.items(), key=lambda item: item[1], default=(None, 0))
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(self.items())
+
+
+@dataclass(frozen=True, slots=True)
+class AnomalyResult:
+    """Outcome of spending anomaly detection for one user."""
+
+    detected: bool = False
+    category: Optional[str] = None
+    spike_percent: float = 0.0
+    current_amount: float = 0.0
+    previous_amount: float = 0.0  # Baseline the current amount is compared to.
+    timeframe: Optional[str] = None
+    z_score: float = 0.0
+    severity: Optional[str] = None  # "low", "medium" or "high".
+
+    def to_dict(self) -> dict:
+        return {
+            "category": self.category,
+            "spike_percent": round(self.spike_percent, 1),
+            "current_amount": round(self.current_amount, 0),
+            "previous_amount": round(self.previous_amount, 0),
+            "timeframe": self.timeframe,
+            "z_score": self.z_score,
+            "severity": self.severity,
+        }
+
+
+NO_ANOMALY = AnomalyResult()
+
+
+@dataclass(frozen=True, slots=True)
+class SpendingSummary:
+    """Current vs previous month spending (OUTGOING, Income excluded)."""
+
+    total_spending: float
+    categories: CategoryBreakdown
+    previous_month_spending: float
+    previous_categories: CategoryBreakdown
+    spending_change_percent: float
+    anomalies: Tuple[AnomalyResult, ...] = ()  # Ranked, most severe first.
+
+    @property
+    def anomaly(self) -> AnomalyResult:
+        """Most severe anomaly, or NO_ANOMALY."""
+        return self.anomalies[0] if self.anomalies else NO_ANOMALY
+
+
+@dataclass(frozen=True, slots=True)
+class GoalSnapshot:
+    """Goal fields and derived progress figures passed to the LLM prompts."""
+
+    name: str
+    target_amount: float
+    current_amount: float
+    remaining_amount: float
+    progress_percent: float
+    currency: str
+    target_date: Optional[str]
+    days_remaining: int
+    months_remaining: float
+    required_monthly_savings: float
+    priority: str
+    description: Optional[str]
+
+    @classmethod
+    def from_goal(cls, goal, now: Optional[datetime] = None) -> "GoalSnapshot":
+        """Derive progress and required savings from a Goal entity."""
+        now = now or datetime.now()
+        remaining_amount = max(0, goal.target_amount - goal.current_amount)
+        days_remaining = (goal.target_date - now).days if goal.target_date else 0
+        progress_percent = (
+            (goal.current_amount / goal.target_amount * 100)
+            if goal.target_amount > 0
+            else 0
+        )
+        months_remaining = max(1, days_remaining / 30) if days_remaining > 0 else 1
+        required_monthly_savings = remaining_amount / months_remaining
+
+        return cls(
+            name=goal.name,
+            target_amount=goal.target_amount,
+            current_amount=goal.current_amount,
+            remaining_amount=remaining_amount,
+            progress_percent=round(progress_percent, 1),
+            currency=goal.currency,
+            target_date=(
+                goal.target_date.strftime("%Y-%m-%d") if goal.target_date else None
+            ),
+            days_remaining=days_remaining,
+            months_remaining=round(months_remaining, 1),
+            required_monthly_savings=round(required_monthly_savings, 0),
+            priority=goal.priority.value if goal.priority else "MEDIUM",
+            description=goal.description,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CashFlowForecast:
+    """Fitted monthly income and spending model for one user.
+
+    Each series follows simple exponential smoothing on seasonally adjusted
+    values: next month = level * seasonality[calendar month] + noise, and the
+    level moves by `alpha` times each month's surprise. `sigma` is the standard
+    deviation of one-step-ahead errors (in seasonally adjusted units).
+    """
+
+    start_month: date  # First forecast month (the current, incomplete month).
+    months_observed: int
+    method: str  # "seasonal_ses", "ses" or "salary" (no usable income history).
+    income_level: float
+    income_alpha: float
+    income_sigma: float
+    income_seasonality: Tuple[float, ...]  # 12 factors, January first.
+    spending_level: float
+    spending_alpha: float
+    spending_sigma: float
+    spending_seasonality: Tuple[float, ...]
+
+    def expected(self, months: int) -> Tuple[List[float], List[float]]:
+        """Expected (income, spending) for the first `months` forecast months."""
+        income, spending = [], []
+        for offset in range(months):
+            calendar_month = (self.start_month.month - 1 + offset) % 12
+            income.append(self.income_level * self.income_seasonality[calendar_month])
+            spending.append(
+                self.spending_level * self.spending_seasonality[calendar_month]
+            )
+        return income, spending
@@ -2,7 +2,7 @@
 
 from dotenv import load_dotenv
 
-from app import app
+from app import create_app
 from configurations.logging_config import get_logger
 from services.seedings.seeding_service import SeedingService
 
@@ -14,7 +14,7 @@ logger = get_logger(__name__)
 if __name__ == "__main__":
     logger.info("=== Manual Database Seeding Started ===")
     try:
-        SeedingService.seed_all_data(app)
+        SeedingService.seed_all_data(create_app())
         logger.info("=== Manual Database Seeding Completed Successfully ===")
     except Exception as e:
         logger.error(f"=== Manual Database Seeding Failed: {str(e)} ===")
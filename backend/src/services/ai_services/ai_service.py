@@ -2,12 +2,11 @@ import os
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-
 from configurations.logging_config import get_logger
 from enums.transaction_category_enum import TransactionCategoryEnum
-from services.ai_services.llm_client import LLMClient
+from models.analytics_models import GoalSnapshot, SpendingSummary
+from services.ai_services.llm_client import LLMClient, build_prompt
+from services.ai_services.llm_telemetry import invoke_chain
 from services.ai_services.structured_outputs import (
     AgrobankProductRecommendations,
     FinancialInsights,
@@ -16,6 +15,7 @@ from services.ai_services.structured_outputs import (
     SmartRecommendations,
     TransactionCategorization,
 )
+from services.core.user_cache import UserProfileSnapshot
 
 logger = get_logger(__name__)
 
@@ -70,19 +70,19 @@ class AIService:
             user_prompt = _load_prompt("transaction_categorization_user.md")
 
             # Build prompt template.
-            prompt = ChatPromptTemplate.from_messages(
-                [("system", system_prompt), ("user", user_prompt)]
-            )
+            prompt = build_prompt(system_prompt, user_prompt)
 
             # Create chain and invoke.
             chain = prompt | structured_llm
-            response = chain.invoke(
+            response = invoke_chain(
+                chain,
                 {
                     "transaction_type": transaction_type,
                     "transaction_direction": transaction_direction,
                     "description": description,
                     "merchant_name": merchant_name or "N/A",
-                }
+                },
+                "transaction_categorization",
             )
 
             logger.info(f"Categorized transaction as {response.category.value}")
@@ -94,13 +94,15 @@ class AIService:
 
     @staticmethod
     def generate_insights(
-        spending_summary: Dict, user_profile: Dict, language: str = "en"
+        spending_summary: SpendingSummary,
+        user_profile: UserProfileSnapshot,
+        language: str = "en",
     ) -> Optional[List[str]]:
         """Generate financial insights based on spending summary and user profile using LLM
 
         Args:
-            spending_summary: Dict with spending data
-            user_profile: Dict with user profile data
+            spending_summary: Current vs previous month spending
+            user_profile: The user's profile snapshot
             language: Language code ('en', 'uz', 'ru'). Defaults to 'en'.
         """
         try:
@@ -117,13 +119,11 @@ class AIService:
             user_prompt = _load_prompt("financial_insights_user.md")
 
             # Build prompt template.
-            prompt = ChatPromptTemplate.from_messages(
-                [("system", system_prompt), ("user", user_prompt)]
-            )
+            prompt = build_prompt(system_prompt, user_prompt)
 
             # Format current month spending breakdown.
-            current_categories = spending_summary.get("category_breakdown", {})
-            total_spending = spending_summary.get("total_spending", 0)
+            current_categories = spending_summary.categories
+            total_spending = spending_summary.total_spending
 
             spending_breakdown = (
                 "\n".join(
@@ -137,9 +137,9 @@ class AIService:
             )
 
             # Format previous month data for trend analysis.
-            previous_categories = spending_summary.get("previous_month_categories", {})
-            previous_spending = spending_summary.get("previous_month_spending", 0)
-            spending_change = spending_summary.get("spending_change_percent", 0)
+            previous_categories = spending_summary.previous_categories
+            previous_spending = spending_summary.previous_month_spending
+            spending_change = spending_summary.spending_change_percent
 
             previous_month_breakdown = (
                 "\n".join(
@@ -155,7 +155,7 @@ class AIService:
             # Calculate category-level changes for richer insights.
             category_changes = []
             for category, current_amount in current_categories.items():
-                previous_amount = previous_categories.get(category, 0)
+                previous_amount = previous_categories[TransactionCategoryEnum(category)]
                 if previous_amount > 0:
                     change_percent = (
                         (current_amount - previous_amount) / previous_amount
@@ -171,35 +171,36 @@ class AIService:
             )
 
             # Calculate savings.
-            income = user_profile.get("salary", 0)
+            income = user_profile.salary or 0
             savings = income - total_spending
             savings_rate = (savings / income * 100) if income > 0 else 0
 
             # Get anomaly data if available.
-            anomaly_data = spending_summary.get("anomaly_data", {})
-            has_anomaly = anomaly_data.get("detected", False)
+            anomaly = spending_summary.anomaly
+            has_anomaly = anomaly.detected
 
             # Format anomaly information for LLM.
             if has_anomaly:
                 anomaly_text = (
                     f"ANOMALY DETECTED:\n"
-                    f"- Category: {anomaly_data.get('category')}\n"
-                    f"- Spike: {anomaly_data.get('spike_percent', 0):.1f}% increase\n"
-                    f"- Current amount: {anomaly_data.get('current_amount', 0):,.0f} UZS\n"
-                    f"- Previous amount: {anomaly_data.get('previous_amount', 0):,.0f} UZS\n"
-                    f"- Timeframe: {anomaly_data.get('timeframe', 'unknown')}"
+                    f"- Category: {anomaly.category}\n"
+                    f"- Spike: {anomaly.spike_percent:.1f}% increase\n"
+                    f"- Current amount: {anomaly.current_amount:,.0f} UZS\n"
+                    f"- Previous amount: {anomaly.previous_amount:,.0f} UZS\n"
+                    f"- Timeframe: {anomaly.timeframe or 'unknown'}"
                 )
             else:
                 anomaly_text = "No anomalies detected."
 
             # Create chain and invoke.
             chain = prompt | structured_llm
-            response = chain.invoke(
+            response = invoke_chain(
+                chain,
                 {
                     "language": language,
                     "salary": income,
-                    "age": user_profile.get("age", "unknown"),
-                    "family_size": user_profile.get("family_size", 1),
+                    "age": user_profile.age or "unknown",
+                    "family_size": user_profile.family_size or 1,
                     "total_spending": total_spending,
                     "savings": savings,
                     "savings_rate": round(savings_rate, 1),
@@ -210,7 +211,8 @@ class AIService:
                     "category_changes": category_changes_text,
                     "anomaly_info": anomaly_text,
                     "has_anomaly": has_anomaly,
-                }
+                },
+                "financial_insights",
             )
 
             if response.category_insight and response.trend_insight:
@@ -247,7 +249,8 @@ class AIService:
 
         Args:
             user_profile: Dict with user profile data
-            spending_summary: Dict with spending data
+            spending_summary: Dict with spending data (optionally
+                recurring_monthly_total from RecurringPaymentService)
             goals: List of goal dicts
             language: Language code ('en', 'uz', 'ru'). Defaults to 'en'.
         """
@@ -266,9 +269,7 @@ class AIService:
             user_prompt = _load_prompt("smart_recommendations_user.md")
 
             # Build prompt template.
-            prompt = ChatPromptTemplate.from_messages(
-                [("system", system_prompt), ("user", user_prompt)]
-            )
+            prompt = build_prompt(system_prompt, user_prompt)
 
             # Format spending breakdown.
             # Handle both 'spending' and 'category_breakdown' keys for compatibility.
@@ -306,7 +307,8 @@ class AIService:
 
             # Create chain and invoke.
             chain = prompt | structured_llm
-            response = chain.invoke(
+            response = invoke_chain(
+                chain,
                 {
                     "language": language,
                     "salary": user_profile.get("salary", 0),
@@ -314,7 +316,8 @@ class AIService:
                     "savings": spending_summary.get("savings", 0),
                     "spending_breakdown": spending_breakdown,
                     "goals_breakdown": goals_breakdown,
-                }
+                },
+                "smart_recommendations",
             )
 
             if response.recommendations and len(response.recommendations) > 0:
@@ -356,43 +359,54 @@ class AIService:
                     f"Increasing savings by {potential_increase/1000}K UZS/month accelerates your goal."
                 )
 
-        # Fallback
+        # Fallback: point at actual recurring payments (from the subscription index).
         if not recommendations:
-            recommendations.append(
-                "Review your recurring subscriptions to find hidden savings."
-            )
+            recurring_total = spending_summary.get("recurring_monthly_total", 0)
+            if recurring_total > 0:
+                recommendations.append(
+                    f"Your subscriptions and bills cost {recurring_total:,.0f} UZS/month. "
+                    "Cancel the ones you no longer use."
+                )
+            else:
+                recommendations.append(
+                    "Set a monthly budget per category to find hidden savings."
+                )
 
         return recommendations[:2]
 
     @staticmethod
-    def check_budget_alerts(spending_summary: Dict, user_profile: Dict) -> List[str]:
+    def check_budget_alerts(
+        spending_summary: SpendingSummary, user_profile: UserProfileSnapshot
+    ) -> List[str]:
         """Check for budget alerts"""
         alerts = []
-        categories = spending_summary.get("category_breakdown", {})
-        income = user_profile.get("salary", 0)
+        categories = spending_summary.categories
+        income = user_profile.salary or 0
 
         if income > 0:
             # Alert 1: Entertainment > 30%
-            entertainment = categories.get("Entertainment", 0)
+            entertainment = categories[TransactionCategoryEnum.ENTERTAINMENT]
             if (entertainment / income) > 0.3:
                 alerts.append("You’re overspending on Entertainment (>30% of income).")
 
             # Alert 2: Shopping > 40%
-            shopping = categories.get("Shopping", 0)
+            shopping = categories[TransactionCategoryEnum.SHOPPING]
             if (shopping / income) > 0.4:
                 alerts.append("High shopping expenses detected.")
 
         return alerts
 
     @staticmethod
-    def calculate_health_score(spending_summary: Dict, user_profile: Dict) -> Dict:
+    def calculate_health_score(
+        spending_summary: SpendingSummary, user_profile: UserProfileSnapshot
+    ) -> Dict:
         """Calculate financial health score (0-100)"""
         score = 100
         deductions = 0
 
-        total_spending = spending_summary.get("total_spending", 0)
-        categories = spending_summary.get("category_breakdown", {})
-        income = user_profile.get("salary", 0)
+        total_spending = spending_summary.total_spending
+        categories = spending_summary.categories
+        income = user_profile.salary or 0
 
         if income > 0:
             # 1. Savings Rate (Target 20%)
@@ -407,7 +421,10 @@ class AIService:
 
             # 2. Category Balance
             # Penalty for high wants
-            wants = categories.get("Entertainment", 0) + categories.get("Shopping", 0)
+            wants = (
+                categories[TransactionCategoryEnum.ENTERTAINMENT]
+                + categories[TransactionCategoryEnum.SHOPPING]
+            )
             if (wants / income) > 0.5:
                 deductions += 20
 
@@ -431,13 +448,13 @@ class AIService:
 
     @staticmethod
     def generate_goal_insights(
-        goal_data: Dict, spending_data: Dict, language: str = "en"
+        goal: GoalSnapshot, spending_data: Dict, language: str = "en"
     ) -> Dict:
         """Generate goal-specific insights using LLM.
 
         Args:
-            goal_data: Dict with goal information
-            spending_data: Dict with spending data
+            goal: Goal fields and progress figures
+            spending_data: Dict with spending data (categories is a CategoryBreakdown)
             language: Language code ('en', 'uz', 'ru'). Defaults to 'en'.
         """
         try:
@@ -449,31 +466,30 @@ class AIService:
             system_prompt = _load_prompt("goal_insights_system.md")
             user_prompt = _load_prompt("goal_insights_user.md")
 
-            prompt = ChatPromptTemplate.from_messages(
-                [("system", system_prompt), ("user", user_prompt)]
-            )
+            prompt = build_prompt(system_prompt, user_prompt)
 
             # Format category breakdown.
             category_breakdown = "\n".join(
                 [
-                    f"- {category}: {amount} {goal_data['currency']}"
-                    for category, amount in spending_data.get("categories", {}).items()
+                    f"- {category}: {amount} {goal.currency}"
+                    for category, amount in spending_data["categories"].items()
                 ]
             )
 
             chain = prompt | structured_llm
-            response = chain.invoke(
+            response = invoke_chain(
+                chain,
                 {
                     "language": language,
-                    "goal_name": goal_data["name"],
-                    "target_amount": goal_data["target_amount"],
-                    "current_amount": goal_data["current_amount"],
-                    "remaining_amount": goal_data["remaining_amount"],
-                    "progress_percent": goal_data["progress_percent"],
-                    "months_remaining": goal_data["months_remaining"],
-                    "required_monthly_savings": goal_data["required_monthly_savings"],
-                    "currency": goal_data["currency"],
-                    "user_salary": goal_data["user_salary"],
+                    "goal_name": goal.name,
+                    "target_amount": goal.target_amount,
+                    "current_amount": goal.current_amount,
+                    "remaining_amount": goal.remaining_amount,
+                    "progress_percent": goal.progress_percent,
+                    "months_remaining": goal.months_remaining,
+                    "required_monthly_savings": goal.required_monthly_savings,
+                    "currency": goal.currency,
+                    "user_salary": spending_data["income"],
                     "current_monthly_savings": spending_data["current_monthly_savings"],
                     "savings_gap": spending_data["savings_gap"],
                     "monthly_spending": spending_data["monthly_spending"],
@@ -481,7 +497,8 @@ class AIService:
                     "is_overspending": spending_data["is_overspending"],
                     "top_category": spending_data["top_category"],
                     "top_category_amount": spending_data["top_category_amount"],
-                }
+                },
+                "goal_insights",
             )
 
             logger.info(f"Successfully generated goal insights via LLM in {language}.")
@@ -505,7 +522,7 @@ class AIService:
         goal_data: Dict,
         financial_data: Dict,
         monte_carlo_results: Dict,
-        timeline_data: List[Dict],
+        timeline_data: Dict[str, List],
         language: str = "en",
     ) -> Dict:
         """Generate goal timeline prediction with Monte Carlo simulation interpretation using LLM.
@@ -514,7 +531,7 @@ class AIService:
             goal_data: Dict with goal information
             financial_data: Dict with financial data
             monte_carlo_results: Dict with Monte Carlo simulation results
-            timeline_data: List of timeline data points
+            timeline_data: Column-oriented timeline ({"month": [...], "p50_median": [...], ...})
             language: Language code ('en', 'uz', 'ru'). Defaults to 'en'.
         """
         try:
@@ -528,20 +545,21 @@ class AIService:
             system_prompt = _load_prompt("goal_timeline_system.md")
             user_prompt = _load_prompt("goal_timeline_user.md")
 
-            prompt = ChatPromptTemplate.from_messages(
-                [("system", system_prompt), ("user", user_prompt)]
-            )
+            prompt = build_prompt(system_prompt, user_prompt)
 
-            # Format timeline data for prompt
+            # Format timeline data for prompt (median balance, first 12 months).
             timeline_str = "\n".join(
                 [
-                    f"Month {d['month']}: {d['amount']:,.0f} {goal_data['currency']}"
-                    for d in timeline_data[:12]  # Show first 12 months
+                    f"Month {month}: {amount:,.0f} {goal_data['currency']}"
+                    for month, amount in zip(
+                        timeline_data["month"][:12], timeline_data["p50_median"][:12]
+                    )
                 ]
             )
 
             chain = prompt | structured_llm
-            response = chain.invoke(
+            response = invoke_chain(
+                chain,
                 {
                     "language": language,
                     "goal_name": goal_data["name"],
@@ -551,9 +569,9 @@ class AIService:
                     "currency": goal_data["currency"],
                     "income": financial_data["income"],
                     "monthly_spending": financial_data["monthly_spending"],
-                    "installments": financial_data["installments"],
-                    "taxes": financial_data["taxes"],
-                    "volatility_buffer": financial_data["volatility_buffer"],
+                    "income_volatility": financial_data["income_volatility"],
+                    "spending_volatility": financial_data["spending_volatility"],
+                    "months_observed": financial_data["months_observed"],
                     "real_contribution": financial_data["real_contribution"],
                     "simulations": monte_carlo_results["simulations"],
                     "deterministic_months": monte_carlo_results["deterministic_months"],
@@ -564,7 +582,8 @@ class AIService:
                     "target_date": goal_data.get("target_date", "Not set"),
                     "months_to_target": goal_data.get("months_to_target", 0),
                     "timeline_data": timeline_str,
-                }
+                },
+                "goal_timeline",
             )
 
             logger.info(
@@ -610,13 +629,16 @@ class AIService:
 
     @staticmethod
     def recommend_agrobank_products(
-        goal_data: Dict, spending_data: Dict, products: List[Dict], language: str = "en"
+        goal: GoalSnapshot,
+        spending_data: Dict,
+        products: List[Dict],
+        language: str = "en",
     ) -> List[Dict]:
         """Recommend Agrobank products for a specific goal using LLM.
 
         Args:
-            goal_data: Dict with goal information
-            spending_data: Dict with spending data
+            goal: Goal fields and progress figures
+            spending_data: Dict with spending data (categories is a CategoryBreakdown)
             products: List of available products
             language: Language code ('en', 'uz', 'ru'). Defaults to 'en'.
         """
@@ -633,9 +655,7 @@ class AIService:
             system_prompt = _load_prompt("agrobank_recommendations_system.md")
             user_prompt = _load_prompt("agrobank_recommendations_user.md")
 
-            prompt = ChatPromptTemplate.from_messages(
-                [("system", system_prompt), ("user", user_prompt)]
-            )
+            prompt = build_prompt(system_prompt, user_prompt)
 
             # Format products list
             products_list = "\n".join(
@@ -648,23 +668,24 @@ class AIService:
             # Format category breakdown
             category_breakdown = "\n".join(
                 [
-                    f"- {category}: {amount} {goal_data['currency']}"
-                    for category, amount in spending_data.get("categories", {}).items()
+                    f"- {category}: {amount} {goal.currency}"
+                    for category, amount in spending_data["categories"].items()
                 ]
             )
 
             chain = prompt | structured_llm
-            response = chain.invoke(
+            response = invoke_chain(
+                chain,
                 {
                     "language": language,
-                    "goal_name": goal_data["name"],
-                    "target_amount": goal_data["target_amount"],
-                    "current_amount": goal_data["current_amount"],
-                    "remaining_amount": goal_data["remaining_amount"],
-                    "progress_percent": goal_data["progress_percent"],
-                    "months_remaining": goal_data["months_remaining"],
-                    "required_monthly_savings": goal_data["required_monthly_savings"],
-                    "currency": goal_data["currency"],
+                    "goal_name": goal.name,
+                    "target_amount": goal.target_amount,
+                    "current_amount": goal.current_amount,
+                    "remaining_amount": goal.remaining_amount,
+                    "progress_percent": goal.progress_percent,
+                    "months_remaining": goal.months_remaining,
+                    "required_monthly_savings": goal.required_monthly_savings,
+                    "currency": goal.currency,
                     "income": spending_data["income"],
                     "monthly_spending": spending_data["monthly_spending"],
                     "current_monthly_savings": spending_data["current_monthly_savings"],
@@ -672,9 +693,13 @@ class AIService:
                     "spending_rate": spending_data["spending_rate"],
                     "top_category": spending_data["top_category"],
                     "top_category_amount": spending_data["top_category_amount"],
+                    "recurring_monthly_total": spending_data.get(
+                        "recurring_monthly_total", 0
+                    ),
                     "category_breakdown": category_breakdown,
                     "products_list": products_list,
-                }
+                },
+                "agrobank_recommendations",
             )
 
             logger.info(
@@ -12,8 +12,6 @@ Supports both OpenAI API and local LLMs (like LM Studio) via environment variabl
 import os
 from pathlib import Path
 
-from langchain_openai import ChatOpenAI
-
 from configurations.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -32,9 +30,14 @@ class LLMClient:
 
     def __init__(self):
         """Initialize the LLM with the configured target model (local or OpenAI)."""
+        # Imported lazily: langchain/openai are heavy and only needed once an LLM call is made.
+        from langchain_openai import ChatOpenAI
+
         if USE_LOCAL_LLM:
             # Use local LLM (LM Studio, Ollama, etc.) via OpenAI-compatible API.
-            logger.info(f"Using LOCAL LLM at {LOCAL_LLM_URL} with model: {LOCAL_MODEL_NAME}")
+            logger.info(
+                f"Using LOCAL LLM at {LOCAL_LLM_URL} with model: {LOCAL_MODEL_NAME}"
+            )
             self.llm = ChatOpenAI(
                 model=LOCAL_MODEL_NAME,
                 temperature=0.7,  # Qwen3 recommended: 0.7
@@ -57,3 +60,12 @@ class LLMClient:
                 api_key=self.api_key,
             )
             logger.info(f"LLMClient initialized with OpenAI model: {TARGET_MODEL}")
+
+
+def build_prompt(system_prompt: str, user_prompt: str):
+    """Build a system/user chat prompt template (imports LangChain lazily)."""
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_messages(
+        [("system", system_prompt), ("user", user_prompt)]
+    )
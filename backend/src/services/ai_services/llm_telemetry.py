@@ -0,0 +1,179 @@
+"""
+LLM call telemetry.
+
+`invoke_chain` wraps every chain invocation and records, per prompt and endpoint:
+model, input/output tokens (counted with tiktoken), estimated cost, wall time and
+whether the response came from the LangChain LLM cache. Metrics go to the shared
+registry and are served in Prometheus format at /metrics.
+
+Cost estimates use these environment variables (USD per 1M tokens, OpenAI only;
+local models are free):
+- LLM_INPUT_COST_PER_1M=0.15
+- LLM_OUTPUT_COST_PER_1M=0.60
+"""
+
+import os
+import time
+
+from flask import has_request_context, request
+
+from configurations.logging_config import get_logger
+from services.ai_services.llm_client import (
+    LOCAL_MODEL_NAME,
+    TARGET_MODEL,
+    USE_LOCAL_LLM,
+)
+from services.monitoring.metrics_registry import metrics
+
+logger = get_logger(__name__)
+
+ACTIVE_MODEL = LOCAL_MODEL_NAME if USE_LOCAL_LLM else TARGET_MODEL
+INPUT_COST_PER_1M = (
+    0.0 if USE_LOCAL_LLM else float(os.getenv("LLM_INPUT_COST_PER_1M", "0.15"))
+)
+OUTPUT_COST_PER_1M = (
+    0.0 if USE_LOCAL_LLM else float(os.getenv("LLM_OUTPUT_COST_PER_1M", "0.60"))
+)
+
+metrics.counter(
+    "llm_requests_total", "LLM calls by endpoint, prompt, model, status and cache hit."
+)
+metrics.counter(
+    "llm_input_tokens_total", "Prompt tokens sent to the LLM (tiktoken count)."
+)
+metrics.counter(
+    "llm_output_tokens_total", "Completion tokens returned by the LLM (tiktoken count)."
+)
+metrics.counter("llm_cost_usd_total", "Estimated LLM spend in USD.")
+metrics.histogram("llm_request_duration_seconds", "Wall time of LLM chain invocations.")
+
+# Encoder and callback handler class are created lazily (tiktoken/langchain are heavy).
+_encoder = None
+_callback_handler_class = None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with the active model's tiktoken encoding.
+
+    Falls back to a 4-characters-per-token estimate when the encoding files are not
+    available (tiktoken downloads them on first use).
+    """
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+
+            try:
+                _encoder = tiktoken.encoding_for_model(ACTIVE_MODEL)
+            except KeyError:
+                _encoder = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            logger.warning(f"tiktoken encoding unavailable, estimating tokens: {e}")
+            _encoder = False
+    if not _encoder:
+        return len(text) // 4
+    return len(_encoder.encode(text, disallowed_special=()))
+
+
+def _get_callback_handler_class():
+    """Build the LangChain callback handler class on first use."""
+    global _callback_handler_class
+    if _callback_handler_class is None:
+        from langchain_core.callbacks import BaseCallbackHandler
+
+        class LLMCallTracer(BaseCallbackHandler):
+            """Captures prompt/completion text and cache hits of the chat model calls."""
+
+            def __init__(self):
+                self.input_text = []
+                self.output_text = []
+                self.cache_hit = False
+
+            def on_chat_model_start(self, serialized, messages, **kwargs):
+                for batch in messages:
+                    self.input_text.extend(str(m.content) for m in batch)
+
+            def on_llm_end(self, response, **kwargs):
+                for generations in response.generations:
+                    for generation in generations:
+                        message = getattr(generation, "message", None)
+                        if message is None:
+                            self.output_text.append(generation.text)
+                            continue
+                        self.output_text.append(str(message.content or ""))
+                        self.output_text.extend(
+                            str(call.get("args", "")) for call in message.tool_calls
+                        )
+                        # LangChain zeroes total_cost on responses served from its cache.
+                        usage = message.usage_metadata or {}
+                        if usage.get("total_cost") == 0:
+                            self.cache_hit = True
+
+        _callback_handler_class = LLMCallTracer
+    return _callback_handler_class
+
+
+def _current_endpoint() -> str:
+    if not has_request_context():
+        return "background"
+    rule = request.url_rule.rule if request.url_rule else request.path
+    return f"{request.method} {rule}"
+
+
+def record_llm_call(
+    prompt_name: str,
+    duration_seconds: float,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cache_hit: bool = False,
+    status: str = "success",
+):
+    """Record one LLM call in the metrics registry."""
+    labels = {
+        "endpoint": _current_endpoint(),
+        "prompt": prompt_name,
+        "model": ACTIVE_MODEL,
+    }
+    cost = (
+        input_tokens * INPUT_COST_PER_1M + output_tokens * OUTPUT_COST_PER_1M
+    ) / 1_000_000
+    metrics.inc(
+        "llm_requests_total",
+        {**labels, "status": status, "cache_hit": str(cache_hit).lower()},
+    )
+    metrics.inc("llm_input_tokens_total", labels, input_tokens)
+    metrics.inc("llm_output_tokens_total", labels, output_tokens)
+    metrics.inc("llm_cost_usd_total", labels, cost)
+    metrics.observe("llm_request_duration_seconds", labels, duration_seconds)
+    logger.info(
+        f"LLM call {prompt_name} ({ACTIVE_MODEL}): {duration_seconds * 1000:.0f} ms, "
+        f"{input_tokens} in / {output_tokens} out tokens, cache_hit={cache_hit}, "
+        f"status={status}"
+    )
+
+
+def invoke_chain(chain, inputs: dict, prompt_name: str):
+    """Invoke a LangChain runnable and record telemetry for it.
+
+    Args:
+        chain: Runnable to invoke (usually `prompt | structured_llm`).
+        inputs: Prompt variables.
+        prompt_name: Prompt identifier used as the metrics label.
+    """
+    tracer = _get_callback_handler_class()()
+    started = time.perf_counter()
+    status = "success"
+    try:
+        return chain.invoke(inputs, config={"callbacks": [tracer]})
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        record_llm_call(
+            prompt_name,
+            time.perf_counter() - started,
+            input_tokens=count_tokens("\n".join(tracer.input_text)),
+            output_tokens=count_tokens("\n".join(tracer.output_text)),
+            cache_hit=tracer.cache_hit,
+            status=status,
+        )
@@ -0,0 +1,220 @@
+"""
+Append-only card balance ledger.
+
+Every balance change is a row in card_ledger_entries; cards.balance is the opening
+balance and is never updated. A card's balance is its latest snapshot (or the
+opening balance) plus the entries written after it. `flask compact-card-ledger`
+folds entries into card_balance_snapshots so that tail stays short on busy cards.
+
+Credits only insert an entry and take no lock on the card row. Debits lock the
+card row (SELECT ... FOR UPDATE) for the funds check, so debits of one card are
+still serialized with each other, but never with credits or with readers.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func, select, true
+from sqlalchemy.dialects.postgresql import insert
+
+from configurations.database_config import db, note_written_users
+from configurations.logging_config import get_logger
+from entities.card import Card
+from entities.card_ledger import CardBalanceSnapshot, CardLedgerEntry
+
+logger = get_logger(__name__)
+
+# Entries younger than this are left for the next compaction run. Entry ids come
+# from a sequence, so a slow writer can commit a lower id after a higher one; the
+# lag keeps a snapshot from skipping over such an entry.
+LEDGER_COMPACTION_LAG_SECONDS = float(os.getenv("LEDGER_COMPACTION_LAG_SECONDS", "60"))
+
+CARD_NOT_OWNED = "Card does not belong to the provided user"
+
+Entry = CardLedgerEntry
+Snapshot = CardBalanceSnapshot
+
+
+def _latest_snapshot(at: Optional[datetime] = None):
+    """Lateral subquery with each card's latest snapshot (taken by `at`)."""
+    query = select(Snapshot.balance, Snapshot.last_entry_id).where(
+        Snapshot.card_id == Card.id
+    )
+    if at is not None:
+        query = query.where(Snapshot.as_of <= at)
+    return query.order_by(Snapshot.last_entry_id.desc()).limit(1).lateral()
+
+
+class CardLedgerService:
+    """Writes ledger entries, reads balances and compacts entries into snapshots."""
+
+    @staticmethod
+    def append(
+        card_id,
+        amount: float,
+        direction: str,
+        user_id=None,
+        transaction_id=None,
+    ) -> Tuple[bool, str]:
+        """Record a debit or credit inside the caller's DB transaction.
+
+        Checks ownership (when user_id is given) and, for debits, available funds.
+        The caller commits or rolls back.
+        """
+        if direction not in ("OUTGOING", "INCOMING"):
+            return False, f"Invalid direction: {direction}"
+
+        # 1. Ownership; debits lock the card row until commit so concurrent debits
+        # re-check funds one at a time.
+        query = db.session.query(Card.user_id).filter(Card.id == card_id)
+        if direction == "OUTGOING":
+            query = query.with_for_update()
+        owner_id = query.scalar()
+        if owner_id is None:
+            return False, "Card not found"
+        if user_id is not None and str(owner_id) != str(user_id):
+            return False, CARD_NOT_OWNED
+
+        # 2. Funds check against snapshot + tail.
+        if direction == "OUTGOING":
+            if CardLedgerService.get_balance(card_id) < amount:
+                return False, "Insufficient funds"
+            amount = -amount
+
+        db.session.execute(
+            insert(Entry).values(
+                card_id=card_id,
+                transaction_id=transaction_id,
+                amount=amount,
+                created_at=datetime.utcnow(),
+            )
+        )
+        note_written_users([owner_id])
+        return True, "Balance updated"
+
+    @staticmethod
+    def get_balances(
+        card_ids: Iterable, at: Optional[datetime] = None
+    ) -> Dict[str, float]:
+        """Balances of several cards in one query, now or at a point in time.
+
+        Returns:
+            {card_id: balance} for the cards that exist.
+        """
+        card_ids = [str(card_id) for card_id in card_ids]
+        if not card_ids:
+            return {}
+
+        snapshot = _latest_snapshot(at)
+        base_entry_id = func.coalesce(snapshot.c.last_entry_id, 0)
+        tail = select(func.coalesce(func.sum(Entry.amount), 0.0)).where(
+            Entry.card_id == Card.id, Entry.id > base_entry_id
+        )
+        if at is not None:
+            tail = tail.where(Entry.created_at <= at)
+
+        rows = db.session.execute(
+            select(
+                Card.id,
+                func.coalesce(snapshot.c.balance, Card.balance)
+                + tail.scalar_subquery(),
+            )
+            .select_from(Card)
+            .outerjoin(snapshot, true())
+            .where(Card.id.in_(card_ids))
+        ).all()
+        return {str(card_id): float(balance) for card_id, balance in rows}
+
+    @staticmethod
+    def get_balance(card_id, at: Optional[datetime] = None) -> Optional[float]:
+        """Current balance of a card (or its balance at `at`); None if not found."""
+        return CardLedgerService.get_balances([card_id], at).get(str(card_id))
+
+    @staticmethod
+    def compact(
+        card_ids: Optional[Iterable] = None,
+        min_entries: int = 1,
+        lag_seconds: float = LEDGER_COMPACTION_LAG_SECONDS,
+    ) -> Dict[str, int]:
+        """Fold each card's entries since its latest snapshot into a new snapshot.
+
+        Only cards with at least `min_entries` entries older than `lag_seconds`
+        get a snapshot. Entries are kept, so statements can still list them.
+
+        Returns:
+            {"snapshots": cards compacted, "entries": entries folded}.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=lag_seconds)
+        try:
+            # 1. Per card: latest snapshot and the newest entry old enough to fold.
+            snapshot = _latest_snapshot()
+            base_entry_id = func.coalesce(snapshot.c.last_entry_id, 0)
+            bounds = (
+                select(
+                    Card.id.label("card_id"),
+                    func.coalesce(snapshot.c.balance, Card.balance).label("base"),
+                    base_entry_id.label("base_entry_id"),
+                    func.max(Entry.id).label("bound"),
+                )
+                .select_from(Card)
+                .outerjoin(snapshot, true())
+                .join(
+                    Entry,
+                    (Entry.card_id == Card.id)
+                    & (Entry.id > base_entry_id)
+                    & (Entry.created_at < cutoff),
+                )
+                .group_by(Card.id, snapshot.c.balance, Card.balance, base_entry_id)
+                .having(func.count() >= min_entries)
+            )
+            if card_ids is not None:
+                bounds = bounds.where(Card.id.in_([str(c) for c in card_ids]))
+            bounds = bounds.subquery()
+
+            # 2. Fold every entry up to the bound, including late-committed ones
+            # with a lower id than entries already past the cutoff.
+            source = (
+                select(
+                    bounds.c.card_id,
+                    bounds.c.bound,
+                    bounds.c.base + func.sum(Entry.amount),
+                    func.count(),
+                    func.max(Entry.created_at),
+                    func.now(),
+                )
+                .join(
+                    Entry,
+                    (Entry.card_id == bounds.c.card_id)
+                    & (Entry.id > bounds.c.base_entry_id)
+                    & (Entry.id <= bounds.c.bound),
+                )
+                .group_by(bounds.c.card_id, bounds.c.bound, bounds.c.base)
+            )
+            result = db.session.execute(
+                insert(Snapshot)
+                .from_select(
+                    [
+                        Snapshot.card_id,
+                        Snapshot.last_entry_id,
+                        Snapshot.balance,
+                        Snapshot.entry_count,
+                        Snapshot.as_of,
+                        Snapshot.created_at,
+                    ],
+                    source,
+                )
+                .on_conflict_do_nothing()
+                .returning(Snapshot.entry_count)
+            )
+            folded = [count for (count,) in result]
+            db.session.commit()
+
+            counts = {"snapshots": len(folded), "entries": sum(folded)}
+            logger.info(f"Compacted card ledger: {counts}")
+            return counts
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to compact card ledger: {str(e)}")
+            raise
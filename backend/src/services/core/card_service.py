@@ -1,8 +1,12 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
 from configurations.database_config import db
 from configurations.logging_config import get_logger
 from entities.card import Card
-from entities.user import User
 from enums import CardTypeEnum
+from services.core.card_ledger_service import CardLedgerService
+from services.core.user_cache import UserCache
 
 logger = get_logger(__name__)
 
@@ -11,17 +15,17 @@ class CardService:
     @staticmethod
     def create_card(username, data):
         try:
-            user = User.query.filter_by(username=username).first()
+            user = UserCache.get_by_username(username)
             if not user:
                 return {"error": "User not found"}, 404
 
             card_type_str = data.get("card_type", "Uzcard")
             # Validate card type
             try:
-                card_type = CardType(card_type_str)
+                card_type = CardTypeEnum(card_type_str)
             except ValueError:
                 return {
-                    "error": f"Invalid card type. Allowed: {[e.value for e in CardType]}"
+                    "error": f"Invalid card type. Allowed: {[e.value for e in CardTypeEnum]}"
                 }, 400
 
             new_card = Card(
@@ -51,12 +55,15 @@ class CardService:
     @staticmethod
     def get_user_cards(username):
         try:
-            user = User.query.filter_by(username=username).first()
+            user = UserCache.get_by_username(username)
             if not user:
                 return {"error": "User not found"}, 404
 
             cards = Card.query.filter_by(user_id=user.id).all()
-            return {"cards": [card.to_dict() for card in cards]}, 200
+            balances = CardLedgerService.get_balances([card.id for card in cards])
+            return {
+                "cards": [card.to_dict(balances[str(card.id)]) for card in cards]
+            }, 200
         except Exception as e:
             logger.error(f"Error getting cards: {str(e)}")
             return {"error": str(e)}, 500
@@ -67,27 +74,51 @@ class CardService:
             card = Card.query.get(card_id)
             if not card:
                 return {"error": "Card not found"}, 404
-            return {"card": card.to_dict()}, 200
+            return {"card": card.to_dict(CardLedgerService.get_balance(card.id))}, 200
         except Exception as e:
             logger.error(f"Error getting card: {str(e)}")
             return {"error": str(e)}, 500
 
     @staticmethod
-    def update_balance(card_id, amount, direction):
-        try:
-            card = Card.query.get(card_id)
-            if not card:
-                return False, "Card not found"
+    def apply_balance_change(
+        card_id, amount: float, direction: str, user_id=None, transaction_id=None
+    ) -> Tuple[bool, str]:
+        """Debit or credit a card by appending to its balance ledger.
 
-            if direction == "OUTGOING":
-                if card.balance < amount:
-                    return False, "Insufficient funds"
-                card.balance -= amount
-            elif direction == "INCOMING":
-                card.balance += amount
+        Ownership (when user_id is given) and funds are checked first. Runs
+        inside the caller's DB transaction; the caller commits or rolls back.
+        """
+        return CardLedgerService.append(
+            card_id, amount, direction, user_id=user_id, transaction_id=transaction_id
+        )
 
-            db.session.commit()
-            return True, "Balance updated"
+    @staticmethod
+    def get_balance_at(card_id, at: Optional[datetime] = None):
+        """Card balance now or at a past point in time (for statements)."""
+        try:
+            balance = CardLedgerService.get_balance(card_id, at)
+            if balance is None:
+                return {"error": "Card not found"}, 404
+            return {
+                "card_id": str(card_id),
+                "balance": balance,
+                "as_of": (at or datetime.utcnow()).isoformat(),
+            }, 200
+        except Exception as e:
+            logger.error(f"Error getting card balance: {str(e)}")
+            return {"error": str(e)}, 500
+
+    @staticmethod
+    def update_balance(card_id, amount, direction):
+        try:
+            success, message = CardService.apply_balance_change(
+                card_id, amount, direction
+            )
+            if success:
+                db.session.commit()
+            else:
+                db.session.rollback()
+            return success, message
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error updating balance: {str(e)}")
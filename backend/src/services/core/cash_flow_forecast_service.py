@@ -0,0 +1,262 @@
+"""
+Per-user monthly cash-flow forecasts for goal simulations.
+
+Income (INCOMING) and spending (OUTGOING) totals per month come from the monthly
+rollup, so fitting reads at most FIT_MONTHS rows per direction and category. Only
+complete months are fitted; the current month is the first forecast month. Fitted
+forecasts are cached per process until the month changes, the user's salary changes
+(it is the income fallback) or FORECAST_CACHE_TTL_SECONDS pass.
+"""
+
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Generator, Optional, Tuple
+
+import numpy as np
+
+from models.analytics_models import CashFlowForecast
+from services.core.spending_rollup_service import SpendingRollupService
+
+FORECAST_CACHE_TTL_SECONDS = float(os.getenv("FORECAST_CACHE_TTL_SECONDS", "21600"))
+
+# Complete months of history fitted (two seasonal cycles).
+FIT_MONTHS = 24
+# Months of history required for seasonal factors and for smoothing at all.
+SEASONAL_MIN_MONTHS = 24
+MIN_MONTHS = 3
+# Smoothing constants tried for every series; the one with the lowest one-step-ahead
+# squared error wins.
+ALPHAS = np.linspace(0.05, 0.95, 19)
+DEFAULT_ALPHA = 0.3
+# Month-to-month noise used when there is too little history to measure it, and the
+# floor applied to measured noise (share of the level).
+DEFAULT_INCOME_SIGMA = 0.05
+DEFAULT_SPENDING_SIGMA = 0.15
+MIN_RELATIVE_SIGMA = 0.02
+SEASONALITY_BOUNDS = (0.5, 2.0)
+
+# Months sampled per block by sample_contributions.
+BLOCK_MONTHS = 60
+
+_NO_SEASONALITY = (1.0,) * 12
+
+# user_id -> (expires_at, (start_month, salary), forecast).
+_forecast_cache: Dict[str, Tuple[float, tuple, CashFlowForecast]] = {}
+_forecast_cache_lock = threading.Lock()
+
+
+def _shift_months(month: date, offset: int) -> date:
+    index = month.year * 12 + month.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class CashFlowForecastService:
+    """Fits monthly income/spending forecasts and samples future contributions."""
+
+    @staticmethod
+    def _monthly_series(user_id, start_month: date) -> Tuple[np.ndarray, np.ndarray]:
+        """(income, spending) arrays for the complete months before start_month.
+
+        Months before the user's first recorded transaction are dropped.
+        """
+        first_month = _shift_months(start_month, -FIT_MONTHS)
+        totals = SpendingRollupService.get_monthly_cash_flow(
+            user_id, first_month, _shift_months(start_month, -1)
+        )
+        income = np.zeros(FIT_MONTHS)
+        spending = np.zeros(FIT_MONTHS)
+        for month, (incoming, outgoing) in totals.items():
+            index = (
+                (month.year - first_month.year) * 12 + month.month - first_month.month
+            )
+            income[index] = incoming
+            spending[index] = outgoing
+
+        active = np.flatnonzero((income > 0) | (spending > 0))
+        if active.size == 0:
+            return income[:0], spending[:0]
+        return income[active[0] :], spending[active[0] :]
+
+    @staticmethod
+    def _seasonality(series: np.ndarray, months: np.ndarray) -> np.ndarray:
+        """Multiplicative calendar-month factors (S x 12), mean 1 per series."""
+        sums = np.zeros((series.shape[0], 12))
+        counts = np.bincount(months, minlength=12)
+        for index in range(series.shape[0]):
+            sums[index] = np.bincount(months, weights=series[index], minlength=12)
+        means = sums / np.maximum(counts, 1)
+        overall = series.mean(axis=1, keepdims=True)
+        factors = np.where(overall > 0, means / np.where(overall > 0, overall, 1), 1.0)
+        factors = np.clip(factors, *SEASONALITY_BOUNDS)
+        return factors / factors.mean(axis=1, keepdims=True)
+
+    @staticmethod
+    def _fit_smoothing(
+        series: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Fit simple exponential smoothing to every row of `series` (S x T).
+
+        All ALPHAS are evaluated at once: levels and squared errors are (S x A)
+        arrays updated once per month.
+
+        Returns:
+            (alpha, final level, one-step-ahead error std) per series.
+        """
+        n_series, n_months = series.shape
+        levels = np.repeat(
+            series[:, : min(3, n_months)].mean(axis=1)[:, None], len(ALPHAS), 1
+        )
+        squared_errors = np.zeros((n_series, len(ALPHAS)))
+        for month in range(1, n_months):
+            errors = series[:, month, None] - levels
+            squared_errors += errors**2
+            levels += ALPHAS * errors
+
+        best = squared_errors.argmin(axis=1)
+        rows = np.arange(n_series)
+        sigma = np.sqrt(squared_errors[rows, best] / max(1, n_months - 1))
+        return ALPHAS[best], levels[rows, best], sigma
+
+    @staticmethod
+    def fit(user_id, salary: float, start_month: date) -> CashFlowForecast:
+        """Fit a user's forecast from the complete months before start_month."""
+        income, spending = CashFlowForecastService._monthly_series(user_id, start_month)
+        n_months = income.size
+        salary = salary or 0
+
+        if n_months < MIN_MONTHS:
+            # Too little history: average what exists and assume default noise.
+            has_income = bool(income.any())
+            spending_level = float(spending.mean()) if n_months else 0.0
+            income_level = float(income.mean()) if has_income else salary
+            return CashFlowForecast(
+                start_month=start_month,
+                months_observed=n_months,
+                method="ses" if has_income else "salary",
+                income_level=income_level,
+                income_alpha=DEFAULT_ALPHA,
+                income_sigma=income_level * DEFAULT_INCOME_SIGMA,
+                income_seasonality=_NO_SEASONALITY,
+                spending_level=spending_level,
+                spending_alpha=DEFAULT_ALPHA,
+                spending_sigma=spending_level * DEFAULT_SPENDING_SIGMA,
+                spending_seasonality=_NO_SEASONALITY,
+            )
+
+        # 1. Seasonal factors from full cycles, applied multiplicatively.
+        series = np.vstack([income, spending])
+        if n_months >= SEASONAL_MIN_MONTHS:
+            first_month = _shift_months(start_month, -n_months)
+            months = (first_month.month - 1 + np.arange(n_months)) % 12
+            seasonality = CashFlowForecastService._seasonality(series, months)
+            series = series / seasonality[:, months]
+            method = "seasonal_ses"
+        else:
+            seasonality = np.ones((2, 12))
+            method = "ses"
+
+        # 2. Smoothing constant, level and noise per series.
+        alpha, level, sigma = CashFlowForecastService._fit_smoothing(series)
+        sigma = np.maximum(sigma, MIN_RELATIVE_SIGMA * level)
+
+        # 3. No income recorded: fall back to the profile salary.
+        if not income.any():
+            method = "salary"
+            alpha[0], level[0] = DEFAULT_ALPHA, salary
+            sigma[0] = salary * DEFAULT_INCOME_SIGMA
+            seasonality[0] = 1.0
+
+        return CashFlowForecast(
+            start_month=start_month,
+            months_observed=n_months,
+            method=method,
+            income_level=float(level[0]),
+            income_alpha=float(alpha[0]),
+            income_sigma=float(sigma[0]),
+            income_seasonality=tuple(float(f) for f in seasonality[0]),
+            spending_level=float(level[1]),
+            spending_alpha=float(alpha[1]),
+            spending_sigma=float(sigma[1]),
+            spending_seasonality=tuple(float(f) for f in seasonality[1]),
+        )
+
+    @staticmethod
+    def get_forecast(
+        user_id, salary: float, now: Optional[datetime] = None
+    ) -> CashFlowForecast:
+        """Cached forecast for a user, refitted when its inputs may have changed."""
+        now = now or datetime.utcnow()
+        start_month = SpendingRollupService.month_start(now)
+        key = (start_month, salary)
+        clock = time.monotonic()
+
+        with _forecast_cache_lock:
+            cached = _forecast_cache.get(str(user_id))
+        if cached is not None and cached[0] > clock and cached[1] == key:
+            return cached[2]
+
+        forecast = CashFlowForecastService.fit(user_id, salary, start_month)
+        with _forecast_cache_lock:
+            _forecast_cache[str(user_id)] = (
+                clock + FORECAST_CACHE_TTL_SECONDS,
+                key,
+                forecast,
+            )
+        return forecast
+
+    @staticmethod
+    def invalidate(user_id):
+        """Drop a user's cached forecast in this process."""
+        with _forecast_cache_lock:
+            _forecast_cache.pop(str(user_id), None)
+
+    @staticmethod
+    def sample_contributions(
+        forecast: CashFlowForecast,
+        num_simulations: int,
+        rng: np.random.Generator,
+        block_months: int = BLOCK_MONTHS,
+    ) -> Generator[np.ndarray, Optional[np.ndarray], None]:
+        """Yield (simulations x block_months) blocks of monthly savings.
+
+        Income and spending paths follow the fitted smoothing model: each month's
+        value is the current level plus noise, and the level absorbs `alpha` of
+        that noise, so uncertainty widens with the horizon. A month's contribution
+        is income minus spending, floored at 0 (goals are never drawn down).
+        Blocks continue each path where the previous block ended; send a boolean
+        mask over the last block's rows instead of calling next() to continue only
+        those simulations.
+        """
+        levels = np.array([[forecast.income_level], [forecast.spending_level]])
+        levels = np.repeat(levels, num_simulations, axis=1)
+        alpha = np.array([forecast.income_alpha, forecast.spending_alpha])[
+            :, None, None
+        ]
+        sigma = np.array([forecast.income_sigma, forecast.spending_sigma])[
+            :, None, None
+        ]
+        seasonality = np.array(
+            [forecast.income_seasonality, forecast.spending_seasonality]
+        )
+
+        offset = 0
+        while True:
+            # 1. Noise for both series: (2, simulations, months).
+            noise = rng.standard_normal((2, levels.shape[1], block_months)) * sigma
+            cumulative = np.cumsum(noise, axis=2)
+
+            # 2. Level before each month plus that month's noise, re-seasonalized.
+            values = levels[:, :, None] + alpha * (cumulative - noise) + noise
+            calendar_months = (
+                forecast.start_month.month - 1 + offset + np.arange(block_months)
+            ) % 12
+            values = np.maximum(values, 0) * seasonality[:, None, calendar_months]
+
+            keep = yield np.maximum(values[0] - values[1], 0)
+
+            levels = levels + alpha[:, :, 0] * cumulative[:, :, -1]
+            if keep is not None:
+                levels = levels[:, keep]
+            offset += block_months
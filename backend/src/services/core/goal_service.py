@@ -1,22 +1,34 @@
-import json
-from pathlib import Path
+from datetime import datetime
 from typing import List
 
 import numpy as np
-from sqlalchemy import func
 
-from configurations.database_config import db
+from configurations.database_config import db, replica_reads
 from configurations.logging_config import get_logger
 from entities.goal import Goal
-from entities.transaction import Transaction
 from entities.user import User
+from enums import GoalStatusEnum
+from models.analytics_models import CategoryBreakdown, GoalSnapshot
 from models.base_response import BaseResponse
 from models.goal_create_model import GoalCreateModel
 from models.goal_update_model import GoalUpdateModel
 from services.ai_services.ai_service import AIService
+from services.core.cash_flow_forecast_service import CashFlowForecastService
+from services.core.goal_simulation_service import (
+    PRIORITY_WEIGHTS,
+    GoalSimulation,
+    GoalSimulationService,
+)
+from services.core.product_catalog import get_catalog
+from services.core.recurring_payment_service import RecurringPaymentService
+from services.core.spending_rollup_service import SpendingRollupService
+from services.core.user_cache import UserCache
 
 logger = get_logger(__name__)
 
+# Longest timeline chart, in months.
+TIMELINE_MAX_MONTHS = 60
+
 
 class GoalService:
     """Service for handling goal-related operations."""
@@ -61,11 +73,12 @@ class GoalService:
             )
 
     @staticmethod
+    @replica_reads
     def get_user_goals(username: str) -> BaseResponse:
         """Get all goals for a user with progress estimates."""
         try:
             # Look up user by username.
-            user = User.query.filter_by(username=username).first()
+            user = UserCache.get_by_username(username)
             if not user:
                 return BaseResponse(
                     is_success=False,
@@ -76,21 +89,9 @@ class GoalService:
             user_id = str(user.id)
             goals = Goal.query.filter_by(user_id=user_id).all()
 
-            # Calculate monthly savings for estimation.
-            total_spending = (
-                db.session.query(func.sum(Transaction.amount))
-                .filter(Transaction.user_id == user_id)
-                .scalar()
-                or 0
-            )
-
-            # Simple monthly savings estimation (assuming total spending is over all time, need better logic for real app).
-            # For MVP, let's assume monthly income - monthly spending average.
-            # But we only have mock data. Let's use the user's salary - average monthly spending.
-
-            income = user.salary or 0
-            # Estimate monthly spending (mock: total spending / 1 month).
-            monthly_spending = total_spending  # Simplified.
+            # Expected monthly savings from the user's cash-flow forecast.
+            forecast = CashFlowForecastService.get_forecast(user_id, user.salary)
+            (income,), (monthly_spending,) = forecast.expected(1)
             monthly_savings = max(0, income - monthly_spending)
 
             goals_data = []
@@ -171,13 +172,47 @@ class GoalService:
             )
 
     @staticmethod
-    def predict_goal_timeline(goal_id: str, username: str) -> BaseResponse:
+    def _timeline_series(
+        goal: Goal, simulation: GoalSimulation, real_contribution: float, months: int
+    ) -> dict:
+        """Column-oriented goal balance projections for months 0..months.
+
+        The P10/P50/P90 series are percentile bands of the simulated balance
+        paths. They are labelled by months-to-goal percentile, so the optimistic
+        P10 series is the 90th balance percentile.
+        """
+        month_index = np.arange(months + 1)
+        deterministic = np.minimum(
+            goal.current_amount + real_contribution * month_index,
+            max(goal.target_amount, goal.current_amount),
+        )
+        optimistic, median, pessimistic = simulation.balance_bands(months, [90, 50, 10])
+        return {
+            "month": month_index.tolist(),
+            "deterministic": np.round(deterministic, 2).tolist(),
+            "p10_optimistic": np.round(optimistic, 2).tolist(),
+            "p50_median": np.round(median, 2).tolist(),
+            "p90_pessimistic": np.round(pessimistic, 2).tolist(),
+        }
+
+    @staticmethod
+    def _timeline_rows(timeline: dict) -> List[dict]:
+        """Row-oriented view of a column-oriented timeline (one dict per month)."""
+        return [dict(zip(timeline, values)) for values in zip(*timeline.values())]
+
+    @staticmethod
+    @replica_reads
+    def predict_goal_timeline(
+        goal_id: str, username: str, timeline_view: str = "columns"
+    ) -> BaseResponse:
         """
         Predict goal timeline using Monte Carlo simulation (fast, no LLM calls).
 
         Args:
             goal_id: The goal ID to predict timeline for
             username: The username of the goal owner
+            timeline_view: "columns" (default) returns `timeline` as one list per
+                series; "rows" also returns the per-month `timeline_data` list.
 
         Returns:
             - Deterministic calculation
@@ -189,7 +224,7 @@ class GoalService:
         """
         try:
             # Get user.
-            user = User.query.filter_by(username=username).first()
+            user = UserCache.get_by_username(username)
             if not user:
                 return BaseResponse(
                     is_success=False,
@@ -214,40 +249,16 @@ class GoalService:
                     errors=["Goal does not belong to user."],
                 )
 
-            # Get financial data.
-            user_id = str(user.id)
-
-            # Calculate monthly spending (current month).
-            from datetime import datetime
-
-            now = datetime.now()
-            current_month_start = now.replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
-            )
-
-            monthly_spending = (
-                db.session.query(func.sum(Transaction.amount))
-                .filter(
-                    Transaction.user_id == user_id,
-                    Transaction.created_at >= current_month_start,
-                )
-                .scalar()
-                or 0
-            )
-
-            income = user.salary or 0
-
-            # Estimate installments and taxes (mock values, should come from user data).
-            installments = income * 0.05  # 5% for installments.
-            taxes = income * 0.12  # 12% for taxes.
-
-            # Volatility buffer: 10% of income for unexpected expenses.
-            volatility_buffer = income * 0.10
-
-            # Real monthly contribution.
-            real_contribution = max(
-                0, income - monthly_spending - installments - taxes - volatility_buffer
+            # Simulate the goal under the user's forecast income and spending.
+            forecast = CashFlowForecastService.get_forecast(user.id, user.salary)
+            simulation = GoalSimulationService.simulate(
+                forecast,
+                goal.current_amount,
+                goal.target_amount,
+                rng=GoalSimulationService.seeded_rng(goal.id),
+                path_months=TIMELINE_MAX_MONTHS,
             )
+            real_contribution = simulation.expected_contribution
 
             # Goal data.
             remaining_amount = max(0, goal.target_amount - goal.current_amount)
@@ -258,61 +269,10 @@ class GoalService:
             else:
                 deterministic_months = float("inf")
 
-            # Monte Carlo simulation.
-            num_simulations = 5000
-            months_to_goal = []
-
-            for _ in range(num_simulations):
-                # Simulate monthly contribution with variability.
-                # Income volatility: ±5%.
-                # Spending volatility: ±15%.
-                # Unexpected expenses: 0-20% of income (rare events).
-
-                simulated_months = 0
-                accumulated = goal.current_amount
-                max_months = 360  # 30 years cap.
-
-                while (
-                    accumulated < goal.target_amount and simulated_months < max_months
-                ):
-                    # Simulate income (±5% variation).
-                    sim_income = income * np.random.normal(1.0, 0.05)
-
-                    # Simulate spending (±15% variation).
-                    sim_spending = monthly_spending * np.random.normal(1.0, 0.15)
-
-                    # Simulate installments (fixed).
-                    sim_installments = installments
-
-                    # Simulate taxes (fixed).
-                    sim_taxes = taxes
-
-                    # Unexpected expenses (10% chance of 5-20% income hit).
-                    unexpected = 0
-                    if np.random.random() < 0.10:
-                        unexpected = sim_income * np.random.uniform(0.05, 0.20)
-
-                    # Calculate monthly contribution.
-                    monthly_contrib = max(
-                        0,
-                        sim_income
-                        - sim_spending
-                        - sim_installments
-                        - sim_taxes
-                        - unexpected,
-                    )
-
-                    accumulated += monthly_contrib
-                    simulated_months += 1
-
-                months_to_goal.append(
-                    simulated_months if simulated_months < max_months else max_months
-                )
-
             # Calculate percentiles.
-            p10 = np.percentile(months_to_goal, 10)
-            p50 = np.percentile(months_to_goal, 50)
-            p90 = np.percentile(months_to_goal, 90)
+            p10 = simulation.percentile(10)
+            p50 = simulation.percentile(50)
+            p90 = simulation.percentile(90)
 
             # Calculate success probability (if target date exists).
             success_probability = 100.0
@@ -323,40 +283,13 @@ class GoalService:
                 months_to_target = max(1, days_to_target / 30)
 
                 # Probability of reaching goal within target date.
-                success_count = sum(1 for m in months_to_goal if m <= months_to_target)
-                success_probability = (success_count / num_simulations) * 100
-
-            # Generate timeline data for visualization with Monte Carlo scenarios.
-            timeline_months = min(int(p90) + 6, 60)  # Show up to 60 months.
-
-            # Create three scenario projections: P10 (optimistic), P50 (median), P90 (pessimistic)
-            timeline_data = []
-
-            for month in range(timeline_months + 1):
-                # Deterministic baseline
-                deterministic_amount = goal.current_amount + (real_contribution * month)
-
-                # P10 scenario: optimistic (higher contribution due to lower spending/higher income)
-                p10_contribution = real_contribution * 1.15  # 15% better
-                p10_amount = goal.current_amount + (p10_contribution * month)
+                success_probability = simulation.success_probability(months_to_target)
 
-                # P50 scenario: median (realistic with slight variations)
-                p50_contribution = real_contribution * 1.0  # Base case
-                p50_amount = goal.current_amount + (p50_contribution * month)
-
-                # P90 scenario: pessimistic (lower contribution due to unexpected expenses)
-                p90_contribution = real_contribution * 0.85  # 15% worse
-                p90_amount = goal.current_amount + (p90_contribution * month)
-
-                timeline_data.append(
-                    {
-                        "month": month,
-                        "deterministic": round(deterministic_amount, 2),
-                        "p10_optimistic": round(p10_amount, 2),
-                        "p50_median": round(p50_amount, 2),
-                        "p90_pessimistic": round(p90_amount, 2),
-                    }
-                )
+            # Timeline percentile bands over the simulated balance paths.
+            timeline_months = min(int(p90) + 6, TIMELINE_MAX_MONTHS)
+            timeline = GoalService._timeline_series(
+                goal, simulation, real_contribution, timeline_months
+            )
 
             # Build response with Monte Carlo results (no LLM interpretation).
             prediction = {
@@ -368,8 +301,16 @@ class GoalService:
                 },
                 "success_probability": round(success_probability, 1),
                 "real_monthly_contribution": real_contribution,
-                "timeline_data": timeline_data,
+                "forecast": {
+                    "method": forecast.method,
+                    "months_observed": forecast.months_observed,
+                    "expected_income": round(simulation.expected_income, 2),
+                    "expected_spending": round(simulation.expected_spending, 2),
+                },
+                "timeline": timeline,
             }
+            if timeline_view == "rows":
+                prediction["timeline_data"] = GoalService._timeline_rows(timeline)
 
             return BaseResponse(
                 is_success=True,
@@ -386,6 +327,121 @@ class GoalService:
             )
 
     @staticmethod
+    @replica_reads
+    def predict_goal_timelines(username: str) -> BaseResponse:
+        """
+        Predict timelines for all of a user's active goals in one simulation.
+
+        The goals share one set of sampled monthly contributions, split between
+        unfinished goals by priority (see GoalSimulationService.simulate_goals),
+        so the result reflects goals competing for the same savings.
+
+        Args:
+            username: The username of the goal owner
+
+        Returns:
+            Per goal: monthly allocation, deterministic months, Monte Carlo
+            percentiles and success probability.
+        """
+        try:
+            # Get user.
+            user = UserCache.get_by_username(username)
+            if not user:
+                return BaseResponse(
+                    is_success=False,
+                    message="User not found.",
+                    errors=["User not found."],
+                )
+
+            # Get active goals.
+            goals = (
+                Goal.query.filter_by(user_id=user.id, status=GoalStatusEnum.ACTIVE)
+                .order_by(Goal.created_at)
+                .all()
+            )
+
+            # Simulate all goals against one forecast and one sample matrix.
+            forecast = CashFlowForecastService.get_forecast(user.id, user.salary)
+            simulations = GoalSimulationService.simulate_goals(
+                forecast,
+                [
+                    (
+                        goal.current_amount,
+                        goal.target_amount,
+                        PRIORITY_WEIGHTS.get(
+                            goal.priority.value if goal.priority else "Medium", 2.0
+                        ),
+                    )
+                    for goal in goals
+                ],
+                rng=GoalSimulationService.seeded_rng(user.id),
+            )
+
+            now = datetime.now()
+            goals_data = []
+            for goal, simulation in zip(goals, simulations):
+                remaining_amount = max(0, goal.target_amount - goal.current_amount)
+                allocation = simulation.expected_contribution
+
+                # Deterministic calculation.
+                if remaining_amount == 0:
+                    deterministic_months = 0.0
+                elif allocation > 0:
+                    deterministic_months = round(remaining_amount / allocation, 1)
+                else:
+                    deterministic_months = None  # Never reached at current savings.
+
+                # Success probability (if target date exists).
+                success_probability = 100.0
+                if goal.target_date:
+                    months_to_target = max(1, (goal.target_date - now).days / 30)
+                    success_probability = simulation.success_probability(
+                        months_to_target
+                    )
+
+                goals_data.append(
+                    {
+                        "goal_id": str(goal.id),
+                        "name": goal.name,
+                        "priority": goal.priority.value if goal.priority else None,
+                        "remaining_amount": remaining_amount,
+                        "monthly_allocation": round(allocation, 2),
+                        "deterministic_months": deterministic_months,
+                        "monte_carlo": {
+                            "p10": round(simulation.percentile(10), 1),
+                            "p50": round(simulation.percentile(50), 1),
+                            "p90": round(simulation.percentile(90), 1),
+                        },
+                        "success_probability": round(success_probability, 1),
+                    }
+                )
+
+            (income,), (spending,) = forecast.expected(1)
+            return BaseResponse(
+                is_success=True,
+                message="Goal timelines prediction completed.",
+                data={
+                    "real_monthly_contribution": max(0.0, income - spending),
+                    "forecast": {
+                        "method": forecast.method,
+                        "months_observed": forecast.months_observed,
+                        "expected_income": round(income, 2),
+                        "expected_spending": round(spending, 2),
+                    },
+                    "goals": goals_data,
+                },
+            )
+
+        except Exception as e:
+            logger.error(f"Error predicting goal timelines: {str(e)}")
+            return BaseResponse(
+                is_success=False,
+                message="Failed to predict goal timelines.",
+                errors=[str(e)],
+            )
+
+    @staticmethod
+    @replica_reads
     def get_timeline_interpretation(
         goal_id: str, username: str, language: str = "en"
     ) -> BaseResponse:
@@ -402,7 +458,7 @@ class GoalService:
         """
         try:
             # Get user.
-            user = User.query.filter_by(username=username).first()
+            user = UserCache.get_by_username(username)
             if not user:
                 return BaseResponse(
                     is_success=False,
@@ -427,37 +483,16 @@ class GoalService:
                     errors=["Goal does not belong to user."],
                 )
 
-            # Get financial data.
-            user_id = str(user.id)
-
-            # Calculate monthly spending (current month).
-            from datetime import datetime
-
-            now = datetime.now()
-            current_month_start = now.replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
-            )
-
-            monthly_spending = (
-                db.session.query(func.sum(Transaction.amount))
-                .filter(
-                    Transaction.user_id == user_id,
-                    Transaction.created_at >= current_month_start,
-                )
-                .scalar()
-                or 0
-            )
-
-            income = user.salary or 0
-
-            # Estimate installments and taxes.
-            installments = income * 0.05
-            taxes = income * 0.12
-            volatility_buffer = income * 0.10
-
-            real_contribution = max(
-                0, income - monthly_spending - installments - taxes - volatility_buffer
+            # Simulate the goal under the user's forecast income and spending.
+            forecast = CashFlowForecastService.get_forecast(user.id, user.salary)
+            simulation = GoalSimulationService.simulate(
+                forecast,
+                goal.current_amount,
+                goal.target_amount,
+                rng=GoalSimulationService.seeded_rng(goal.id),
+                path_months=TIMELINE_MAX_MONTHS,
             )
+            real_contribution = simulation.expected_contribution
 
             remaining_amount = max(0, goal.target_amount - goal.current_amount)
 
@@ -467,37 +502,9 @@ class GoalService:
             else:
                 deterministic_months = float("inf")
 
-            # Monte Carlo simulation (simplified for interpretation).
-            num_simulations = 5000
-            months_to_goal = []
-
-            for _ in range(num_simulations):
-                simulated_months = 0
-                accumulated = goal.current_amount
-                max_months = 360
-
-                while (
-                    accumulated < goal.target_amount and simulated_months < max_months
-                ):
-                    sim_income = income * np.random.normal(1.0, 0.05)
-                    sim_spending = monthly_spending * np.random.normal(1.0, 0.15)
-                    unexpected = 0
-                    if np.random.random() < 0.10:
-                        unexpected = sim_income * np.random.uniform(0.05, 0.20)
-
-                    monthly_contrib = max(
-                        0, sim_income - sim_spending - installments - taxes - unexpected
-                    )
-                    accumulated += monthly_contrib
-                    simulated_months += 1
-
-                months_to_goal.append(
-                    simulated_months if simulated_months < max_months else max_months
-                )
-
-            p10 = np.percentile(months_to_goal, 10)
-            p50 = np.percentile(months_to_goal, 50)
-            p90 = np.percentile(months_to_goal, 90)
+            p10 = simulation.percentile(10)
+            p50 = simulation.percentile(50)
+            p90 = simulation.percentile(90)
 
             success_probability = 100.0
             months_to_target = None
@@ -505,21 +512,13 @@ class GoalService:
             if goal.target_date:
                 days_to_target = (goal.target_date - datetime.now()).days
                 months_to_target = max(1, days_to_target / 30)
-                success_count = sum(1 for m in months_to_goal if m <= months_to_target)
-                success_probability = (success_count / num_simulations) * 100
-
-            # Generate timeline data for LLM context.
-            timeline_months = min(int(p90) + 6, 60)
-            timeline_data = []
+                success_probability = simulation.success_probability(months_to_target)
 
-            for month in range(timeline_months + 1):
-                deterministic_amount = goal.current_amount + (real_contribution * month)
-                timeline_data.append(
-                    {
-                        "month": month,
-                        "amount": round(deterministic_amount, 2),
-                    }
-                )
+            # Timeline percentile bands for LLM context.
+            timeline_months = min(int(p90) + 6, TIMELINE_MAX_MONTHS)
+            timeline = GoalService._timeline_series(
+                goal, simulation, real_contribution, timeline_months
+            )
 
             # Prepare data for AI interpretation.
             goal_data = {
@@ -535,16 +534,16 @@ class GoalService:
             }
 
             financial_data = {
-                "income": income,
-                "monthly_spending": monthly_spending,
-                "installments": installments,
-                "taxes": taxes,
-                "volatility_buffer": volatility_buffer,
-                "real_contribution": real_contribution,
+                "income": round(simulation.expected_income, 0),
+                "monthly_spending": round(simulation.expected_spending, 0),
+                "income_volatility": round(forecast.income_sigma, 0),
+                "spending_volatility": round(forecast.spending_sigma, 0),
+                "months_observed": forecast.months_observed,
+                "real_contribution": round(real_contribution, 0),
             }
 
             monte_carlo_results = {
-                "simulations": num_simulations,
+                "simulations": len(simulation.months_to_goal),
                 "deterministic_months": round(deterministic_months, 1),
                 "p10": round(p10, 1),
                 "p50": round(p50, 1),
@@ -554,7 +553,7 @@ class GoalService:
 
             # Get AI interpretation.
             prediction = AIService.predict_goal_timeline(
-                goal_data, financial_data, monte_carlo_results, timeline_data, language
+                goal_data, financial_data, monte_carlo_results, timeline, language
             )
 
             return BaseResponse(
@@ -575,7 +574,7 @@ class GoalService:
     def get_goal_by_id(goal_id: str, username: str) -> BaseResponse:
         """Retrieve a single goal by id for a specific user (ownership enforced)."""
         try:
-            user = User.query.filter_by(username=username).first()
+            user = UserCache.get_by_username(username)
             if not user:
                 return BaseResponse(
                     is_success=False,
@@ -614,6 +613,7 @@ class GoalService:
             )
 
     @staticmethod
+    @replica_reads
     def get_product_recommendations(
         goal_id: str, username: str, language: str = "en"
     ) -> BaseResponse:
@@ -626,7 +626,7 @@ class GoalService:
         """
         try:
             # Get user
-            user = User.query.filter_by(username=username).first()
+            user = UserCache.get_by_username(username)
             if not user:
                 return BaseResponse(
                     is_success=False,
@@ -651,82 +651,30 @@ class GoalService:
                     errors=["Goal does not belong to user."],
                 )
 
-            # Load Agrobank products
-            products_path = (
-                Path(__file__).parent.parent.parent
-                / "prompts"
-                / "agro_bank_services.json"
-            )
-            with open(products_path, "r", encoding="utf-8") as f:
-                products = json.load(f)
-
             # Get financial data
-            from datetime import datetime, timedelta
-
             user_id = str(user.id)
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-
-            # Calculate spending metrics
-            total_spending = (
-                db.session.query(func.sum(Transaction.amount))
-                .filter(
-                    Transaction.user_id == user_id,
-                    Transaction.created_at >= thirty_days_ago,
-                )
-                .scalar()
-                or 0
-            )
 
-            category_stats = (
-                db.session.query(Transaction.category, func.sum(Transaction.amount))
-                .filter(
-                    Transaction.user_id == user_id,
-                    Transaction.created_at >= thirty_days_ago,
-                )
-                .group_by(Transaction.category)
-                .all()
+            # Calculate spending metrics (from the monthly rollup).
+            category_stats = SpendingRollupService.get_trailing_spending(
+                user_id, days=30, direction=None
             )
+            total_spending = sum(category_stats.values())
 
-            categories = {
-                cat: amount for cat, amount in category_stats if cat != "Income"
-            }
+            categories = CategoryBreakdown.from_mapping(category_stats)
 
             # Prepare goal data
-            remaining_amount = max(0, goal.target_amount - goal.current_amount)
-            days_remaining = (
-                (goal.target_date - datetime.now()).days if goal.target_date else 0
-            )
-            progress_percent = (
-                (goal.current_amount / goal.target_amount * 100)
-                if goal.target_amount > 0
-                else 0
-            )
-            months_remaining = max(1, days_remaining / 30) if days_remaining > 0 else 1
-            required_monthly_savings = (
-                remaining_amount / months_remaining if months_remaining > 0 else 0
-            )
+            goal_snapshot = GoalSnapshot.from_goal(goal, datetime.now())
 
             income = user.salary or 0
             monthly_spending = total_spending
             current_monthly_savings = (
                 max(0, income - monthly_spending) if income > 0 else 0
             )
-            savings_gap = required_monthly_savings - current_monthly_savings
-
-            goal_data = {
-                "name": goal.name,
-                "target_amount": goal.target_amount,
-                "current_amount": goal.current_amount,
-                "remaining_amount": remaining_amount,
-                "progress_percent": round(progress_percent, 1),
-                "currency": goal.currency,
-                "months_remaining": round(months_remaining, 1),
-                "required_monthly_savings": round(required_monthly_savings, 0),
-            }
-
-            top_category = (
-                max(categories.items(), key=lambda x: x[1]) if categories else (None, 0)
+            savings_gap = (
+                goal_snapshot.required_monthly_savings - current_monthly_savings
             )
+
+            top_category, top_category_amount = categories.top()
             spending_rate = (monthly_spending / income * 100) if income > 0 else 0
 
             spending_data = {
@@ -735,14 +683,21 @@ class GoalService:
                 "current_monthly_savings": round(current_monthly_savings, 0),
                 "savings_gap": round(savings_gap, 0),
                 "spending_rate": round(spending_rate, 1),
-                "top_category": top_category[0],
-                "top_category_amount": round(top_category[1], 0),
+                "top_category": top_category,
+                "top_category_amount": round(top_category_amount, 0),
                 "categories": categories,
+                "recurring_monthly_total": round(
+                    RecurringPaymentService.get_monthly_total(user_id), 0
+                ),
             }
 
-            # Get recommendations from AI
+            # Shortlist catalog products for the goal, then ask the LLM.
+            candidates = get_catalog().candidates(goal_snapshot, savings_gap)
             recommendations = AIService.recommend_agrobank_products(
-                goal_data, spending_data, products, language
+                goal_snapshot,
+                spending_data,
+                [product.to_dict() for product in candidates],
+                language,
             )
 
             return BaseResponse(
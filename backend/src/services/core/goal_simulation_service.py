@@ -0,0 +1,192 @@
+import uuid
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.analytics_models import CashFlowForecast
+from services.core.cash_flow_forecast_service import CashFlowForecastService
+
+NUM_SIMULATIONS = 5000
+MAX_MONTHS = 360  # 30 years cap.
+
+# Share of each month's savings a goal receives, relative to the other unfinished
+# goals (keyed by GoalPriorityEnum value).
+PRIORITY_WEIGHTS = {"High": 3.0, "Medium": 2.0, "Low": 1.0}
+
+
+@dataclass(frozen=True)
+class GoalSimulation:
+    """Monte Carlo outcome for one goal."""
+
+    months_to_goal: np.ndarray  # Per simulation; MAX_MONTHS when never reached.
+    expected_contribution: float  # Expected savings in the first forecast month.
+    expected_income: float
+    expected_spending: float
+    # Goal balance per simulation at months 0..path_months (when requested).
+    balance_paths: Optional[np.ndarray] = None
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.months_to_goal, q))
+
+    def balance_bands(self, months: int, percentiles: Sequence[float]) -> np.ndarray:
+        """Balance percentiles per month: (len(percentiles), months + 1)."""
+        return np.percentile(self.balance_paths[:, : months + 1], percentiles, axis=0)
+
+    def success_probability(self, months_to_target: float) -> float:
+        """Percentage of simulations reaching the goal within months_to_target."""
+        return float((self.months_to_goal <= months_to_target).mean() * 100)
+
+
+class GoalSimulationService:
+    """Vectorized Monte Carlo goal simulator driven by cash-flow forecasts.
+
+    Monthly contributions for all simulations are drawn from the user's
+    CashFlowForecast a block of months at a time, and later blocks are only
+    sampled while some simulations are still short of the goal. `simulate` runs
+    one goal with cumulative sums per block; `simulate_goals` splits the same
+    sampled contributions across all of a user's goals by priority.
+    """
+
+    @staticmethod
+    def seeded_rng(*keys) -> np.random.Generator:
+        """Generator seeded from IDs, so unchanged inputs give unchanged results."""
+        return np.random.default_rng([uuid.UUID(str(key)).int for key in keys])
+
+    @staticmethod
+    def simulate(
+        forecast: CashFlowForecast,
+        current_amount: float,
+        target_amount: float,
+        num_simulations: int = NUM_SIMULATIONS,
+        rng: Optional[np.random.Generator] = None,
+        path_months: int = 0,
+    ) -> GoalSimulation:
+        """Simulate months to reach a goal under the user's forecast cash flow."""
+        (simulation,) = GoalSimulationService.simulate_goals(
+            forecast,
+            [(current_amount, target_amount, 1.0)],
+            num_simulations,
+            rng,
+            path_months,
+        )
+        (income,), (spending,) = forecast.expected(1)
+        return replace(simulation, expected_contribution=max(0.0, income - spending))
+
+    @staticmethod
+    def simulate_goals(
+        forecast: CashFlowForecast,
+        goals: Sequence[Tuple[float, float, float]],
+        num_simulations: int = NUM_SIMULATIONS,
+        rng: Optional[np.random.Generator] = None,
+        path_months: int = 0,
+    ) -> List[GoalSimulation]:
+        """Simulate several goals funded from one shared stream of savings.
+
+        Savings are split across unfinished goals in proportion to their weights,
+        and money a goal no longer needs goes straight to the others. Under that
+        rule each goal is funded once cumulative savings reach a fixed amount, so
+        instead of stepping month by month those amounts are solved once (one
+        phase per goal finishing) and then located in every simulation's sampled
+        cumulative savings path.
+
+        Args:
+            goals: (current_amount, target_amount, weight) per goal.
+            path_months: Also return each goal's simulated balance for months
+                0..path_months (at most BLOCK_MONTHS), e.g. for timeline charts.
+
+        Returns:
+            One GoalSimulation per goal, in input order. expected_contribution is
+            the goal's mean allocation in the first month.
+        """
+        rng = rng or np.random.default_rng()
+        n_goals = len(goals)
+        remaining = np.array(
+            [max(0.0, target - current) for current, target, _ in goals], dtype=float
+        )
+        weights = np.array([weight for _, _, weight in goals], dtype=float)
+
+        blocks = CashFlowForecastService.sample_contributions(
+            forecast, num_simulations, rng
+        )
+        block = next(blocks)
+
+        # 1. Phases: all open goals grow by weight until the first of them is
+        # funded. Phase boundaries are amounts of cumulative savings, the same for
+        # every simulation; only the month they are reached in differs.
+        needed = remaining.copy()
+        is_open = needed > 0
+        finish_at = np.zeros(n_goals)
+        first_allocation = np.zeros(n_goals)
+        phases = []  # (start, end, share per goal).
+        phase_start = 0.0
+        while is_open.any():
+            share = np.where(is_open, weights, 0.0)
+            share /= share.sum()
+            span = np.divide(needed, share, out=np.full(n_goals, np.inf), where=is_open)
+            funded = span.argmin()
+            phase_end = phase_start + span[funded]
+
+            first_month_in_phase = np.clip(
+                np.minimum(block[:, 0], phase_end) - phase_start, 0, None
+            )
+            first_allocation += share * first_month_in_phase.mean()
+            needed -= share * span[funded]
+            finish_at[funded] = phase_end
+            is_open[funded] = False
+            phases.append((phase_start, phase_end, share))
+            phase_start = phase_end
+
+        # 2. Balance paths: each goal's allocation is piecewise linear in the
+        # cumulative savings of the first block.
+        balance_paths = [None] * n_goals
+        if path_months > 0:
+            savings = np.cumsum(block[:, :path_months], axis=1)
+            savings = np.hstack([np.zeros((num_simulations, 1)), savings])
+            currents = np.array([current for current, _, _ in goals], dtype=float)
+            paths = np.broadcast_to(
+                currents[:, None, None], (n_goals,) + savings.shape
+            ).copy()
+            for start, end, share in phases:
+                in_phase = np.clip(np.minimum(savings, end) - start, 0, None)
+                paths += share[:, None, None] * in_phase[None, :, :]
+            balance_paths = list(paths)
+
+        # 3. Walk the savings paths block by block and record the month each
+        # goal's finish amount is reached. Simulations that have funded every
+        # goal are dropped from later blocks.
+        months_to_goal = np.where(remaining > 0, float(MAX_MONTHS), 0.0)
+        months_to_goal = np.repeat(months_to_goal[None, :], num_simulations, axis=0)
+        total_remaining = remaining.sum()
+        pending = np.arange(num_simulations)
+        accumulated = np.zeros(num_simulations)
+        offset = 0
+        while total_remaining > 0:
+            block = block[:, : MAX_MONTHS - offset]
+            cumulative = accumulated[:, None] + np.cumsum(block, axis=1)
+            for index in np.flatnonzero(remaining > 0):
+                hit = cumulative >= finish_at[index] - 1e-6
+                found = hit.any(axis=1) & (months_to_goal[pending, index] == MAX_MONTHS)
+                months_to_goal[pending[found], index] = (
+                    offset + hit[found].argmax(axis=1) + 1
+                )
+
+            offset += block.shape[1]
+            done = cumulative[:, -1] >= total_remaining - 1e-6
+            if done.all() or offset >= MAX_MONTHS:
+                break
+            pending = pending[~done]
+            accumulated = cumulative[~done, -1]
+            block = blocks.send(~done)
+
+        (income,), (spending,) = forecast.expected(1)
+        return [
+            GoalSimulation(
+                months_to_goal=months_to_goal[:, index],
+                expected_contribution=float(first_allocation[index]),
+                expected_income=income,
+                expected_spending=spending,
+                balance_paths=balance_paths[index],
+            )
+            for index in range(n_goals)
+        ]
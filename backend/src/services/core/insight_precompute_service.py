@@ -0,0 +1,175 @@
+import hashlib
+import json
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from configurations.database_config import db
+from configurations.logging_config import get_logger
+from entities.goal import Goal
+from entities.monthly_category_spend import UserMonthlyCategorySpend
+from entities.precomputed_insight import PrecomputedInsight
+from entities.user import User
+from enums import GoalStatusEnum
+
+logger = get_logger(__name__)
+
+# Bump when prompts or payload shapes change so stored insights are regenerated.
+INSIGHTS_SCHEMA_VERSION = 1
+
+DASHBOARD_KIND = "dashboard"
+GOAL_KIND = "goal"
+
+
+class InsightPrecomputeService:
+    """Stores LLM insights keyed by a version stamp of the data they were built from.
+
+    The stamp digests the user's spending rollup state (latest update, row count,
+    total), the profile's updated_at, the subject (e.g. goal fields), the language and
+    the current date (rolling windows such as "last 7 days" shift daily). A stored
+    payload is served only while all of these are unchanged. `precompute_recent`
+    fills the store ahead of time for recently active users
+    (see `flask precompute-insights`).
+    """
+
+    @staticmethod
+    def compute_version(user, *subject) -> str:
+        """Version stamp for a user's insights about `subject`.
+
+        Args:
+            user: The User entity.
+            subject: Extra JSON-serializable inputs (kind, goal fields, language).
+        """
+        latest_update, row_count, total_amount = (
+            db.session.query(
+                func.max(UserMonthlyCategorySpend.updated_at),
+                func.count(),
+                func.sum(UserMonthlyCategorySpend.total_amount),
+            )
+            .filter(UserMonthlyCategorySpend.user_id == user.id)
+            .one()
+        )
+        encoded = json.dumps(
+            [
+                INSIGHTS_SCHEMA_VERSION,
+                latest_update,
+                row_count,
+                total_amount,
+                user.updated_at,
+                date.today(),
+                *subject,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_stored(
+        user_id, kind: str, subject_key: str, language: str, version: str
+    ) -> Optional[object]:
+        """Return the stored payload if its version matches, else None."""
+        stored = (
+            db.session.query(PrecomputedInsight.version, PrecomputedInsight.payload)
+            .filter(
+                PrecomputedInsight.user_id == str(user_id),
+                PrecomputedInsight.kind == kind,
+                PrecomputedInsight.subject_key == subject_key,
+                PrecomputedInsight.language == language,
+            )
+            .first()
+        )
+        if stored and stored.version == version:
+            return stored.payload
+        return None
+
+    @staticmethod
+    def store(
+        user_id, kind: str, subject_key: str, language: str, version: str, payload
+    ):
+        """Insert or replace the stored payload for this subject and language."""
+        try:
+            stmt = insert(PrecomputedInsight).values(
+                user_id=user_id,
+                kind=kind,
+                subject_key=subject_key,
+                language=language,
+                version=version,
+                payload=payload,
+                computed_at=datetime.utcnow(),
+            )
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_precomputed_insights_subject",
+                set_={
+                    "version": stmt.excluded.version,
+                    "payload": stmt.excluded.payload,
+                    "computed_at": stmt.excluded.computed_at,
+                },
+            )
+            db.session.execute(stmt)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to store precomputed {kind} insights: {str(e)}")
+
+    @staticmethod
+    def get_recently_active_users(since: datetime, limit: Optional[int] = None):
+        """Users whose spending rollup changed since `since` (i.e. new transactions)."""
+        active_ids = (
+            db.session.query(UserMonthlyCategorySpend.user_id)
+            .filter(UserMonthlyCategorySpend.updated_at >= since)
+            .distinct()
+        )
+        query = User.query.filter(User.id.in_(active_ids), User.is_active.is_(True))
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    @staticmethod
+    def precompute_recent(
+        since_hours: int = 168,
+        languages: Iterable[str] = ("en",),
+        limit: Optional[int] = None,
+    ) -> dict:
+        """Generate dashboard and goal insights for recently active users.
+
+        Results whose inputs have not changed are skipped (served from the store),
+        so reruns only pay for users with new data.
+
+        Returns:
+            Counts of users, dashboard and goal insight payloads processed.
+        """
+        # Imported here: DashboardService imports this module.
+        from services.core.dashboard_service import DashboardService
+
+        since = datetime.utcnow() - timedelta(hours=since_hours)
+        users = InsightPrecomputeService.get_recently_active_users(since, limit)
+        logger.info(
+            f"Precomputing insights for {len(users)} users "
+            f"active since {since:%Y-%m-%d %H:%M}."
+        )
+
+        counts = {"users": len(users), "dashboard": 0, "goal": 0, "failed": 0}
+        for user in users:
+            goal_ids = [
+                str(goal_id)
+                for (goal_id,) in db.session.query(Goal.id).filter(
+                    Goal.user_id == user.id, Goal.status == GoalStatusEnum.ACTIVE
+                )
+            ]
+            for language in languages:
+                response = DashboardService.get_dashboard_insights(
+                    user.username, language
+                )
+                counts["dashboard" if response.is_success else "failed"] += 1
+
+                for goal_id in goal_ids:
+                    response = DashboardService.get_goal_insights(
+                        goal_id, language, username=user.username
+                    )
+                    counts["goal" if response.is_success else "failed"] += 1
+
+        logger.info(f"Insight precomputation finished: {counts}")
+        return counts
@@ -0,0 +1,336 @@
+"""
+Agrobank product catalog, loaded once per process, and pre-LLM candidate retrieval.
+
+`prompts/agro_bank_services.json` is read on first use and kept as `CatalogProduct`s,
+indexed by category and currency, with the minimum amount, amount limit and
+term (in months) parsed out of the free-text details. Editing the file takes effect
+after a restart.
+
+`ProductCatalog.candidates` picks the products worth showing the LLM for a goal,
+so the prompt lists a handful of products instead of the whole catalog:
+1. The category index drops loans when saving alone reaches the goal, and the
+   currency index drops products not offered in the goal's currency. Products
+   whose minimum amount is above the goal's target are dropped too (minimum
+   amount and term are parsed fields, checked per product).
+2. The rest are scored by TF-IDF cosine similarity between the goal's name and
+   description and the product's text (name, category, type, description,
+   details), plus a fit score from the goal's horizon and savings gap: deposits
+   whose term fits in the months remaining, and loans that cover the remaining
+   amount. Products of a type the goal names (a tuition goal and the education
+   loan) are found through the type index and score higher.
+3. The top PRODUCT_RECOMMENDATION_CANDIDATES (default 6) are returned, ties in
+   catalog order.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from configurations.logging_config import get_logger
+from models.analytics_models import GoalSnapshot
+
+logger = get_logger(__name__)
+
+PRODUCT_RECOMMENDATION_CANDIDATES = int(
+    os.getenv("PRODUCT_RECOMMENDATION_CANDIDATES", "6")
+)
+
+CATALOG_PATH = (
+    Path(__file__).parent.parent.parent / "prompts" / "agro_bank_services.json"
+)
+
+SAVINGS_CATEGORY = "Deposits"
+CREDIT_CATEGORY = "Loans"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset("a an and as for in of on or the to up with".split())
+_CURRENCY = re.compile(r"\b(UZS|USD|EUR)\b")
+_AMOUNT = re.compile(r"(\d[\d\s,]*)\s*(?:UZS|USD|EUR)")
+_PERIOD = re.compile(r"(\d+)(?:\s*[–-]\s*(\d+))?\s*(month|year)", re.IGNORECASE)
+
+
+# Goal words mapped to the catalog's own terms, so "car" finds the loan whose
+# purpose lists vehicles. Includes common Uzbek and Russian goal names.
+_GOAL_KEYWORDS = {
+    "car": "vehicles auto",
+    "mashina": "vehicles auto",
+    "машина": "vehicles auto",
+    "автомобиль": "vehicles auto",
+    "university": "education tuition",
+    "tuition": "education university",
+    "study": "education tuition",
+    "school": "education",
+    "контракт": "education tuition",
+    "учеба": "education tuition",
+    "home": "renovation household",
+    "house": "renovation household",
+    "apartment": "renovation household",
+    "uy": "renovation household",
+    "ремонт": "renovation",
+    "furniture": "household goods",
+    "phone": "household goods",
+    "laptop": "household goods",
+    "farm": "farmers agro",
+    "biznes": "business entrepreneurs",
+    "бизнес": "business entrepreneurs",
+    "startup": "business entrepreneurs",
+    "emergency": "savings deposit",
+    "wedding": "savings deposit",
+}
+
+# Goal words that name a product type outright.
+_GOAL_TYPES = {
+    "car": "Consumer Loan",
+    "mashina": "Consumer Loan",
+    "машина": "Consumer Loan",
+    "автомобиль": "Consumer Loan",
+    "furniture": "Consumer Loan",
+    "ремонт": "Consumer Loan",
+    "university": "Education Loan",
+    "tuition": "Education Loan",
+    "study": "Education Loan",
+    "контракт": "Education Loan",
+    "учеба": "Education Loan",
+    "farm": "Government-backed Program",
+    "biznes": "Corporate Loan",
+    "бизнес": "Corporate Loan",
+    "startup": "Corporate Loan",
+}
+
+
+def _stem(token: str) -> str:
+    """Crude English suffix stripping (farmers/farming -> farm, loans -> loan)."""
+    for suffix in ("ers", "ing", "es", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[: -len(suffix)]
+    return token
+
+
+def _tokens(text: str) -> List[str]:
+    return [_stem(t) for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _query_tokens(text: str) -> List[str]:
+    words = _TOKEN.findall(text.lower())
+    expanded = " ".join(_GOAL_KEYWORDS.get(w, "") for w in words)
+    return _tokens(f"{text} {expanded}")
+
+
+def _flatten(value) -> List[str]:
+    if isinstance(value, dict):
+        return [s for v in value.values() for s in _flatten(v)]
+    if isinstance(value, list):
+        return [s for v in value for s in _flatten(v)]
+    return [str(value)]
+
+
+def _parse_amount(text: str) -> Optional[float]:
+    match = _AMOUNT.search(text)
+    if match is None:
+        return None
+    return float(re.sub(r"[\s,]", "", match.group(1)))
+
+
+def _parse_term(values: List[str]) -> Optional[Tuple[int, int]]:
+    """(shortest, longest) term in months; "up to N" starts at 0."""
+    bounds = []
+    for text in values:
+        for match in _PERIOD.finditer(text):
+            scale = 12 if match.group(3).lower() == "year" else 1
+            low = int(match.group(1)) * scale
+            high = int(match.group(2)) * scale if match.group(2) else low
+            if text.lower().lstrip().startswith("up to"):
+                low = 0
+            bounds += [low, high]
+    return (min(bounds), max(bounds)) if bounds else None
+
+
+@dataclass(frozen=True)
+class CatalogProduct:
+    """One catalog entry with the structured fields retrieval filters on."""
+
+    id: str
+    name: str
+    category: str
+    type: str
+    description: str
+    link: str
+    currencies: frozenset  # Empty when the details do not say.
+    min_amount: Optional[float]
+    amount_limit: Optional[float]
+    term_months: Optional[Tuple[int, int]]
+    text: str  # Everything TF-IDF indexes.
+
+    @classmethod
+    def from_dict(cls, entry: dict) -> "CatalogProduct":
+        details = entry.get("details", {})
+        detail_text = _flatten(details)
+        minimums = [v for k, v in details.items() if k.startswith("minimum_")]
+        limits = [details[k] for k in ("amount_limit", "limit") if k in details]
+        terms = [
+            s
+            for k in ("term", "terms", "validity")
+            if k in details
+            for s in _flatten(details[k])
+        ]
+        return cls(
+            id=entry["id"],
+            name=entry["name"],
+            category=entry["category"],
+            type=entry["type"],
+            description=entry["description"],
+            link=entry["link"],
+            currencies=frozenset(_CURRENCY.findall(" ".join(detail_text))),
+            min_amount=min(
+                (a for a in map(_parse_amount, minimums) if a is not None),
+                default=None,
+            ),
+            amount_limit=next(
+                (a for a in map(_parse_amount, limits) if a is not None), None
+            ),
+            term_months=_parse_term(terms),
+            text=" ".join(
+                [entry["name"], entry["category"], entry["type"], entry["description"]]
+                + detail_text
+            ),
+        )
+
+    def to_dict(self) -> dict:
+        """Fields the recommendation prompt and response use."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "category": self.category,
+            "type": self.type,
+            "description": self.description,
+            "link": self.link,
+        }
+
+
+class ProductCatalog:
+    """In-memory catalog with category/currency indexes and a TF-IDF matrix."""
+
+    def __init__(self, entries: List[dict]):
+        self.products = [CatalogProduct.from_dict(e) for e in entries]
+        # Indexes hold positions in `products` (and rows of `matrix`).
+        self.by_category: Dict[str, List[int]] = {}
+        self.by_type: Dict[str, List[int]] = {}
+        self.by_currency: Dict[str, List[int]] = {}
+        self.any_currency: List[int] = []  # Details do not name a currency.
+        for index, product in enumerate(self.products):
+            self.by_category.setdefault(product.category, []).append(index)
+            self.by_type.setdefault(product.type, []).append(index)
+            for currency in product.currencies:
+                self.by_currency.setdefault(currency, []).append(index)
+            if not product.currencies:
+                self.any_currency.append(index)
+
+        # TF-IDF with smoothed idf; rows are L2-normalized, so a dot product
+        # with a normalized query vector is the cosine similarity.
+        documents = [Counter(_tokens(p.text)) for p in self.products]
+        self.vocabulary = {
+            term: index
+            for index, term in enumerate(sorted({t for d in documents for t in d}))
+        }
+        document_frequency = Counter(t for d in documents for t in d)
+        n = len(documents)
+        self.idf = np.array(
+            [
+                math.log((1 + n) / (1 + document_frequency[term])) + 1
+                for term in self.vocabulary
+            ]
+        )
+        self.matrix = np.vstack([self._vector(d) for d in documents])
+
+    def _vector(self, counts: Counter) -> np.ndarray:
+        vector = np.zeros(len(self.vocabulary))
+        for term, count in counts.items():
+            index = self.vocabulary.get(term)
+            if index is not None:
+                vector[index] = (1 + math.log(count)) * self.idf[index]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _fit(product: CatalogProduct, goal: GoalSnapshot, savings_gap: float) -> float:
+        """Match of the product kind to the goal's horizon and savings gap (0-0.3).
+
+        Kept below a strong text match, so the goal's wording decides between
+        products of the same kind.
+        """
+        if product.category == SAVINGS_CATEGORY:
+            term = product.term_months
+            fits = term is None or term[0] <= goal.months_remaining
+            return 0.2 + (0.1 if fits else 0.0)
+        if product.category == CREDIT_CATEGORY and savings_gap > 0:
+            limit = product.amount_limit
+            covers = limit is None or limit >= goal.remaining_amount
+            return 0.2 + (0.1 if covers else 0.0)
+        return 0.0
+
+    def candidates(
+        self,
+        goal: GoalSnapshot,
+        savings_gap: float,
+        k: int = PRODUCT_RECOMMENDATION_CANDIDATES,
+    ) -> List[CatalogProduct]:
+        """Up to k products relevant to the goal, best first.
+
+        Products with no text match and no fit (score 0) are left out.
+        """
+        offered = set(self.by_currency.get(goal.currency, []) + self.any_currency)
+        if savings_gap <= 0:
+            offered -= set(self.by_category.get(CREDIT_CATEGORY, []))
+        eligible = [
+            i
+            for i in sorted(offered)
+            if self.products[i].min_amount is None
+            or self.products[i].min_amount <= goal.target_amount
+        ]
+        if not eligible:
+            return []
+
+        text = f"{goal.name} {goal.description or ''}"
+        named = {
+            i
+            for word in _TOKEN.findall(text.lower())
+            if word in _GOAL_TYPES
+            for i in self.by_type.get(_GOAL_TYPES[word], [])
+        }
+        similarity = self.matrix[eligible] @ self._vector(Counter(_query_tokens(text)))
+        scores = [
+            similarity[j]
+            + self._fit(self.products[i], goal, savings_gap)
+            + (0.2 if i in named else 0.0)
+            for j, i in enumerate(eligible)
+        ]
+        # Stable sort: equal scores keep catalog order.
+        ranked = sorted(range(len(eligible)), key=lambda j: -scores[j])
+        return [self.products[eligible[j]] for j in ranked[:k] if scores[j] > 0]
+
+
+_catalog: Optional[ProductCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> ProductCatalog:
+    """The process-wide catalog, loaded from CATALOG_PATH on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+                    _catalog = ProductCatalog(json.load(f))
+                logger.info(
+                    f"Loaded {len(_catalog.products)} Agrobank products "
+                    f"({len(_catalog.vocabulary)} terms)"
+                )
+    return _catalog
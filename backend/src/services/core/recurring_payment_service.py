@@ -0,0 +1,261 @@
+import itertools
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select, update
+
+from configurations.database_config import db, note_written_users
+from configurations.logging_config import get_logger
+from entities.transaction import Transaction
+from entities.user import User
+from entities.user_subscription import UserSubscription
+from enums import TransactionDirectionEnum, TransactionStatusEnum
+
+logger = get_logger(__name__)
+
+# History scanned for recurring series.
+LOOKBACK_DAYS = 400
+# Amounts within this share above the smallest amount of a band belong to it
+# (bills such as utilities vary from month to month).
+AMOUNT_TOLERANCE = 0.25
+# Share of a series' intervals that must match the cadence.
+REGULAR_SHARE = 0.8
+
+# (cadence, expected interval in days, allowed deviation in days, minimum
+# occurrences, payments per month).
+CADENCES = (
+    ("weekly", 7.0, 1.5, 4, 52 / 12),
+    ("monthly", 30.4, 4.0, 3, 1.0),
+)
+
+# Payments that did not go through are not part of a series.
+EXCLUDED_STATUSES = (
+    TransactionStatusEnum.DECLINED,
+    TransactionStatusEnum.CANCELED,
+    TransactionStatusEnum.VOIDED,
+    TransactionStatusEnum.REFUNDED,
+)
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class RecurringPaymentService:
+    """Detects recurring payments and maintains the user_subscriptions index.
+
+    A user's OUTGOING transactions are sorted by (merchant, amount) and scanned
+    once to split them into amount bands per merchant. Each band is ordered by
+    date; if enough of its intervals match a weekly or monthly cadence it is a
+    recurring series. Transactions in a series get is_recurring set in bulk, and
+    each series becomes one user_subscriptions row, so dashboards and
+    recommendations read recurring spend without touching raw history.
+    """
+
+    @staticmethod
+    def _amount_bands(rows: list) -> Iterable[list]:
+        """Split rows sorted by (merchant, amount) into per-merchant amount bands."""
+        band = []
+        for row in rows:
+            if band and (
+                row.merchant != band[0].merchant
+                or row.amount > band[0].amount * (1 + AMOUNT_TOLERANCE)
+            ):
+                yield band
+                band = []
+            band.append(row)
+        if band:
+            yield band
+
+    @staticmethod
+    def find_series(rows: list, now: datetime) -> List[dict]:
+        """Recurring series in one user's rows (sorted by merchant, then amount).
+
+        Returns:
+            One dict per series with the subscription fields and transaction_ids.
+        """
+        series = []
+        for band in RecurringPaymentService._amount_bands(rows):
+            if len(band) < min(cadence[3] for cadence in CADENCES):
+                continue
+
+            band.sort(key=lambda row: row.date)
+            timestamps = np.array([row.date.timestamp() for row in band])
+            intervals = np.diff(timestamps) / 86400.0
+
+            for cadence, expected, deviation, min_count, per_month in CADENCES:
+                if len(band) < min_count:
+                    continue
+                regular = np.abs(intervals - expected) <= deviation
+                if regular.mean() < REGULAR_SHARE:
+                    continue
+
+                interval_days = float(np.median(intervals[regular]))
+                typical_amount = float(np.median([row.amount for row in band]))
+                last_seen = band[-1].date
+                series.append(
+                    {
+                        "merchant": band[0].merchant,
+                        "category": band[-1].category,
+                        "cadence": cadence,
+                        "interval_days": round(interval_days, 1),
+                        "typical_amount": typical_amount,
+                        "monthly_amount": round(typical_amount * per_month, 2),
+                        "occurrences": len(band),
+                        "first_seen": band[0].date,
+                        "last_seen": last_seen,
+                        "next_expected": last_seen + timedelta(days=interval_days),
+                        # Lapsed once a payment is overdue by more than half a period.
+                        "is_active": (now - last_seen).days
+                        <= interval_days * 1.5 + deviation,
+                        "transaction_ids": [row.id for row in band],
+                    }
+                )
+                break
+        return series
+
+    @staticmethod
+    def detect_for_users(user_ids: list, now: Optional[datetime] = None) -> dict:
+        """Rebuild is_recurring flags and subscription rows for these users."""
+        now = now or datetime.utcnow()
+        user_ids = [str(user_id) for user_id in user_ids]
+
+        rows = db.session.execute(
+            select(
+                Transaction.id,
+                Transaction.user_id,
+                Transaction.merchant,
+                Transaction.amount,
+                Transaction.date,
+                Transaction.category,
+            )
+            .where(
+                Transaction.user_id.in_(user_ids),
+                Transaction.transaction_direction == TransactionDirectionEnum.OUTGOING,
+                Transaction.status.notin_(EXCLUDED_STATUSES),
+                Transaction.date >= now - timedelta(days=LOOKBACK_DAYS),
+            )
+            .order_by(Transaction.user_id, Transaction.merchant, Transaction.amount)
+        ).all()
+
+        subscriptions, recurring_ids = [], []
+        for user_id, user_rows in itertools.groupby(rows, key=lambda row: row.user_id):
+            for found in RecurringPaymentService.find_series(list(user_rows), now):
+                recurring_ids.extend(found.pop("transaction_ids"))
+                subscriptions.append({**found, "user_id": user_id, "updated_at": now})
+
+        try:
+            # 1. Reset and set is_recurring in two bulk statements.
+            db.session.execute(
+                update(Transaction)
+                .where(
+                    Transaction.user_id.in_(user_ids),
+                    Transaction.is_recurring.is_(True),
+                )
+                .values(is_recurring=False)
+            )
+            if recurring_ids:
+                db.session.execute(
+                    update(Transaction)
+                    .where(Transaction.id.in_(recurring_ids))
+                    .values(is_recurring=True)
+                )
+
+            # 2. Replace the users' subscription index rows.
+            db.session.query(UserSubscription).filter(
+                UserSubscription.user_id.in_(user_ids)
+            ).delete(synchronize_session=False)
+            if subscriptions:
+                db.session.bulk_insert_mappings(UserSubscription, subscriptions)
+
+            note_written_users(user_ids)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to store recurring payments: {str(e)}")
+            raise
+
+        return {
+            "users": len(user_ids),
+            "subscriptions": len(subscriptions),
+            "recurring_transactions": len(recurring_ids),
+        }
+
+    @staticmethod
+    def rebuild(
+        user_ids: Optional[list] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> dict:
+        """Run detection for the given users (all active users when omitted)."""
+        if user_ids is None:
+            user_ids = [
+                user_id
+                for (user_id,) in db.session.query(User.id).filter(
+                    User.is_active.is_(True)
+                )
+            ]
+
+        totals = {"users": 0, "subscriptions": 0, "recurring_transactions": 0}
+        for offset in range(0, len(user_ids), chunk_size):
+            counts = RecurringPaymentService.detect_for_users(
+                user_ids[offset : offset + chunk_size]
+            )
+            for key in totals:
+                totals[key] += counts[key]
+
+        logger.info(f"Recurring payment detection finished: {totals}")
+        return totals
+
+    @staticmethod
+    def match_transaction(transaction: Transaction):
+        """Flag a new OUTGOING transaction that continues a known series.
+
+        Runs inside the caller's DB transaction; the caller commits.
+        """
+        subscription = (
+            UserSubscription.query.filter(
+                UserSubscription.user_id == str(transaction.user_id),
+                UserSubscription.merchant == transaction.merchant,
+                UserSubscription.typical_amount
+                >= transaction.amount / (1 + AMOUNT_TOLERANCE),
+                UserSubscription.typical_amount
+                <= transaction.amount * (1 + AMOUNT_TOLERANCE),
+            )
+            .order_by(func.abs(UserSubscription.typical_amount - transaction.amount))
+            .first()
+        )
+        if subscription is None:
+            return
+
+        transaction.is_recurring = True
+        if transaction.date > subscription.last_seen:
+            subscription.last_seen = transaction.date
+            subscription.next_expected = transaction.date + timedelta(
+                days=subscription.interval_days
+            )
+            subscription.is_active = True
+        subscription.occurrences += 1
+        subscription.updated_at = datetime.utcnow()
+
+    @staticmethod
+    def get_active_subscriptions(user_id) -> List[UserSubscription]:
+        """The user's active recurring payments, largest monthly cost first."""
+        return (
+            UserSubscription.query.filter(
+                UserSubscription.user_id == str(user_id),
+                UserSubscription.is_active.is_(True),
+            )
+            .order_by(UserSubscription.monthly_amount.desc())
+            .all()
+        )
+
+    @staticmethod
+    def get_monthly_total(user_id) -> float:
+        """Monthly cost of the user's active recurring payments."""
+        return (
+            db.session.query(func.sum(UserSubscription.monthly_amount))
+            .filter(
+                UserSubscription.user_id == str(user_id),
+                UserSubscription.is_active.is_(True),
+            )
+            .scalar()
+            or 0
+        )
@@ -0,0 +1,265 @@
+import itertools
+import multiprocessing
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Sequence
+
+from sqlalchemy import String, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from configurations.database_config import db, note_written_users
+from configurations.logging_config import get_logger
+from entities.monthly_category_spend import UserMonthlyCategorySpend
+from entities.spending_anomaly import SpendingAnomaly
+from entities.spending_anomaly_scan import SpendingAnomalyScan
+from entities.transaction import Transaction
+from entities.user import User
+from models.analytics_models import AnomalyResult
+from services.core.spending_anomaly_service import (
+    HISTORY_DAYS,
+    SpendingAnomalyService,
+)
+
+logger = get_logger(__name__)
+
+# Users scored together in one tensor (~20 MB of float64 per 500 users).
+DEFAULT_CHUNK_SIZE = 500
+# Rows fetched per round trip from the server-side cursor.
+STREAM_BATCH_ROWS = 10_000
+
+
+def _shard_filter(user_id_column, shard: int, shard_count: int):
+    """Stable user -> shard assignment computed in SQL."""
+    return (
+        func.mod(func.abs(func.hashtext(cast(user_id_column, String))), shard_count)
+        == shard
+    )
+
+
+def _scan_shard_process(shard: int, shard_count: int, as_of: date, chunk_size: int):
+    """Entry point for worker processes: own app, own connection pool."""
+    # Imported here: the app imports the CLI commands, which import this module.
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        return SpendingAnomalyBatchService.scan_shard(
+            shard, shard_count, as_of, chunk_size
+        )
+
+
+class SpendingAnomalyBatchService:
+    """Scores every active user's spending anomalies ahead of time.
+
+    Each shard streams its users' daily category totals through a server-side
+    cursor (ordered by user), scores DEFAULT_CHUNK_SIZE users per vectorized
+    SpendingAnomalyService.detect_batch call, and replaces the users' rows in
+    spending_anomalies. A spending_anomaly_scans row per user records the scan, so
+    the dashboard can serve stored anomalies and fall back to scoring inline when
+    a user has not been scanned today or has new transactions since the scan.
+    Run with `flask detect-anomalies --workers N` to spread shards over processes.
+    """
+
+    @staticmethod
+    def get_stored(user_id, as_of: date) -> Optional[List[AnomalyResult]]:
+        """Stored anomalies from today's scan, or None if they may be out of date."""
+        latest_spend_update = (
+            select(func.max(UserMonthlyCategorySpend.updated_at))
+            .where(UserMonthlyCategorySpend.user_id == str(user_id))
+            .scalar_subquery()
+            .label("latest_spend_update")
+        )
+        scan = (
+            db.session.query(
+                SpendingAnomalyScan.as_of,
+                SpendingAnomalyScan.anomaly_count,
+                SpendingAnomalyScan.computed_at,
+                latest_spend_update,
+            )
+            .filter(SpendingAnomalyScan.user_id == str(user_id))
+            .first()
+        )
+        if scan is None or scan.as_of != as_of:
+            return None
+        if (
+            scan.latest_spend_update is not None
+            and scan.latest_spend_update > scan.computed_at
+        ):
+            return None
+        if scan.anomaly_count == 0:
+            return []
+
+        rows = (
+            SpendingAnomaly.query.filter_by(user_id=str(user_id))
+            .order_by(SpendingAnomaly.rank)
+            .all()
+        )
+        return [
+            AnomalyResult(
+                detected=True,
+                category=row.category,
+                spike_percent=row.spike_percent,
+                current_amount=row.current_amount,
+                previous_amount=row.baseline_amount,
+                timeframe=row.timeframe,
+                z_score=row.z_score,
+                severity=row.severity,
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _store(user_ids: Sequence, results: Sequence[List[AnomalyResult]], as_of):
+        """Replace the users' stored anomalies and record the scan."""
+        computed_at = datetime.utcnow()
+        user_ids = [str(user_id) for user_id in user_ids]
+
+        db.session.query(SpendingAnomaly).filter(
+            SpendingAnomaly.user_id.in_(user_ids)
+        ).delete(synchronize_session=False)
+
+        anomaly_rows = [
+            {
+                "user_id": user_id,
+                "rank": rank,
+                "category": anomaly.category,
+                "timeframe": anomaly.timeframe,
+                "spike_percent": anomaly.spike_percent,
+                "current_amount": anomaly.current_amount,
+                "baseline_amount": anomaly.previous_amount,
+                "z_score": anomaly.z_score,
+                "severity": anomaly.severity,
+                "as_of": as_of,
+                "computed_at": computed_at,
+            }
+            for user_id, anomalies in zip(user_ids, results)
+            for rank, anomaly in enumerate(anomalies, start=1)
+        ]
+        if anomaly_rows:
+            db.session.bulk_insert_mappings(SpendingAnomaly, anomaly_rows)
+
+        stmt = insert(SpendingAnomalyScan).values(
+            [
+                {
+                    "user_id": user_id,
+                    "as_of": as_of,
+                    "anomaly_count": len(anomalies),
+                    "computed_at": computed_at,
+                }
+                for user_id, anomalies in zip(user_ids, results)
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SpendingAnomalyScan.user_id],
+            set_={
+                "as_of": stmt.excluded.as_of,
+                "anomaly_count": stmt.excluded.anomaly_count,
+                "computed_at": stmt.excluded.computed_at,
+            },
+        )
+        db.session.execute(stmt)
+        note_written_users(user_ids)
+        db.session.commit()
+
+    @staticmethod
+    def _score_chunk(user_ids: list, rows: list, start: date, as_of: date, counts):
+        tensor, first_active_days = SpendingAnomalyService.build_tensor(
+            rows, user_ids, start
+        )
+        results = SpendingAnomalyService.detect_batch(tensor, first_active_days)
+        SpendingAnomalyBatchService._store(user_ids, results, as_of)
+
+        counts["users"] += len(user_ids)
+        for anomalies in results:
+            counts["anomalies"] += len(anomalies)
+            counts["high"] += sum(1 for a in anomalies if a.severity == "high")
+
+    @staticmethod
+    def scan_shard(
+        shard: int = 0,
+        shard_count: int = 1,
+        as_of: Optional[date] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> dict:
+        """Score and store anomalies for the active users in one shard.
+
+        Returns:
+            Counts of users scanned, anomalies stored and high-severity anomalies.
+        """
+        as_of = as_of or datetime.utcnow().date()
+        start = as_of - timedelta(days=HISTORY_DAYS - 1)
+        counts = {"users": 0, "anomalies": 0, "high": 0}
+
+        shard_users = select(User.id).where(
+            User.is_active.is_(True), _shard_filter(User.id, shard, shard_count)
+        )
+        query = (
+            SpendingAnomalyService.daily_spending_query(start, as_of)
+            .where(Transaction.user_id.in_(shard_users))
+            .order_by(Transaction.user_id)
+        )
+
+        # The cursor lives on its own connection so chunk commits on the session
+        # do not close it.
+        scanned = set()
+        with db.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=STREAM_BATCH_ROWS
+            ).execute(query)
+
+            chunk_users, chunk_rows = [], []
+            for user_id, user_rows in itertools.groupby(result, key=lambda r: r[0]):
+                chunk_users.append(user_id)
+                chunk_rows.extend(user_rows)
+                if len(chunk_users) >= chunk_size:
+                    SpendingAnomalyBatchService._score_chunk(
+                        chunk_users, chunk_rows, start, as_of, counts
+                    )
+                    scanned.update(chunk_users)
+                    chunk_users, chunk_rows = [], []
+            if chunk_users:
+                SpendingAnomalyBatchService._score_chunk(
+                    chunk_users, chunk_rows, start, as_of, counts
+                )
+                scanned.update(chunk_users)
+
+        # Active users without spending in the window: record an empty scan.
+        idle_users = [
+            user_id
+            for (user_id,) in db.session.execute(shard_users)
+            if user_id not in scanned
+        ]
+        for offset in range(0, len(idle_users), chunk_size):
+            batch = idle_users[offset : offset + chunk_size]
+            SpendingAnomalyBatchService._store(batch, [[] for _ in batch], as_of)
+            counts["users"] += len(batch)
+
+        logger.info(f"Anomaly scan shard {shard + 1}/{shard_count} finished: {counts}")
+        return counts
+
+    @staticmethod
+    def run(
+        workers: int = 1,
+        as_of: Optional[date] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> dict:
+        """Scan all active users, one shard per worker process.
+
+        With workers=1 the scan runs in the current process and app context.
+        """
+        as_of = as_of or datetime.utcnow().date()
+        if workers <= 1:
+            return SpendingAnomalyBatchService.scan_shard(0, 1, as_of, chunk_size)
+
+        # Spawned (not forked) workers build their own app and connection pool.
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(processes=workers) as pool:
+            shard_counts = pool.starmap(
+                _scan_shard_process,
+                [(shard, workers, as_of, chunk_size) for shard in range(workers)],
+            )
+
+        totals = {"users": 0, "anomalies": 0, "high": 0}
+        for counts in shard_counts:
+            for key in totals:
+                totals[key] += counts[key]
+        return totals
@@ -0,0 +1,218 @@
+import uuid
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Date, cast, func, select
+
+from configurations.database_config import db
+from configurations.logging_config import get_logger
+from entities.transaction import Transaction
+from enums import TransactionCategoryEnum, TransactionDirectionEnum
+from models.analytics_models import CATEGORIES, AnomalyResult
+
+logger = get_logger(__name__)
+
+# Days of daily history loaded per user (12 months).
+HISTORY_DAYS = 365
+
+# (window length in days, EWMA half-life in windows, minimum active history windows,
+# timeframe description). Each window compares the latest period with an
+# exponentially weighted baseline of the user's earlier periods of the same length.
+WINDOWS = (
+    (7, 8.0, 4, "this week compared to a typical week"),
+    (30, 3.0, 3, "the last 30 days compared to a typical month"),
+)
+
+# Flag a category when its latest period is at least this many standard deviations
+# above the baseline ...
+Z_THRESHOLD = 2.5
+# ... and exceeds the baseline by at least this amount (UZS), so tiny categories
+# with near-constant history do not produce noise.
+MIN_EXCESS_AMOUNT = 50_000
+# Standard deviation floor as a share of the baseline (fixed bills such as rent have
+# almost no variance, so any change would otherwise score as extreme).
+RELATIVE_STD_FLOOR = 0.2
+
+SEVERITY_LEVELS = ((4.0, "high"), (3.0, "medium"), (Z_THRESHOLD, "low"))
+MAX_ANOMALIES = 5
+
+_INCOME_INDEX = CATEGORIES.index(TransactionCategoryEnum.INCOME)
+_OTHER_INDEX = CATEGORIES.index(TransactionCategoryEnum.OTHER)
+_CATEGORY_INDEX = {category.value: index for index, category in enumerate(CATEGORIES)}
+
+
+class SpendingAnomalyService:
+    """Detects unusual category spending against each user's own history.
+
+    OUTGOING transactions for the last HISTORY_DAYS are loaded with one grouped
+    query into a (user x category x day) tensor. For every window in WINDOWS the
+    days are summed into consecutive periods ending today; the latest period is
+    scored against an EWMA mean and variance of the earlier periods, for all users
+    and categories at once. Periods before a user's first transaction are ignored.
+    `detect` scores one user on request; SpendingAnomalyBatchService scores all
+    users in chunks and stores the results.
+    """
+
+    @staticmethod
+    def daily_spending_query(start: date, end: date):
+        """(user_id, day, category, amount) rows of OUTGOING spending in [start, end]."""
+        day = cast(func.date_trunc("day", Transaction.date), Date)
+        return (
+            select(
+                Transaction.user_id,
+                day,
+                Transaction.category,
+                func.sum(Transaction.amount),
+            )
+            .where(
+                Transaction.transaction_direction == TransactionDirectionEnum.OUTGOING,
+                Transaction.date >= start,
+                Transaction.date < end + timedelta(days=1),
+            )
+            .group_by(Transaction.user_id, day, Transaction.category)
+        )
+
+    @staticmethod
+    def build_tensor(
+        rows: Sequence, user_ids: Sequence, start: date, days: int = HISTORY_DAYS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Scatter daily spending rows into a (users, categories, days) tensor.
+
+        Returns:
+            (tensor, first_active_days): first_active_days holds each user's first
+            day column with spending, or `days` for users without any.
+        """
+        tensor = np.zeros((len(user_ids), len(CATEGORIES), days))
+        if rows:
+            positions = {user_id: index for index, user_id in enumerate(user_ids)}
+            user_index = np.fromiter(
+                (positions[row[0]] for row in rows), dtype=np.int64, count=len(rows)
+            )
+            day_index = np.fromiter(
+                ((row[1] - start).days for row in rows), dtype=np.int64, count=len(rows)
+            )
+            category_index = np.fromiter(
+                (_CATEGORY_INDEX.get(row[2], _OTHER_INDEX) for row in rows),
+                dtype=np.int64,
+                count=len(rows),
+            )
+            amounts = np.fromiter(
+                (row[3] or 0 for row in rows), dtype=float, count=len(rows)
+            )
+            np.add.at(tensor, (user_index, category_index, day_index), amounts)
+            tensor[:, _INCOME_INDEX] = 0
+
+        active = tensor.any(axis=1)
+        first_active_days = np.where(active.any(axis=1), active.argmax(axis=1), days)
+        return tensor, first_active_days
+
+    @staticmethod
+    def _severity(z_score: float) -> str:
+        for threshold, label in SEVERITY_LEVELS:
+            if z_score >= threshold:
+                return label
+        return "low"
+
+    @staticmethod
+    def detect_batch(
+        tensor: np.ndarray, first_active_days: np.ndarray
+    ) -> List[List[AnomalyResult]]:
+        """Score many users at once.
+
+        Args:
+            tensor: Daily spending of shape (users, len(CATEGORIES), days).
+            first_active_days: Per-user column of the first spending (days when the
+                user has none).
+
+        Returns:
+            Ranked anomalies (worst first) for each user, in tensor order.
+        """
+        n_users, n_categories, days = tensor.shape
+        best = [{} for _ in range(n_users)]  # category index -> best AnomalyResult.
+
+        for window, half_life, min_history, timeframe in WINDOWS:
+            n_periods = days // window
+            if n_periods < min_history + 1:
+                continue
+
+            # 1. Sum days into consecutive periods ending today:
+            # (users, categories, periods).
+            periods = (
+                tensor[:, :, days - n_periods * window :]
+                .reshape(n_users, n_categories, n_periods, window)
+                .sum(axis=3)
+            )
+            current = periods[:, :, -1]
+            history = periods[:, :, :-1]
+
+            # 2. Only periods that end after the user's first transaction count.
+            period_ends = days - window * np.arange(n_periods - 1, 0, -1)
+            active = period_ends[None, :] > first_active_days[:, None]
+            enough_history = active.sum(axis=1) >= min_history
+
+            # 3. Exponential weights, newest history period weighted highest.
+            decay = 0.5 ** (1.0 / half_life)
+            weights = decay ** np.arange(n_periods - 2, -1, -1)[None, :] * active
+            totals = weights.sum(axis=1, keepdims=True)
+            weights /= np.where(totals > 0, totals, 1.0)
+
+            mean = np.einsum("uch,uh->uc", history, weights)
+            variance = np.einsum(
+                "uch,uh->uc", (history - mean[:, :, None]) ** 2, weights
+            )
+            std = np.maximum(np.sqrt(variance), RELATIVE_STD_FLOOR * mean)
+
+            # 4. Z-scores for all users and categories at once; no baseline or too
+            # little history -> not an anomaly.
+            scored = (mean > 0) & enough_history[:, None]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z_scores = np.where(scored, (current - mean) / std, 0.0)
+            flagged = np.argwhere(
+                (z_scores >= Z_THRESHOLD) & (current - mean >= MIN_EXCESS_AMOUNT)
+            )
+
+            for user, index in flagged:
+                z_score = float(z_scores[user, index])
+                if index in best[user] and best[user][index].z_score >= z_score:
+                    continue
+                baseline = float(mean[user, index])
+                best[user][index] = AnomalyResult(
+                    detected=True,
+                    category=CATEGORIES[index].value,
+                    spike_percent=(float(current[user, index]) - baseline)
+                    / baseline
+                    * 100,
+                    current_amount=float(current[user, index]),
+                    previous_amount=baseline,
+                    timeframe=timeframe,
+                    z_score=round(z_score, 2),
+                    severity=SpendingAnomalyService._severity(z_score),
+                )
+
+        return [
+            sorted(found.values(), key=lambda a: a.z_score, reverse=True)[
+                :MAX_ANOMALIES
+            ]
+            for found in best
+        ]
+
+    @staticmethod
+    def detect(user_id, end: Optional[date] = None) -> List[AnomalyResult]:
+        """Ranked spending anomalies for a user (empty list when nothing stands out)."""
+        end = end or datetime.utcnow().date()
+        start = end - timedelta(days=HISTORY_DAYS - 1)
+        query = SpendingAnomalyService.daily_spending_query(start, end).where(
+            Transaction.user_id == str(user_id)
+        )
+        rows = db.session.execute(query).all()
+        tensor, first_active_days = SpendingAnomalyService.build_tensor(
+            rows, [uuid.UUID(str(user_id))], start
+        )
+        anomalies = SpendingAnomalyService.detect_batch(tensor, first_active_days)[0]
+        for anomaly in anomalies:
+            logger.info(
+                f"Anomaly detected: {anomaly.category} spending {anomaly.spike_percent:+.1f}% "
+                f"({anomaly.timeframe}, z={anomaly.z_score}, {anomaly.severity})."
+            )
+        return anomalies
@@ -0,0 +1,263 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import Date, cast, func
+from sqlalchemy.dialects.postgresql import insert
+
+from configurations.database_config import db, note_written_users
+from configurations.logging_config import get_logger
+from entities.monthly_category_spend import UserMonthlyCategorySpend
+from entities.transaction import Transaction
+from enums import TransactionDirectionEnum
+from services.core.transaction_archive_service import TransactionArchiveService
+from services.core.user_data_version_service import UserDataVersionService
+
+logger = get_logger(__name__)
+
+Rollup = UserMonthlyCategorySpend
+OUTGOING = TransactionDirectionEnum.OUTGOING
+
+
+class SpendingRollupService:
+    """Maintains and reads the user_monthly_category_spend rollup.
+
+    Analytic reads (dashboard, goal insights, timelines, recommendations) use this
+    table instead of aggregating raw transactions, so their cost grows with the
+    number of months rather than the number of transactions.
+    """
+
+    @staticmethod
+    def month_start(value: datetime) -> date:
+        """First day of the month containing `value`."""
+        return date(value.year, value.month, 1)
+
+    @staticmethod
+    def _next_month(month: date) -> date:
+        if month.month == 12:
+            return date(month.year + 1, 1, 1)
+        return date(month.year, month.month + 1, 1)
+
+    @staticmethod
+    def record_transaction(
+        user_id,
+        transaction_date: datetime,
+        category: str,
+        direction: TransactionDirectionEnum,
+        amount: float,
+    ):
+        """Add one transaction to the rollup inside the caller's DB transaction.
+
+        Uses INSERT ... ON CONFLICT DO UPDATE so concurrent writers for the same
+        (user, month, category, direction) row increment it atomically. The caller
+        commits.
+        """
+        stmt = insert(Rollup).values(
+            user_id=user_id,
+            month=SpendingRollupService.month_start(transaction_date),
+            category=category,
+            transaction_direction=direction,
+            total_amount=amount,
+            transaction_count=1,
+            updated_at=datetime.utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                Rollup.user_id,
+                Rollup.month,
+                Rollup.category,
+                Rollup.transaction_direction,
+            ],
+            set_={
+                "total_amount": Rollup.total_amount + stmt.excluded.total_amount,
+                "transaction_count": Rollup.transaction_count + 1,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.session.execute(stmt)
+
+    @staticmethod
+    def rebuild(user_ids: Optional[Iterable] = None) -> int:
+        """Recompute the rollup from raw transactions.
+
+        Only months still stored in `transactions` are recomputed; rollup rows of
+        archived, detached or expired months are kept, since their transactions
+        are no longer there to sum.
+
+        Args:
+            user_ids: Only rebuild these users; all users when omitted.
+
+        Returns:
+            Number of rollup rows written.
+        """
+        try:
+            user_ids = [str(u) for u in user_ids] if user_ids is not None else None
+
+            first_month = TransactionArchiveService.first_live_month()
+
+            delete_query = db.session.query(Rollup)
+            if user_ids is not None:
+                delete_query = delete_query.filter(Rollup.user_id.in_(user_ids))
+            if first_month is not None:
+                delete_query = delete_query.filter(Rollup.month >= first_month)
+            delete_query.delete(synchronize_session=False)
+
+            month = cast(func.date_trunc("month", Transaction.date), Date)
+            source = db.session.query(
+                Transaction.user_id,
+                month,
+                Transaction.category,
+                Transaction.transaction_direction,
+                func.sum(Transaction.amount),
+                func.count(),
+                func.now(),
+            )
+            if user_ids is not None:
+                source = source.filter(Transaction.user_id.in_(user_ids))
+            if first_month is not None:
+                source = source.filter(
+                    Transaction.date >= datetime.combine(first_month, time())
+                )
+            source = source.group_by(
+                Transaction.user_id,
+                month,
+                Transaction.category,
+                Transaction.transaction_direction,
+            )
+
+            result = db.session.execute(
+                insert(Rollup).from_select(
+                    [
+                        Rollup.user_id,
+                        Rollup.month,
+                        Rollup.category,
+                        Rollup.transaction_direction,
+                        Rollup.total_amount,
+                        Rollup.transaction_count,
+                        Rollup.updated_at,
+                    ],
+                    source,
+                )
+            )
+            if user_ids is not None:
+                note_written_users(user_ids)
+            else:
+                UserDataVersionService.bump_all()
+            db.session.commit()
+
+            logger.info(f"Rebuilt monthly spend rollup ({result.rowcount} rows).")
+            return result.rowcount
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to rebuild monthly spend rollup: {str(e)}")
+            raise
+
+    @staticmethod
+    def get_monthly_totals(
+        user_id,
+        start_month: date,
+        end_month: date,
+        direction: Optional[TransactionDirectionEnum] = OUTGOING,
+    ) -> Dict[date, Dict[str, float]]:
+        """Category totals per month for an inclusive month range.
+
+        Args:
+            user_id: The user ID.
+            start_month: First month (any date inside it).
+            end_month: Last month (any date inside it).
+            direction: Transaction direction to include; both when None.
+
+        Returns:
+            {month_start: {category: amount}} for months that have transactions.
+        """
+        query = db.session.query(
+            Rollup.month, Rollup.category, func.sum(Rollup.total_amount)
+        ).filter(
+            Rollup.user_id == str(user_id),
+            Rollup.month >= SpendingRollupService.month_start(start_month),
+            Rollup.month <= SpendingRollupService.month_start(end_month),
+        )
+        if direction is not None:
+            query = query.filter(Rollup.transaction_direction == direction)
+
+        totals: Dict[date, Dict[str, float]] = {}
+        for month, category, amount in query.group_by(Rollup.month, Rollup.category):
+            totals.setdefault(month, {})[category] = amount
+        return totals
+
+    @staticmethod
+    def get_monthly_cash_flow(
+        user_id, start_month: date, end_month: date
+    ) -> Dict[date, Tuple[float, float]]:
+        """(incoming, outgoing) totals per month for an inclusive month range."""
+        rows = (
+            db.session.query(
+                Rollup.month,
+                Rollup.transaction_direction,
+                func.sum(Rollup.total_amount),
+            )
+            .filter(
+                Rollup.user_id == str(user_id),
+                Rollup.month >= SpendingRollupService.month_start(start_month),
+                Rollup.month <= SpendingRollupService.month_start(end_month),
+            )
+            .group_by(Rollup.month, Rollup.transaction_direction)
+        )
+
+        totals: Dict[date, Tuple[float, float]] = {}
+        for month, direction, amount in rows:
+            incoming, outgoing = totals.get(month, (0.0, 0.0))
+            if direction == OUTGOING:
+                outgoing += amount or 0
+            else:
+                incoming += amount or 0
+            totals[month] = (incoming, outgoing)
+        return totals
+
+    @staticmethod
+    def get_trailing_spending(
+        user_id,
+        days: int = 30,
+        direction: Optional[TransactionDirectionEnum] = OUTGOING,
+    ) -> Dict[str, float]:
+        """Estimate category totals over the last `days` days from monthly rows.
+
+        Months partly inside the window are prorated by the share of the month
+        (elapsed part, for the current month) that the window covers.
+        """
+        now = datetime.utcnow()
+        window_start = now - timedelta(days=days)
+        totals = SpendingRollupService.get_monthly_totals(
+            user_id, window_start, now, direction
+        )
+
+        categories: Dict[str, float] = {}
+        for month, breakdown in totals.items():
+            month_begin = datetime.combine(month, datetime.min.time())
+            month_end = min(
+                datetime.combine(
+                    SpendingRollupService._next_month(month), datetime.min.time()
+                ),
+                now,
+            )
+            span = month_end - month_begin
+            if span <= timedelta(0):
+                continue
+            covered = month_end - max(month_begin, window_start)
+            weight = min(1.0, covered / span)
+            for category, amount in breakdown.items():
+                categories[category] = categories.get(category, 0) + amount * weight
+        return categories
+
+    @staticmethod
+    def get_total_amount(
+        user_id,
+        direction: Optional[TransactionDirectionEnum] = OUTGOING,
+    ) -> float:
+        """All-time total for a user (both directions when direction is None)."""
+        query = db.session.query(func.sum(Rollup.total_amount)).filter(
+            Rollup.user_id == str(user_id)
+        )
+        if direction is not None:
+            query = query.filter(Rollup.transaction_direction == direction)
+        return query.scalar() or 0
@@ -0,0 +1,343 @@
+"""
+Cold-tier archive of old transactions.
+
+`flask archive-transactions` moves every month older than
+TRANSACTION_ARCHIVE_HORIZON_MONTHS (default 24) out of `transactions` into one
+zstd-compressed NDJSON file per user and month:
+
+    TRANSACTION_ARCHIVE_DIR/<user_id>/<YYYY-MM>.ndjson.zst
+
+Each line is the row's `Transaction.to_dict()`, sorted by date. The
+`transaction_archive_segments` table indexes the files (row count, date range,
+size), so readers only open the segments a date range touches. Whole monthly
+partitions are detached and dropped; rows of archived months that sit in the
+default partition are deleted. Rerunning merges late rows into the existing
+segment.
+
+Configurable via environment variables:
+- TRANSACTION_ARCHIVE_DIR=archive/transactions -> Segment root (relative to the working directory).
+- TRANSACTION_ARCHIVE_HORIZON_MONTHS=24        -> Full months kept in the database.
+- TRANSACTION_ARCHIVE_ZSTD_LEVEL=10            -> zstd compression level.
+
+Every API host reads segments from TRANSACTION_ARCHIVE_DIR, so with several hosts
+it must be shared storage.
+"""
+
+import datetime
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import zstandard
+from sqlalchemy import column, func, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+
+from configurations.database_config import db
+from configurations.logging_config import get_logger
+from entities.transaction import Transaction
+from entities.transaction_archive import TransactionArchiveSegment
+from services.core.transaction_partition_service import (
+    DEFAULT_PARTITION,
+    PARENT_TABLE,
+    TRANSACTION_RETENTION_MONTHS,
+    TransactionPartitionService,
+    _shift_months,
+)
+
+logger = get_logger(__name__)
+
+TRANSACTION_ARCHIVE_DIR = os.getenv("TRANSACTION_ARCHIVE_DIR", "archive/transactions")
+TRANSACTION_ARCHIVE_HORIZON_MONTHS = int(
+    os.getenv("TRANSACTION_ARCHIVE_HORIZON_MONTHS", "24")
+)
+TRANSACTION_ARCHIVE_ZSTD_LEVEL = int(os.getenv("TRANSACTION_ARCHIVE_ZSTD_LEVEL", "10"))
+
+# Rows fetched per round trip while streaming a month out of Postgres.
+ARCHIVE_FETCH_SIZE = 5000
+
+
+def _month_of(value: datetime.datetime) -> datetime.date:
+    return datetime.date(value.year, value.month, 1)
+
+
+def _in_range(
+    record: dict,
+    start: Optional[datetime.datetime],
+    end: Optional[datetime.datetime],
+) -> bool:
+    date = datetime.datetime.fromisoformat(record["date"])
+    return (start is None or date >= start) and (end is None or date < end)
+
+
+class TransactionArchiveService:
+    """Writes and reads archived transaction segments."""
+
+    @staticmethod
+    def segment_path(user_id, month: datetime.date) -> str:
+        """Segment file of a user's month, relative to TRANSACTION_ARCHIVE_DIR."""
+        return f"{user_id}/{month.year:04d}-{month.month:02d}.ndjson.zst"
+
+    @staticmethod
+    def _write_segment(path: str, records: List[dict]) -> int:
+        """Write records atomically (temp file + rename); returns the file size."""
+        full_path = os.path.join(TRANSACTION_ARCHIVE_DIR, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        compressed = zstandard.ZstdCompressor(
+            level=TRANSACTION_ARCHIVE_ZSTD_LEVEL
+        ).compress(payload.encode("utf-8"))
+
+        tmp_path = f"{full_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, full_path)
+        return len(compressed)
+
+    @staticmethod
+    def _read_segment(path: str) -> List[dict]:
+        with open(os.path.join(TRANSACTION_ARCHIVE_DIR, path), "rb") as f:
+            payload = zstandard.ZstdDecompressor().decompress(f.read())
+        return [json.loads(line) for line in payload.decode("utf-8").splitlines()]
+
+    @staticmethod
+    def get_segments(
+        user_id,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> List[TransactionArchiveSegment]:
+        """Index rows of the user's segments overlapping [start, end)."""
+        query = TransactionArchiveSegment.query.filter_by(user_id=user_id)
+        if start is not None:
+            query = query.filter(TransactionArchiveSegment.last_date >= start)
+        if end is not None:
+            query = query.filter(TransactionArchiveSegment.first_date < end)
+        return query.order_by(TransactionArchiveSegment.month).all()
+
+    @staticmethod
+    def iter_records(
+        segments: Iterable[TransactionArchiveSegment],
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+        exclude_ids: Iterable[str] = (),
+    ) -> Iterator[dict]:
+        """Archived transactions in [start, end), oldest first.
+
+        `exclude_ids` skips rows that are also still in the database (a run
+        interrupted between writing a segment and removing the rows).
+        """
+        exclude_ids = set(exclude_ids)
+        for segment in segments:
+            for record in TransactionArchiveService._read_segment(segment.path):
+                if record["id"] not in exclude_ids and _in_range(record, start, end):
+                    yield record
+
+    @staticmethod
+    def _detached_partitions() -> Dict[str, datetime.date]:
+        """Monthly tables detached from `transactions` (by retention), by month."""
+        names = db.session.execute(
+            text(
+                r"""
+                SELECT relname FROM pg_class
+                WHERE relkind = 'r' AND NOT relispartition
+                  AND relname ~ '^transactions_\d{4}_\d{2}$'
+                """
+            )
+        ).scalars()
+        return {
+            name: datetime.date(int(name[-7:-3]), int(name[-2:]), 1) for name in names
+        }
+
+    @staticmethod
+    def first_live_month(
+        today: Optional[datetime.date] = None,
+    ) -> Optional[datetime.date]:
+        """First month whose rows are all still in `transactions`.
+
+        Months before it were archived, detached, or are past the retention
+        period (their partitions may already be dropped). None when no month has
+        left the table.
+        """
+        bounds = []
+        archived = db.session.query(func.max(TransactionArchiveSegment.month)).scalar()
+        if archived is not None:
+            bounds.append(_shift_months(archived, 1))
+        detached = TransactionArchiveService._detached_partitions().values()
+        if detached:
+            bounds.append(_shift_months(max(detached), 1))
+        if TRANSACTION_RETENTION_MONTHS > 0:
+            today = today or datetime.date.today()
+            bounds.append(
+                _shift_months(_month_of(today), -TRANSACTION_RETENTION_MONTHS)
+            )
+        return max(bounds) if bounds else None
+
+    @staticmethod
+    def _archive_table(
+        table_name: str, month: datetime.date, attached: bool
+    ) -> Dict[str, int]:
+        """Write one month of `table_name` to segments and remove it from the table.
+
+        Runs inside the caller's DB transaction; the table is locked against
+        writes until it commits, so no row lands between the read and the removal.
+        """
+        counts = {"rows": 0, "segments": 0, "bytes": 0}
+        lower = datetime.datetime.combine(month, datetime.time())
+        upper = datetime.datetime.combine(_shift_months(month, 1), datetime.time())
+        db.session.execute(text(f"LOCK TABLE {table_name} IN SHARE MODE"))
+
+        # Same columns and types as the entity, so rows come back as they do
+        # through the ORM (enums, parsed JSON).
+        source = table(
+            table_name,
+            *[column(c.name, c.type) for c in Transaction.__table__.columns],
+        )
+        rows = db.session.execute(
+            select(source)
+            .where(source.c.date >= lower, source.c.date < upper)
+            .order_by(source.c.user_id, source.c.date)
+            .execution_options(yield_per=ARCHIVE_FETCH_SIZE)
+        )
+
+        existing = {
+            segment.user_id: segment
+            for segment in TransactionArchiveSegment.query.filter_by(month=month)
+        }
+        index_rows = []
+
+        def flush_user(user_id, records):
+            segment = existing.get(user_id)
+            if segment is not None:
+                # Merge late rows into the segment archived by an earlier run.
+                new_ids = {r["id"] for r in records}
+                records = [
+                    r
+                    for r in TransactionArchiveService._read_segment(segment.path)
+                    if r["id"] not in new_ids
+                ] + records
+                records.sort(key=lambda r: r["date"])
+            path = TransactionArchiveService.segment_path(user_id, month)
+            size = TransactionArchiveService._write_segment(path, records)
+            index_rows.append(
+                {
+                    "user_id": user_id,
+                    "month": month,
+                    "path": path,
+                    "row_count": len(records),
+                    "first_date": datetime.datetime.fromisoformat(records[0]["date"]),
+                    "last_date": datetime.datetime.fromisoformat(records[-1]["date"]),
+                    "compressed_bytes": size,
+                    "created_at": datetime.datetime.utcnow(),
+                }
+            )
+            counts["segments"] += 1
+            counts["bytes"] += size
+
+        # 1. Stream the month ordered by user and write one segment per user.
+        current_user, records = None, []
+        for row in rows:
+            if row.user_id != current_user and records:
+                flush_user(current_user, records)
+                records = []
+            current_user = row.user_id
+            # Transient entity (never added to the session) for the API's row shape.
+            records.append(Transaction(**row._mapping).to_dict())
+            counts["rows"] += 1
+        if records:
+            flush_user(current_user, records)
+
+        # 2. Index the segments.
+        if index_rows:
+            stmt = insert(TransactionArchiveSegment).values(index_rows)
+            db.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["user_id", "month"],
+                    set_={
+                        name: stmt.excluded[name]
+                        for name in (
+                            "path",
+                            "row_count",
+                            "first_date",
+                            "last_date",
+                            "compressed_bytes",
+                            "created_at",
+                        )
+                    },
+                )
+            )
+
+        # 3. Remove the rows: whole tables are dropped, default rows deleted.
+        if table_name == DEFAULT_PARTITION:
+            db.session.execute(
+                text(
+                    f"DELETE FROM {table_name} WHERE date >= :lower AND date < :upper"
+                ),
+                {"lower": lower, "upper": upper},
+            )
+        else:
+            if attached:
+                db.session.execute(
+                    text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {table_name}")
+                )
+            db.session.execute(text(f"DROP TABLE {table_name}"))
+        return counts
+
+    @staticmethod
+    def archive(
+        horizon_months: int = TRANSACTION_ARCHIVE_HORIZON_MONTHS,
+        today: Optional[datetime.date] = None,
+    ) -> Dict[str, int]:
+        """Archive every month older than `horizon_months` full months.
+
+        Sources are the attached monthly partitions, detached ones left by
+        retention, and back-dated rows in the default partition. Each month is
+        committed on its own. Monthly rollups keep their totals.
+
+        Returns:
+            {"tables", "rows", "segments", "bytes"} archived by this run.
+        """
+        today = today or datetime.date.today()
+        cutoff = _shift_months(_month_of(today), -horizon_months)
+        totals = {"tables": 0, "rows": 0, "segments": 0, "bytes": 0}
+        try:
+            # (month, table, attached) in month order.
+            sources = [
+                (month, name, True)
+                for name, month in TransactionPartitionService.list_partitions().items()
+                if month is not None and month < cutoff
+            ]
+            sources += [
+                (month, name, False)
+                for name, month in TransactionArchiveService._detached_partitions().items()
+                if month < cutoff
+            ]
+            sources += [
+                (month, DEFAULT_PARTITION, True)
+                for month in db.session.execute(
+                    text(
+                        f"SELECT DISTINCT date_trunc('month', date)::date "
+                        f"FROM {DEFAULT_PARTITION} WHERE date < :cutoff"
+                    ),
+                    {"cutoff": cutoff},
+                ).scalars()
+            ]
+            db.session.commit()
+
+            for month, name, attached in sorted(sources):
+                counts = TransactionArchiveService._archive_table(name, month, attached)
+                db.session.commit()
+                logger.info(f"Archived {name} ({month.isoformat()}): {counts}")
+                totals["tables"] += 1
+                for key, value in counts.items():
+                    totals[key] += value
+
+            logger.info(
+                f"Archived transactions older than {cutoff.isoformat()}: {totals}"
+            )
+            return totals
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to archive transactions: {str(e)}")
+            raise
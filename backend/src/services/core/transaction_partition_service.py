@@ -0,0 +1,202 @@
+"""
+Monthly range partitions of the transactions table.
+
+`transactions` is partitioned by RANGE (date) into one table per calendar month
+(transactions_YYYY_MM) plus transactions_default, which catches rows outside every
+monthly range (back-dated imports, far-future dates). Queries filtering on a date
+window only scan the matching months.
+
+`flask partition-transactions` (daily timer) keeps partitions in place ahead of time
+and applies retention:
+- Partitions are created for the current month and TRANSACTION_PARTITION_MONTHS_AHEAD
+  months after it (default 3), and for every month that has rows sitting in the
+  default partition (those rows are moved into the new monthly partition).
+- With a retention period (TRANSACTION_RETENTION_MONTHS), whole months older than
+  it are detached instead of DELETEd: the detached table keeps its rows (for
+  archiving) until dropped.
+"""
+
+import os
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from configurations.database_config import db
+from configurations.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TRANSACTION_PARTITION_MONTHS_AHEAD = int(
+    os.getenv("TRANSACTION_PARTITION_MONTHS_AHEAD", "3")
+)
+# Months of transactions kept attached; 0 keeps everything.
+TRANSACTION_RETENTION_MONTHS = int(os.getenv("TRANSACTION_RETENTION_MONTHS", "0"))
+
+PARENT_TABLE = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+
+
+def _shift_months(month: date, offset: int) -> date:
+    index = month.year * 12 + month.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class TransactionPartitionService:
+    """Creates, lists and detaches monthly transactions partitions."""
+
+    @staticmethod
+    def partition_name(month: date) -> str:
+        return f"{PARENT_TABLE}_{month.year:04d}_{month.month:02d}"
+
+    @staticmethod
+    def list_partitions() -> Dict[str, Optional[date]]:
+        """Attached partitions: {name: first day of its month}, None for default."""
+        rows = db.session.execute(
+            text(
+                """
+                SELECT child.relname,
+                       pg_get_expr(child.relpartbound, child.oid)
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = :parent
+                ORDER BY child.relname
+                """
+            ),
+            {"parent": PARENT_TABLE},
+        ).all()
+        partitions = {}
+        for name, bound in rows:
+            if bound == "DEFAULT":
+                partitions[name] = None
+            else:
+                # FOR VALUES FROM ('2026-05-01 00:00:00') TO ('2026-06-01 00:00:00')
+                lower = bound.split("'")[1]
+                partitions[name] = date.fromisoformat(lower[:10])
+        return partitions
+
+    @staticmethod
+    def _create_partition(month: date):
+        """Create one monthly partition, moving its rows out of the default one."""
+        name = TransactionPartitionService.partition_name(month)
+        lower, upper = month.isoformat(), _shift_months(month, 1).isoformat()
+        in_range = f"date >= '{lower}' AND date < '{upper}'"
+
+        has_default_rows = db.session.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})")
+        ).scalar()
+        if not has_default_rows:
+            db.session.execute(
+                text(
+                    f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                    f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+                )
+            )
+            return 0
+
+        # Postgres refuses a new partition while the default one holds rows for its
+        # range, so build the table, move the rows and then attach it. The CHECK
+        # constraint lets ATTACH skip its validation scan.
+        db.session.execute(
+            text(
+                f"CREATE TABLE {name} "
+                f"(LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        db.session.execute(
+            text(f"ALTER TABLE {name} ADD CONSTRAINT {name}_range CHECK ({in_range})")
+        )
+        moved = db.session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} "
+                f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+            )
+        ).rowcount
+        db.session.execute(
+            text(
+                f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+            )
+        )
+        db.session.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT {name}_range"))
+        return moved
+
+    @staticmethod
+    def ensure_partitions(
+        months_ahead: int = TRANSACTION_PARTITION_MONTHS_AHEAD,
+        today: Optional[date] = None,
+    ) -> Dict[str, int]:
+        """Create missing partitions up to `months_ahead` months after this one.
+
+        Months that have rows in the default partition get a partition as well.
+
+        Returns:
+            {"created": partitions created, "moved": rows moved out of default}.
+        """
+        today = today or date.today()
+        current = date(today.year, today.month, 1)
+        try:
+            existing = set(TransactionPartitionService.list_partitions().values())
+            wanted = {_shift_months(current, i) for i in range(months_ahead + 1)}
+            stray_months = db.session.execute(
+                text(
+                    f"SELECT DISTINCT date_trunc('month', date)::date "
+                    f"FROM {DEFAULT_PARTITION}"
+                )
+            ).scalars()
+            wanted.update(stray_months)
+
+            counts = {"created": 0, "moved": 0}
+            for month in sorted(wanted - existing):
+                counts["moved"] += TransactionPartitionService._create_partition(month)
+                counts["created"] += 1
+            db.session.commit()
+
+            logger.info(f"Ensured transactions partitions: {counts}")
+            return counts
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to create transactions partitions: {str(e)}")
+            raise
+
+    @staticmethod
+    def detach_older_than(
+        retention_months: int, drop: bool = False, today: Optional[date] = None
+    ) -> List[str]:
+        """Detach (or drop) monthly partitions that end before the retention window.
+
+        A partition is detached once its whole month is older than
+        `retention_months` full months before the current one. Monthly rollups keep
+        their totals; detached tables keep their rows until dropped or archived.
+
+        Returns:
+            Names of the detached partitions.
+        """
+        today = today or date.today()
+        cutoff = _shift_months(date(today.year, today.month, 1), -retention_months)
+        try:
+            expired = [
+                name
+                for name, month in TransactionPartitionService.list_partitions().items()
+                if month is not None and month < cutoff
+            ]
+            for name in expired:
+                db.session.execute(
+                    text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+                )
+                if drop:
+                    db.session.execute(text(f"DROP TABLE {name}"))
+            db.session.commit()
+
+            logger.info(
+                f"{'Dropped' if drop else 'Detached'} {len(expired)} transactions "
+                f"partitions older than {cutoff.isoformat()}"
+            )
+            return expired
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to detach transactions partitions: {str(e)}")
+            raise
@@ -1,22 +1,42 @@
 import datetime
+import heapq
 import json
 import random
-from typing import List
+import uuid
+from typing import List, Optional
 
-from configurations.database_config import db
+from configurations.database_config import db, replica_reads
 from configurations.logging_config import get_logger
-from entities.transaction import Transaction
-from entities.user import User
+from entities.transaction import (
+    DETAIL_FIELDS,
+    DETAIL_ROWS,
+    FULL_DETAIL,
+    SUMMARY_ROWS,
+    Transaction,
+)
 from enums import TransactionDirectionEnum
 from enums.transaction_category_enum import TransactionCategoryEnum
 from models.base_response import BaseResponse
 from models.transaction_create_model import TransactionCreateModel
 from services.ai_services.ai_service import AIService
+from services.core.card_ledger_service import CARD_NOT_OWNED
 from services.core.card_service import CardService
+from services.core.recurring_payment_service import RecurringPaymentService
+from services.core.spending_rollup_service import SpendingRollupService
+from services.core.transaction_archive_service import TransactionArchiveService
+from services.core.user_cache import UserCache
 
 logger = get_logger(__name__)
 
 
+def _date_key(transaction: dict) -> datetime.datetime:
+    """Sort key for database rows (datetime) and archived records (ISO string)."""
+    date = transaction["date"]
+    if isinstance(date, datetime.datetime):
+        return date
+    return datetime.datetime.fromisoformat(date)
+
+
 class TransactionService:
     """Service for handling transaction-related operations."""
 
@@ -37,11 +57,22 @@ class TransactionService:
         return model
 
     @staticmethod
-    def get_user_transactions(username: str) -> BaseResponse:
-        """Get all transactions for a user"""
+    @replica_reads
+    def get_user_transactions(
+        username: str,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> BaseResponse:
+        """Get a user's transactions in [start, end), newest first.
+
+        Rows are listed without their payload columns (see DETAIL_FIELDS); use
+        get_transaction for one transaction's full detail. Months moved to the
+        cold-tier archive are read from their segments when the range reaches
+        back that far.
+        """
         try:
             # Look up user by username.
-            user = User.query.filter_by(username=username).first()
+            user = UserCache.get_by_username(username)
             if not user:
                 logger.error("User not found.")
                 return BaseResponse(
@@ -50,18 +81,34 @@ class TransactionService:
                     errors=["User not found."],
                 )
 
-            transactions = (
-                Transaction.query.filter_by(user_id=str(user.id))
-                .order_by(Transaction.date.desc())
-                .all()
+            query = SUMMARY_ROWS.select().where(Transaction.user_id == str(user.id))
+            if start is not None:
+                query = query.where(Transaction.date >= start)
+            if end is not None:
+                query = query.where(Transaction.date < end)
+            data = SUMMARY_ROWS(
+                db.session.execute(query.order_by(Transaction.date.desc()))
             )
+
+            segments = TransactionArchiveService.get_segments(user.id, start, end)
+            if segments:
+                archived = TransactionArchiveService.iter_records(
+                    segments, start, end, exclude_ids=[str(t["id"]) for t in data]
+                )
+                for record in archived:
+                    for field in DETAIL_FIELDS:
+                        record.pop(field, None)
+                    data.append(record)
+                data.sort(key=_date_key, reverse=True)
+
             logger.info(
-                f"Retrieved {len(transactions)} transactions for user {username}."
+                f"Retrieved {len(data)} transactions for user {username} "
+                f"({len(segments)} archived segments)."
             )
             return BaseResponse(
                 is_success=True,
                 message="Transactions retrieved successfully.",
-                data=[t.to_dict() for t in transactions],
+                data=data,
             )
         except Exception as e:
             logger.error(f"Error getting transactions: {str(e)}")
@@ -71,12 +118,110 @@ class TransactionService:
                 errors=[str(e)],
             )
 
+    @staticmethod
+    def export_user_transactions(
+        username: str,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> BaseResponse:
+        """Stream a user's transactions in [start, end), oldest first.
+
+        On success `data` is an iterator of transaction dicts: archived segments
+        and database rows merged by date, read lazily so large histories are
+        never held in memory.
+        """
+        try:
+            user = UserCache.get_by_username(username)
+            if not user:
+                logger.error("User not found.")
+                return BaseResponse(
+                    is_success=False,
+                    message="User not found.",
+                    errors=["User not found."],
+                )
+
+            segments = TransactionArchiveService.get_segments(user.id, start, end)
+            still_in_db = []
+            if segments:
+                # Rows of archived months still in the database win over the
+                # segment copy; usually there are none.
+                overlap = Transaction.query.with_entities(Transaction.id).filter(
+                    Transaction.user_id == user.id,
+                    Transaction.date >= segments[0].first_date,
+                    Transaction.date <= segments[-1].last_date,
+                )
+                still_in_db = [str(t.id) for t in overlap]
+
+            query = DETAIL_ROWS.select().where(Transaction.user_id == str(user.id))
+            if start is not None:
+                query = query.where(Transaction.date >= start)
+            if end is not None:
+                query = query.where(Transaction.date < end)
+
+            def rows():
+                # Executed while the response streams: the request's session
+                # is closed before the first chunk goes out, and with it any
+                # cursor opened now.
+                result = db.session.execute(
+                    query.order_by(Transaction.date).execution_options(yield_per=1000)
+                )
+                for values in result:
+                    yield DETAIL_ROWS.row(values)
+
+            archived = TransactionArchiveService.iter_records(
+                segments, start, end, exclude_ids=still_in_db
+            )
+
+            logger.info(
+                f"Exporting transactions for user {username} "
+                f"({len(segments)} archived segments)."
+            )
+            return BaseResponse(
+                is_success=True,
+                message="Transactions export started.",
+                data=heapq.merge(archived, rows(), key=_date_key),
+            )
+        except Exception as e:
+            logger.error(f"Error exporting transactions: {str(e)}")
+            return BaseResponse(
+                is_success=False,
+                message="Failed to export transactions.",
+                errors=[str(e)],
+            )
+
+    @staticmethod
+    def get_transaction(transaction_id: str) -> BaseResponse:
+        """Get one transaction with its full detail (payload columns included)."""
+        try:
+            transaction = (
+                Transaction.query.options(FULL_DETAIL)
+                .filter_by(id=uuid.UUID(transaction_id))
+                .first()
+            )
+            if not transaction:
+                return BaseResponse(
+                    is_success=False,
+                    message="Transaction not found.",
+                    errors=["Transaction not found."],
+                )
+            return BaseResponse(
+                is_success=True,
+                message="Transaction retrieved successfully.",
+                data=transaction.to_dict(),
+            )
+        except Exception as e:
+            logger.error(f"Error getting transaction: {str(e)}")
+            return BaseResponse(
+                is_success=False,
+                message="Failed to retrieve transaction.",
+                errors=[str(e)],
+            )
+
     @staticmethod
     def create_transaction(data: TransactionCreateModel) -> BaseResponse:
         """Create a new transaction from the detailed model."""
         try:
-            # 1. Update card balance.
-            # Determine which card to update based on direction and availability.
+            # 1. Determine which card to update based on direction and availability.
             card_id_to_update = None
             if data.transaction_direction == TransactionDirectionEnum.OUTGOING:
                 if data.sender.card_id:
@@ -89,39 +234,50 @@ class TransactionService:
                 elif data.card.card_id:
                     card_id_to_update = data.card.card_id
 
+            user_id = data.user_id
+
+            # 2. Categorize transaction before any DB work, so the card row is not
+            # locked while waiting for the LLM.
+            category = AIService.categorize_transaction(
+                transaction_type=data.transaction_type.value,
+                transaction_direction=data.transaction_direction.value,
+                description=data.description,
+                merchant_name=data.merchant_name,
+            )
+
+            if category:
+                logger.info(f"Categorized transaction as {category.value}")
+            else:
+                logger.warning(
+                    "Failed to categorize transaction, using 'Uncategorized'."
+                )
+
+            # 3. Check ownership and funds and append the balance change to the
+            # card ledger; the transaction insert below commits with it.
+            transaction_id = uuid.uuid4()
             if card_id_to_update:
-                success, msg = CardService.update_balance(
+                success, msg = CardService.apply_balance_change(
                     card_id_to_update,
                     float(data.amount),
                     data.transaction_direction.value,
+                    user_id=user_id,
+                    transaction_id=transaction_id,
                 )
                 if not success:
+                    db.session.rollback()
+                    if msg == CARD_NOT_OWNED:
+                        return BaseResponse(is_success=False, message=msg)
                     return BaseResponse(
                         is_success=False, message=f"Balance update failed: {msg}"
                     )
 
-            # 2. Create transaction entity.
-            # Map Pydantic model to SQLAlchemy entity.
-
-            # Validate User ID (optional check if user exists, but for now we trust the ID or FK will fail).
-            user_id = data.user_id
-
-            # Optional: Verify card belongs to user if card_id_to_update is present.
-            if card_id_to_update:
-                card_response, status = CardService.get_card_by_id(card_id_to_update)
-                if status == 200 and "card" in card_response:
-                    card_owner_id = card_response["card"]["user_id"]
-                    if str(card_owner_id) != str(user_id):
-                        return BaseResponse(
-                            is_success=False,
-                            message="Card does not belong to the provided user",
-                        )
-
+            # 4. Create transaction entity.
             sender_json = TransactionService._to_json_dict(data.sender)
             receiver_json = TransactionService._to_json_dict(data.receiver)
             logger.info(f"Serialized Sender: {sender_json}")
 
             new_txn = Transaction(
+                id=transaction_id,
                 user_id=user_id,
                 external_id=data.external_id,
                 transaction_type=data.transaction_type,
@@ -145,34 +301,34 @@ class TransactionService:
                     if data.receiver.type == "MERCHANT"
                     else "Unknown"
                 ),
-                category="Uncategorized",  # Will be updated.
+                category=category.value if category else "Uncategorized",
                 status=data.transaction_status,
             )
 
-            # 3. Categorize transaction.
-            category = AIService.categorize_transaction(
-                transaction_type=data.transaction_type.value,
-                transaction_direction=data.transaction_direction.value,
-                description=data.description,
-                merchant_name=data.merchant_name,
-            )
+            db.session.add(new_txn)
+            db.session.flush()  # Applies column defaults (e.g. date) before the rollup.
 
-            if category:
-                new_txn.category = category.value
-                logger.info(f"Categorized transaction as {category.value}")
-            else:
-                new_txn.category = "Uncategorized"
-                logger.warning(
-                    "Failed to categorize transaction, using 'Uncategorized'."
-                )
+            # 5. Update the monthly spending rollup in the same DB transaction.
+            SpendingRollupService.record_transaction(
+                user_id,
+                new_txn.date,
+                new_txn.category,
+                data.transaction_direction,
+                new_txn.amount,
+            )
 
-            db.session.add(new_txn)
+            # 6. Flag payments that continue a known subscription or bill.
+            if data.transaction_direction == TransactionDirectionEnum.OUTGOING:
+                RecurringPaymentService.match_transaction(new_txn)
+            # Serialized before the commit expires the row, which would reload it
+            # (and its deferred payload columns) with two more queries.
+            created = new_txn.to_dict()
             db.session.commit()
 
             return BaseResponse(
                 is_success=True,
                 message="Transaction created successfully.",
-                data=new_txn.to_dict(),
+                data=created,
             )
 
         except Exception as e:
@@ -0,0 +1,150 @@
+"""
+Shared username -> user profile lookup.
+
+Two layers sit in front of the database:
+- A request-scoped identity map on `flask.g`, so one request never looks up the same
+  user twice (e.g. a controller and several services all resolving the username).
+- A short-TTL process-level cache of immutable profile snapshots. Entries are dropped
+  by `UserService.update_user` in the process that handles the update; other gunicorn
+  workers pick the change up when their entry expires (USER_CACHE_TTL_SECONDS).
+
+Snapshots record the user's data version (see user_data_version_service). A request
+that has seen a newer version (`require_version`, e.g. a conditional GET that is
+about to tag its response with it) reloads the snapshot instead of using an older
+cached one.
+"""
+
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from flask import g, has_app_context
+from sqlalchemy import func
+
+from configurations.database_config import db, primary_reads, track_request_user
+from entities.user import User
+from entities.user_data_version import UserDataVersion
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+
+
+@dataclass(frozen=True)
+class UserProfileSnapshot:
+    """Read-only subset of a user row used by analytics and ownership checks."""
+
+    id: uuid.UUID
+    username: str
+    salary: float
+    currency: str
+    age: Optional[int]
+    family_size: Optional[int]
+    is_active: bool
+    updated_at: datetime
+    data_version: int
+
+    def to_dict(self) -> dict:
+        """Profile dict in the shape AIService expects (same keys as User.to_dict)."""
+        return {
+            "id": str(self.id),
+            "username": self.username,
+            "salary": self.salary,
+            "currency": self.currency,
+            "age": self.age,
+            "family_size": self.family_size,
+            "is_active": self.is_active,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+_SNAPSHOT_COLUMNS = (
+    User.id,
+    User.username,
+    User.salary,
+    User.currency,
+    User.age,
+    User.family_size,
+    User.is_active,
+    User.updated_at,
+    func.coalesce(UserDataVersion.version, 0),
+)
+
+# username -> (expires_at, snapshot).
+_process_cache: Dict[str, Tuple[float, UserProfileSnapshot]] = {}
+_process_cache_lock = threading.Lock()
+
+
+class UserCache:
+    """Cached username -> UserProfileSnapshot lookups shared by all services."""
+
+    @staticmethod
+    def _identity_map() -> dict:
+        if not has_app_context():
+            return {}
+        if "user_snapshots" not in g:
+            g.user_snapshots = {}
+        return g.user_snapshots
+
+    @staticmethod
+    def require_version(username: str, version: int):
+        """Make this request ignore snapshots older than the user's data `version`."""
+        if has_app_context():
+            g.setdefault("user_min_versions", {})[username] = version
+
+    @staticmethod
+    def get_by_username(username: str) -> Optional[UserProfileSnapshot]:
+        """Return the user's profile snapshot, or None if the user does not exist."""
+        identity_map = UserCache._identity_map()
+        min_version = (
+            g.get("user_min_versions", {}).get(username, 0) if has_app_context() else 0
+        )
+        snapshot = identity_map.get(username)
+        if snapshot is not None and snapshot.data_version >= min_version:
+            return snapshot
+
+        now = time.monotonic()
+        with _process_cache_lock:
+            cached = _process_cache.get(username)
+        if (
+            cached is not None
+            and cached[0] > now
+            and cached[1].data_version >= min_version
+        ):
+            snapshot = cached[1]
+        else:
+            # Profile lookups stay on the primary: they are cached, and a user who
+            # signed up moments ago must not look missing on a lagging replica.
+            with primary_reads():
+                row = (
+                    db.session.query(*_SNAPSHOT_COLUMNS)
+                    .outerjoin(UserDataVersion, UserDataVersion.user_id == User.id)
+                    .filter(User.username == username)
+                    .first()
+                )
+            if row is None:
+                return None
+            snapshot = UserProfileSnapshot(*row)
+            with _process_cache_lock:
+                _process_cache[username] = (now + USER_CACHE_TTL_SECONDS, snapshot)
+
+        identity_map[username] = snapshot
+        if has_app_context():
+            track_request_user(snapshot.id)
+        return snapshot
+
+    @staticmethod
+    def invalidate(username: str):
+        """Drop a user from both cache layers (call after updating the user)."""
+        with _process_cache_lock:
+            _process_cache.pop(username, None)
+        UserCache._identity_map().pop(username, None)
+
+    @staticmethod
+    def clear():
+        """Drop every cached user in this process."""
+        with _process_cache_lock:
+            _process_cache.clear()
+        UserCache._identity_map().clear()
@@ -0,0 +1,204 @@
+"""
+Per-user data versions and the conditional GETs built on them.
+
+`user_data_versions` holds one counter per user. A commit that wrote any row owned
+by a user (transactions, goals, cards and their ledger, the profile) increments
+that user's counter in the same DB transaction, through the session's
+before_commit hook below. Batch jobs that rewrite derived data with bulk
+statements (rollups, anomalies, recurring payments) note the users they touched
+with `note_written_users`, or call `bump_all`.
+
+`conditional_on_data_version` turns the version into a strong ETag for polled GET
+endpoints. A request whose If-None-Match matches gets a 304 after one indexed
+lookup (users.username joined to user_data_versions), before the view or any
+aggregation runs.
+
+The tag also covers the path, the query string and the current date, since
+dashboards and timelines change with the day even when the data does not.
+Responses are marked `Cache-Control: private, no-cache`, so browsers revalidate
+every poll. Views under the decorator skip `UserCache` snapshots older than the
+version they are tagged with, so a profile update made through another worker is
+never served from a stale cached salary under the new tag.
+
+With read replicas configured, a 200 for a version bumped less than
+REPLICA_MAX_LAG_SECONDS ago is sent without an ETag: its body may have been read
+from a replica that does not have the write yet.
+"""
+
+import functools
+import hashlib
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from flask import make_response, request
+from sqlalchemy import event, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+
+from configurations.database_config import (
+    REPLICA_BIND_KEYS,
+    REPLICA_MAX_LAG_SECONDS,
+    RoutingSession,
+    db,
+    get_written_user_ids,
+    primary_reads,
+    track_request_user,
+)
+from configurations.logging_config import get_logger
+from entities.user import User
+from entities.user_data_version import UserDataVersion
+from services.core.user_cache import UserCache
+from services.monitoring.metrics_registry import metrics
+
+logger = get_logger(__name__)
+
+metrics.counter(
+    "http_conditional_get_total",
+    "Conditional GETs by endpoint and result (not_modified, modified, unversioned).",
+)
+
+
+# Browsers keep the response but revalidate it on every poll.
+CACHE_CONTROL = "private, no-cache"
+
+
+def _utc_now():
+    return func.timezone("utc", func.now())
+
+
+class UserDataVersionService:
+    """Bumps and reads per-user data versions."""
+
+    @staticmethod
+    def bump(user_ids: Iterable):
+        """Increment the users' versions inside the caller's DB transaction.
+
+        Ids of users that no longer exist are ignored. Rows are locked in id
+        order, so concurrent commits touching the same users cannot deadlock.
+        """
+        user_ids = sorted({str(user_id) for user_id in user_ids})
+        if user_ids:
+            UserDataVersionService._upsert(User.id.in_(user_ids))
+
+    @staticmethod
+    def bump_all():
+        """Increment every user's version (after rebuilding all users' data)."""
+        UserDataVersionService._upsert(None)
+
+    @staticmethod
+    def _upsert(where):
+        source = select(User.id, literal(1), _utc_now()).order_by(User.id)
+        if where is not None:
+            source = source.where(where)
+        stmt = insert(UserDataVersion).from_select(
+            [
+                UserDataVersion.user_id,
+                UserDataVersion.version,
+                UserDataVersion.updated_at,
+            ],
+            source,
+        )
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserDataVersion.user_id],
+                set_={
+                    "version": UserDataVersion.version + 1,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+
+    @staticmethod
+    def get_version(username: str) -> Optional[Tuple[str, int, bool]]:
+        """(user_id, version, settling) for a username, None if the user is unknown.
+
+        Users that were never written are at version 0. `settling` is True while
+        replicas may still lag behind the last bump.
+        """
+        settling = (
+            UserDataVersion.updated_at
+            > _utc_now() - timedelta(seconds=REPLICA_MAX_LAG_SECONDS)
+            if REPLICA_BIND_KEYS
+            else literal(False)
+        )
+        with primary_reads():
+            row = db.session.execute(
+                select(User.id, func.coalesce(UserDataVersion.version, 0), settling)
+                .outerjoin(UserDataVersion, UserDataVersion.user_id == User.id)
+                .where(User.username == username)
+            ).first()
+        if row is None:
+            return None
+        user_id, version, settling = row
+        return str(user_id), version, bool(settling)
+
+
+@event.listens_for(RoutingSession, "before_commit")
+def _bump_written_users(session):
+    # Flush first so the pending ORM writes are in the written set.
+    session.flush()
+    user_ids = get_written_user_ids(session)
+    if user_ids:
+        UserDataVersionService.bump(user_ids)
+
+
+def _etag(user_id: str, version: int) -> str:
+    now = datetime.now()
+    key = "|".join(
+        [
+            request.path,
+            "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True))),
+            user_id,
+            str(version),
+            now.date().isoformat(),
+            datetime.utcnow().date().isoformat(),
+        ]
+    )
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def conditional_on_data_version(view):
+    """Serve the view with a strong ETag from the `username` user's data version.
+
+    Answers 304 Not Modified without calling the view when If-None-Match holds
+    the current tag. Requests without a known username go straight to the view.
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        username = request.args.get("username")
+        found = UserDataVersionService.get_version(username) if username else None
+        if found is None:
+            metrics.inc(
+                "http_conditional_get_total",
+                {"endpoint": request.endpoint, "result": "unversioned"},
+            )
+            return view(*args, **kwargs)
+
+        user_id, version, settling = found
+        track_request_user(user_id)
+        # The body must not come from a profile snapshot older than the tag.
+        UserCache.require_version(username, version)
+        etag = _etag(user_id, version)
+        # Weak comparison, as If-None-Match requires (proxies that compress
+        # responses mark the tag weak).
+        if request.if_none_match.contains_weak(etag):
+            metrics.inc(
+                "http_conditional_get_total",
+                {"endpoint": request.endpoint, "result": "not_modified"},
+            )
+            response = make_response("", 304)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = CACHE_CONTROL
+            return response
+
+        metrics.inc(
+            "http_conditional_get_total",
+            {"endpoint": request.endpoint, "result": "modified"},
+        )
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200 and not settling:
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = CACHE_CONTROL
+        return response
+
+    return wrapper
@@ -1,9 +1,13 @@
 from typing import List
 
+from sqlalchemy.orm import selectinload
+
 from configurations.database_config import db
 from configurations.logging_config import get_logger
 from entities.user import User
 from models.base_response import BaseResponse
+from services.core.card_ledger_service import CardLedgerService
+from services.core.user_cache import UserCache
 
 # Create logger for this module
 logger = get_logger(__name__)
@@ -12,15 +16,24 @@ logger = get_logger(__name__)
 class UserService:
     """Service for handling user-related operations"""
 
+    @staticmethod
+    def _to_dict(user: User) -> dict:
+        """Serialize a user with the ledger balances of their cards."""
+        balances = CardLedgerService.get_balances([card.id for card in user.cards])
+        return user.to_dict(balances)
+
     @staticmethod
     def get_all_users() -> BaseResponse:
         """Get all users from the database"""
         try:
-            users = User.query.all()
+            users = User.query.options(selectinload(User.cards)).all()
+            balances = CardLedgerService.get_balances(
+                [card.id for user in users for card in user.cards]
+            )
             return BaseResponse(
                 is_success=True,
                 message="Users retrieved successfully",
-                data=[user.to_dict() for user in users],
+                data=[user.to_dict(balances) for user in users],
             )
         except Exception as e:
             logger.error(f"Error getting all users: {str(e)}")
@@ -44,7 +57,7 @@ class UserService:
             return BaseResponse(
                 is_success=True,
                 message="User retrieved successfully",
-                data=user.to_dict(),
+                data=UserService._to_dict(user),
             )
         except Exception as e:
             logger.error(f"Error getting user by ID: {str(e)}")
@@ -68,7 +81,7 @@ class UserService:
             return BaseResponse(
                 is_success=True,
                 message="User retrieved successfully",
-                data=user.to_dict(),
+                data=UserService._to_dict(user),
             )
         except Exception as e:
             logger.error(f"Error getting user by username: {str(e)}")
@@ -107,11 +120,12 @@ class UserService:
                 user.location = user_data["location"]
 
             db.session.commit()
+            UserCache.invalidate(username)
 
             return BaseResponse(
                 is_success=True,
                 message="User updated successfully",
-                data=user.to_dict(),
+                data=UserService._to_dict(user),
             )
         except Exception as e:
             db.session.rollback()
@@ -0,0 +1,104 @@
+"""
+In-process metrics registry rendered in the Prometheus text exposition format.
+
+Counters and histograms are keyed by metric name and a sorted label set. Each gunicorn
+worker keeps its own registry, so scrape every worker (or aggregate in Prometheus).
+"""
+
+import bisect
+import threading
+from typing import Dict, Tuple
+
+# Default histogram buckets (seconds), sized for LLM and DB calls.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms with Prometheus text rendering."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}  # name -> (type, help text).
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._histograms: Dict[str, Dict[tuple, list]] = {}
+        self._buckets: Dict[str, tuple] = {}
+
+    def counter(self, name: str, help_text: str):
+        """Declare a counter."""
+        with self._lock:
+            self._help[name] = ("counter", help_text)
+            self._counters.setdefault(name, {})
+
+    def histogram(self, name: str, help_text: str, buckets: tuple = DEFAULT_BUCKETS):
+        """Declare a histogram with the given upper bounds."""
+        with self._lock:
+            self._help[name] = ("histogram", help_text)
+            self._histograms.setdefault(name, {})
+            self._buckets[name] = tuple(sorted(buckets))
+
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1.0):
+        """Increase a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, labels: Dict[str, str], value: float):
+        """Record one observation in a histogram."""
+        key = _label_key(labels)
+        buckets = self._buckets[name]
+        with self._lock:
+            series = self._histograms[name]
+            # Per-bucket counts (non-cumulative), then +Inf, sum and count.
+            state = series.setdefault(key, [0] * (len(buckets) + 1) + [0.0, 0])
+            state[bisect.bisect_left(buckets, value)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in self._counters.items():
+                metric_type, help_text = self._help[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+
+            for name, series in self._histograms.items():
+                metric_type, help_text = self._help[name]
+                buckets = self._buckets[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for key, state in series.items():
+                    cumulative = 0
+                    for bound, count in zip(buckets + ("+Inf",), state):
+                        cumulative += count
+                        le = f'le="{bound}"'
+                        lines.append(
+                            f"{name}_bucket{_format_labels(key, le)} {cumulative}"
+                        )
+                    lines.append(f"{name}_sum{_format_labels(key)} {state[-2]}")
+                    lines.append(f"{name}_count{_format_labels(key)} {state[-1]}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by all services.
+metrics = MetricsRegistry()
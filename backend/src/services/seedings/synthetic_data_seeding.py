@@ -0,0 +1,449 @@
+import csv
+import io
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Iterator, List, Tuple
+
+from configurations.database_config import db
+from configurations.logging_config import get_logger
+from entities.card import Card
+from entities.goal import Goal
+from entities.transaction import Transaction
+from entities.user import User
+from enums import (
+    CardTypeEnum,
+    GoalPriorityEnum,
+    GoalStatusEnum,
+    TransactionDirectionEnum,
+    TransactionStatusEnum,
+    TransactionTypeEnum,
+    UserRoleEnum,
+)
+from services.core.spending_rollup_service import SpendingRollupService
+
+logger = get_logger(__name__)
+
+# Column order shared by the COPY and bulk_insert_mappings writers.
+TRANSACTION_COLUMNS = (
+    "id",
+    "user_id",
+    "amount",
+    "currency",
+    "merchant",
+    "date",
+    "category",
+    "card_id",
+    "status",
+    "external_id",
+    "transaction_type",
+    "transaction_direction",
+    "fee",
+    "processed_at",
+    "sender_info",
+    "receiver_info",
+    "metadata_info",
+    "gateway",
+    "rrn",
+    "description",
+    "is_recurring",
+    "created_at",
+)
+
+# (merchants, category, min amount, max amount, expected count per month).
+SPENDING_PATTERNS = [
+    (["Korzinka", "Makro", "Havas", "Baraka Market"], "Food", 40000, 150000, 10),
+    (["Yandex Go", "Yandex Taxi", "Uzmetro"], "Transportation", 10000, 45000, 18),
+    (
+        ["Rayhon", "Osh Markazi", "Evos", "Meros", "Caffè Nero"],
+        "Food",
+        25000,
+        120000,
+        8,
+    ),
+    (["MediaPark", "Texnomart", "Uzum Market"], "Shopping", 80000, 600000, 2),
+    (["Magic City", "Cinematica", "Netflix"], "Entertainment", 40000, 150000, 2),
+    (["Dori Darmon", "Akfa Medline"], "Healthcare", 30000, 400000, 1),
+    (["Barber Shop", "World Class Gym"], "Services", 50000, 250000, 1),
+]
+
+# (merchant, category, share of salary, day of month, transaction type).
+MONTHLY_BILLS = [
+    ("Landlord Payment", "Housing", 0.25, 1, TransactionTypeEnum.P2P_TRANSFER),
+    ("Toshkent Energy", "Utilities", 0.02, 5, TransactionTypeEnum.P2M_PAYMENT),
+    ("Beeline", "Utilities", 0.01, 8, TransactionTypeEnum.P2M_PAYMENT),
+]
+
+# (name, target as a multiple of monthly salary, months until target date).
+GOAL_TEMPLATES = [
+    ("Emergency Fund", 6, 12),
+    ("New Laptop", 2, 6),
+    ("Summer Vacation", 3, 9),
+    ("Car Down Payment", 12, 24),
+]
+
+SALARY_CHOICES = [4_500_000, 6_000_000, 9_000_000, 12_000_000, 16_500_000, 25_000_000]
+
+
+class SyntheticDataSeedingService:
+    """Generate large, reproducible synthetic datasets for load and query-plan testing.
+
+    Produces N users x M months of transactions. All randomness, ids included,
+    comes from a `random.Random` seeded with the prefix and seed, so the same
+    arguments always produce the same data and different prefixes never share ids.
+    Usernames are `<prefix>_<seed>_<index>`; seeding a prefix and seed that are
+    already in the database is refused. Rows are streamed in batches and written
+    with Postgres COPY when available, otherwise with `bulk_insert_mappings`.
+    """
+
+    def __init__(
+        self, users: int, months: int, seed: int = 42, prefix: str = "synthetic"
+    ):
+        self.users = users
+        self.months = months
+        self.random_seed = seed
+        self.prefix = prefix
+        self.rng = random.Random(f"{prefix}:{seed}")
+
+    def _uuid(self) -> uuid.UUID:
+        """Deterministic UUID4 drawn from the seeded generator."""
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _username_prefix(self) -> str:
+        return f"{self.prefix}_{self.random_seed}_"
+
+    def _build_users_and_cards(self) -> Tuple[List[dict], List[dict]]:
+        """Build user and card rows (two cards per user)."""
+        now = datetime.utcnow()
+        users, cards = [], []
+        for i in range(self.users):
+            user_id = self._uuid()
+            username = f"{self._username_prefix()}{i:07d}"
+            users.append(
+                {
+                    "id": user_id,
+                    "username": username,
+                    "email": f"{username}@example.com",
+                    "first_name": "Synthetic",
+                    "last_name": f"User {i}",
+                    "salary": float(self.rng.choice(SALARY_CHOICES)),
+                    "currency": "UZS",
+                    "age": self.rng.randint(20, 65),
+                    "family_size": self.rng.randint(1, 6),
+                    "role": UserRoleEnum.CLIENT,
+                    "is_deleted": False,
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            for card_type, prefix in (
+                (CardTypeEnum.UZCARD, "8600"),
+                (CardTypeEnum.HUMO, "9860"),
+            ):
+                cards.append(
+                    {
+                        "id": self._uuid(),
+                        "user_id": user_id,
+                        "card_name": f"{card_type.value} Card",
+                        "card_number": f"{prefix}{self.rng.randint(0, 10**12 - 1):012d}",
+                        "balance": float(self.rng.randint(100_000, 20_000_000)),
+                        "currency": "UZS",
+                        "card_type": card_type,
+                        "expiration_date": f"{self.rng.randint(1, 12):02d}/{self.rng.randint(27, 31)}",
+                        "created_at": now,
+                        "updated_at": now,
+                        "is_removed": False,
+                    }
+                )
+        return users, cards
+
+    def _build_goals(self, users: List[dict]) -> List[dict]:
+        """Build 1-3 active goals per user, sized relative to their salary."""
+        now = datetime.utcnow()
+        priorities = list(GoalPriorityEnum)
+        goals = []
+        for user in users:
+            for name, multiple, months in self.rng.sample(
+                GOAL_TEMPLATES, self.rng.randint(1, 3)
+            ):
+                target = round(user["salary"] * multiple, -5)
+                goals.append(
+                    {
+                        "id": self._uuid(),
+                        "user_id": user["id"],
+                        "name": name,
+                        "target_amount": target,
+                        "current_amount": round(target * self.rng.uniform(0, 0.5), -3),
+                        "currency": "UZS",
+                        "target_date": now + timedelta(days=30 * months),
+                        "status": GoalStatusEnum.ACTIVE,
+                        "priority": self.rng.choice(priorities),
+                        "description": f"Synthetic goal: {name}.",
+                        "created_at": now,
+                    }
+                )
+        return goals
+
+    def _month_starts(self) -> List[datetime]:
+        """First day of each generated month, oldest first, ending with the current month."""
+        current = datetime.utcnow().replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        starts = []
+        year, month = current.year, current.month
+        for _ in range(self.months):
+            starts.append(datetime(year, month, 1))
+            year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+        return list(reversed(starts))
+
+    def _generate_transactions(
+        self, users: List[dict], cards: List[dict]
+    ) -> Iterator[tuple]:
+        """Yield transaction rows as tuples in TRANSACTION_COLUMNS order."""
+        rng = self.rng
+        now = datetime.utcnow()
+        month_starts = self._month_starts()
+        approved = TransactionStatusEnum.APPROVED
+        declined = TransactionStatusEnum.DECLINED
+        outgoing = TransactionDirectionEnum.OUTGOING
+        incoming = TransactionDirectionEnum.INCOMING
+        p2m = TransactionTypeEnum.P2M_PAYMENT
+        p2p = TransactionTypeEnum.P2P_TRANSFER
+
+        # Shared JSON payload dicts (one per merchant / card), see _copy_rows.
+        merchant_receivers = {}
+
+        for index, user in enumerate(users):
+            user_id = user["id"]
+            salary = user["salary"]
+            main_card, second_card = cards[2 * index], cards[2 * index + 1]
+            card_parties = {
+                card["id"]: {"type": "CARD", "card_id": str(card["id"])}
+                for card in (main_card, second_card)
+            }
+            # Per-user spending intensity so users are not all identical.
+            intensity = rng.uniform(0.6, 1.4)
+
+            for month_start in month_starts:
+                days_in_month = (
+                    (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+                    - month_start
+                ).days
+
+                def row(
+                    card, amount, merchant, category, direction, type_, day, status
+                ):
+                    date = min(
+                        now,
+                        month_start
+                        + timedelta(
+                            days=day - 1, seconds=rng.randint(8 * 3600, 22 * 3600)
+                        ),
+                    )
+                    card_party = card_parties[card["id"]]
+                    if direction == outgoing:
+                        receiver = merchant_receivers.get(merchant)
+                        if receiver is None:
+                            receiver = {"type": "MERCHANT", "merchant_name": merchant}
+                            merchant_receivers[merchant] = receiver
+                    else:
+                        receiver = card_party
+                    return (
+                        self._uuid(),
+                        user_id,
+                        float(amount),
+                        "UZS",
+                        merchant,
+                        date,
+                        category,
+                        card["id"],
+                        status,
+                        f"syn_{rng.getrandbits(48):012x}",
+                        type_,
+                        direction,
+                        0.0,
+                        date,
+                        card_party,
+                        receiver,
+                        None,
+                        "synthetic",
+                        None,
+                        f"{category} at {merchant}",
+                        False,
+                        date,
+                    )
+
+                # Salary on the 25th (skip if it is still in the future).
+                if month_start.replace(day=25) <= now:
+                    yield row(
+                        main_card,
+                        salary,
+                        "Employer Salary",
+                        "Income",
+                        incoming,
+                        p2p,
+                        25,
+                        approved,
+                    )
+
+                for merchant, category, share, day, type_ in MONTHLY_BILLS:
+                    if month_start.replace(day=day) <= now:
+                        amount = round(salary * share * rng.uniform(0.9, 1.1), -3)
+                        yield row(
+                            main_card,
+                            amount,
+                            merchant,
+                            category,
+                            outgoing,
+                            type_,
+                            day,
+                            approved,
+                        )
+
+                for merchants, category, low, high, per_month in SPENDING_PATTERNS:
+                    expected = per_month * intensity
+                    count = int(expected) + (1 if rng.random() < expected % 1 else 0)
+                    for _ in range(count):
+                        day = rng.randint(1, days_in_month)
+                        if month_start + timedelta(days=day - 1) > now:
+                            continue
+                        card = main_card if rng.random() < 0.7 else second_card
+                        status = approved if rng.random() < 0.98 else declined
+                        yield row(
+                            card,
+                            round(rng.uniform(low, high), -2),
+                            rng.choice(merchants),
+                            category,
+                            outgoing,
+                            p2m,
+                            day,
+                            status,
+                        )
+
+    @staticmethod
+    def _copy_rows(rows: List[tuple]):
+        """Write a batch of transaction rows with Postgres COPY ... FROM STDIN (CSV)."""
+        # JSON payloads are shared dict objects (one per card/merchant), so each is
+        # serialized once per batch instead of once per row.
+        json_cache = {}
+
+        def to_json(value):
+            if value is None:
+                return ""
+            key = id(value)
+            if key not in json_cache:
+                json_cache[key] = json.dumps(value)
+            return json_cache[key]
+
+        def to_text(value):
+            return "" if value is None else value
+
+        converters = []
+        for column in TRANSACTION_COLUMNS:
+            if column in ("id", "user_id", "card_id"):
+                converters.append(str)
+            elif column in ("status", "transaction_type", "transaction_direction"):
+                converters.append(attrgetter("value"))
+            elif column in ("date", "processed_at", "created_at"):
+                converters.append(datetime.isoformat)
+            elif column in ("sender_info", "receiver_info", "metadata_info"):
+                converters.append(to_json)
+            elif column == "is_recurring":
+                converters.append(lambda value: "true" if value else "false")
+            else:
+                converters.append(to_text)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(
+            [convert(value) for convert, value in zip(converters, r)] for r in rows
+        )
+        buffer.seek(0)
+
+        connection = db.session.connection().connection
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY transactions ({', '.join(TRANSACTION_COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+
+    @staticmethod
+    def _bulk_insert_rows(rows: List[tuple]):
+        """Write a batch of transaction rows with a single executemany."""
+        db.session.bulk_insert_mappings(
+            Transaction, [dict(zip(TRANSACTION_COLUMNS, r)) for r in rows]
+        )
+
+    def seed(self, method: str = "auto", batch_size: int = 20000) -> int:
+        """Generate and insert the dataset. Returns the number of transactions written.
+
+        Args:
+            method: "copy" (Postgres only), "bulk" (bulk_insert_mappings) or "auto".
+            batch_size: Number of transactions per COPY/executemany batch and commit.
+        """
+        dialect = db.engine.dialect.name
+        if method == "auto":
+            method = "copy" if dialect == "postgresql" else "bulk"
+        if method == "copy" and dialect != "postgresql":
+            raise ValueError("COPY is only supported on PostgreSQL.")
+        write_batch = self._copy_rows if method == "copy" else self._bulk_insert_rows
+
+        # The same prefix and seed give the same ids, so a second run would
+        # collide on the primary keys halfway through.
+        existing = User.query.filter(
+            User.username.startswith(self._username_prefix(), autoescape=True)
+        ).count()
+        if existing:
+            raise ValueError(
+                f"{existing} synthetic users with prefix={self.prefix!r} and "
+                f"seed={self.random_seed} already exist; use another seed or "
+                "prefix, or clean the database first."
+            )
+
+        logger.info(
+            f"Generating synthetic data: {self.users} users x {self.months} months "
+            f"(seed={self.random_seed}, method={method}, batch_size={batch_size})."
+        )
+        started = time.perf_counter()
+
+        try:
+            users, cards = self._build_users_and_cards()
+            db.session.bulk_insert_mappings(User, users)
+            db.session.bulk_insert_mappings(Card, cards)
+            db.session.bulk_insert_mappings(Goal, self._build_goals(users))
+            db.session.commit()
+
+            total = 0
+            batch = []
+            for txn in self._generate_transactions(users, cards):
+                batch.append(txn)
+                if len(batch) >= batch_size:
+                    write_batch(batch)
+                    db.session.commit()
+                    total += len(batch)
+                    batch = []
+                    logger.info(f"Inserted {total} synthetic transactions...")
+            if batch:
+                write_batch(batch)
+                db.session.commit()
+                total += len(batch)
+
+            # Bulk writes bypass TransactionService, so rebuild the rollup for them.
+            SpendingRollupService.rebuild([u["id"] for u in users])
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to seed synthetic data: {str(e)}")
+            raise
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Seeded {self.users} users, {len(cards)} cards and {total} transactions "
+            f"in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)."
+        )
+        return total
@@ -8,6 +8,7 @@ from entities.card import Card
 from entities.transaction import Transaction
 from entities.user import User
 from enums import TransactionDirectionEnum, TransactionStatusEnum, TransactionTypeEnum
+from services.core.spending_rollup_service import SpendingRollupService
 
 logger = get_logger(__name__)
 
@@ -51,7 +52,7 @@ class TransactionSeedingService:
 
             transactions = []
 
-            # Helper to create a transaction.
+            # Helper to build a transaction row (inserted in bulk below).
             def create_txn(
                 card,
                 amount,
@@ -63,28 +64,31 @@ class TransactionSeedingService:
                 status=TransactionStatusEnum.APPROVED,
             ):
                 date = datetime.utcnow() - timedelta(days=date_offset_days)
-                return Transaction(
-                    user_id=user.id,
-                    external_id=f"seed_{uuid.uuid4().hex[:12]}",
-                    transaction_type=type_,
-                    transaction_direction=direction,
-                    status=status,
-                    amount=amount,
-                    currency=card.currency,
-                    fee=0.0,
-                    description=f"{category} at {merchant}",
-                    processed_at=date,
-                    created_at=date,
-                    card_id=card.id,
-                    merchant=merchant,
-                    category=category,
-                    sender_info={"type": "CARD", "card_id": str(card.id)},
-                    receiver_info=(
+                return {
+                    "id": uuid.uuid4(),
+                    "user_id": user.id,
+                    "external_id": f"seed_{uuid.uuid4().hex[:12]}",
+                    "transaction_type": type_,
+                    "transaction_direction": direction,
+                    "status": status,
+                    "amount": amount,
+                    "currency": card.currency,
+                    "fee": 0.0,
+                    "description": f"{category} at {merchant}",
+                    "date": date,
+                    "processed_at": date,
+                    "created_at": date,
+                    "card_id": card.id,
+                    "merchant": merchant,
+                    "category": category,
+                    "sender_info": {"type": "CARD", "card_id": str(card.id)},
+                    "receiver_info": (
                         {"type": "MERCHANT", "merchant_name": merchant}
                         if direction == TransactionDirectionEnum.OUTGOING
                         else {"type": "CARD", "card_id": str(card.id)}
                     ),
-                )
+                    "is_recurring": False,
+                }
 
             # Generate history for last 90 days (3 months).
             for day in range(90):
@@ -372,19 +376,11 @@ class TransactionSeedingService:
                     )
                 )
 
-            # Add all to session.
-            for txn in transactions:
-
-                # Check if similar transaction exists (optional, but good for idempotency if running multiple times).
-                # For seeding, we might just skip check or check by external_id if we kept it consistent.
-                # Since external_id is random, we'll just add.
-                # To prevent duplicates on re-run, we could delete existing transactions for this user first?
-                # Or just check count.
-                # This is handled in lines 29-36 currently.
-
-                db.session.add(txn)
-
+            # Insert all rows in one executemany instead of one ORM object at a time.
+            # Duplicate runs are prevented by the existing-count check above.
+            db.session.bulk_insert_mappings(Transaction, transactions)
             db.session.commit()
+            SpendingRollupService.rebuild({t["user_id"] for t in transactions})
             logger.info(f"Seeded {len(transactions)} transactions.")
 
         except Exception as e:
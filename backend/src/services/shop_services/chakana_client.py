@@ -1,3 +1,4 @@
+import os
 from typing import List
 
 import requests
@@ -17,7 +18,9 @@ class ChakanaClient:
 
     def __init__(self):
         """Initialize the Chakana client."""
-        self.base_url = "https://api.chakana.uz/v1/product/new-search"
+        self.base_url = os.getenv(
+            "CHAKANA_API_URL", "https://api.chakana.uz/v1/product/new-search"
+        )
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Accept": "application/json",
@@ -39,7 +42,9 @@ class ChakanaClient:
 
         try:
             logger.info(f"Searching Chakana for: {query}")
-            response = requests.get(self.base_url, params=params, headers=self.headers, verify=False)
+            response = requests.get(
+                self.base_url, params=params, headers=self.headers, verify=False
+            )
             response.raise_for_status()
 
             data = response.json()
@@ -59,10 +64,18 @@ class ChakanaClient:
                         code=str(item.get("merchant_product_id", "")),
                         sale_price=item.get("price_full", 0),
                         image=item.get("image", ""),
-                        availability="in_stock" if item.get("offers_count", 0) > 0 else "out_of_stock",
+                        availability=(
+                            "in_stock"
+                            if item.get("offers_count", 0) > 0
+                            else "out_of_stock"
+                        ),
                         old_price=item.get("old_price", 0),
-                        reviews_count=item.get("product_rating", {}).get("count_rating", 0),
-                        reviews_average=item.get("product_rating", {}).get("total_rating", 0),
+                        reviews_count=item.get("product_rating", {}).get(
+                            "count_rating", 0
+                        ),
+                        reviews_average=item.get("product_rating", {}).get(
+                            "total_rating", 0
+                        ),
                         all_count=item.get("offers_count", 0),
                     )
                     products.append(product)
@@ -79,4 +92,3 @@ class ChakanaClient:
         except Exception as e:
             logger.error(f"Error parsing Chakana response: {e}")
             return []
-
@@ -2,8 +2,6 @@ import math
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from langchain_core.prompts import ChatPromptTemplate
-
 from configurations.logging_config import get_logger
 from models.shop_models import (
     FilteredProductList,
@@ -12,7 +10,8 @@ from models.shop_models import (
     ShopInsight,
     ShopSearchParams,
 )
-from services.ai_services.llm_client import LLMClient
+from services.ai_services.llm_client import LLMClient, build_prompt
+from services.ai_services.llm_telemetry import invoke_chain
 from services.shop_services.chakana_client import ChakanaClient
 from services.shop_services.texnomart_client import TexnomartClient
 
@@ -157,12 +156,10 @@ class ShopService:
             system_prompt = _load_prompt("shop_search_params_system.md")
             user_prompt_template = _load_prompt("shop_search_params_user.md")
 
-            prompt = ChatPromptTemplate.from_messages(
-                [("system", system_prompt), ("user", user_prompt_template)]
-            )
+            prompt = build_prompt(system_prompt, user_prompt_template)
 
             chain = prompt | structured_llm
-            return chain.invoke({"query": user_query})
+            return invoke_chain(chain, {"query": user_query}, "shop_search_params")
 
         except Exception as e:
             logger.error(f"Params extraction failed: {e}")
@@ -187,12 +184,14 @@ class ShopService:
                 ]  # Limit context
             )
 
-            prompt = ChatPromptTemplate.from_messages(
-                [("system", system_prompt), ("user", user_prompt_template)]
-            )
+            prompt = build_prompt(system_prompt, user_prompt_template)
 
             chain = prompt | structured_llm
-            response = chain.invoke({"query": user_query, "products": product_str})
+            response = invoke_chain(
+                chain,
+                {"query": user_query, "products": product_str},
+                "shop_filter_results",
+            )
             return response.relevant_ids
 
         except Exception as e:
@@ -226,18 +225,18 @@ class ShopService:
 
             installments_str = "\n".join(installments)
 
-            prompt = ChatPromptTemplate.from_messages(
-                [("system", system_prompt), ("user", user_prompt_template)]
-            )
+            prompt = build_prompt(system_prompt, user_prompt_template)
 
             chain = prompt | structured_llm
-            response = chain.invoke(
+            response = invoke_chain(
+                chain,
                 {
                     "query": user_query,
                     "products": product_str,
                     "installments": installments_str,
                     "language": language,
-                }
+                },
+                "shop_insights",
             )
             return response.insight_text
 
@@ -1,3 +1,4 @@
+import os
 from typing import Optional
 
 import requests
@@ -13,7 +14,9 @@ class TexnomartClient:
 
     def __init__(self):
         """Initialize the Texnomart client."""
-        self.base_url = "https://gw.texnomart.uz/api/common/v1/search/result"
+        self.base_url = os.getenv(
+            "TEXNOMART_API_URL", "https://gw.texnomart.uz/api/common/v1/search/result"
+        )
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Accept": "application/json",
@@ -7,7 +7,13 @@ import Link from 'next/link';
 import { Flag, Plus, Wallet } from 'lucide-react';
 import { useTranslations } from 'next-intl';
 
-import { Goal, createGoal, updateGoal } from '@/lib/services/goals';
+import {
+  Goal,
+  GoalTimelines,
+  createGoal,
+  getGoalTimelines,
+  updateGoal,
+} from '@/lib/services/goals';
 import { CURRENCIES, GOAL_PRIORITIES, type Currency } from '@/lib/enums';
 import { cn } from '@/lib/utils';
 
@@ -34,8 +40,11 @@ import {
   SelectValue,
 } from '@/components/ui/select';
 
+type GoalPrediction = GoalTimelines['goals'][number];
+
 type Props = {
   initialGoals: Goal[];
+  initialTimelines: GoalPrediction[];
   userId: string;
 };
 
@@ -114,9 +123,16 @@ function goalPercent(goal: Goal) {
   return Math.min(100, Math.max(0, Math.round((goal.current_amount / goal.target_amount) * 100)));
 }
 
-export function GoalsClient({ initialGoals, userId }: Props) {
+function byGoalId(timelines: GoalPrediction[]) {
+  return Object.fromEntries(timelines.map((timeline) => [timeline.goal_id, timeline]));
+}
+
+export function GoalsClient({ initialGoals, initialTimelines, userId }: Props) {
   const t = useTranslations('goals');
   const [goals, setGoals] = useState<Goal[]>(initialGoals);
+  const [predictions, setPredictions] = useState<Record<string, GoalPrediction>>(() =>
+    byGoalId(initialTimelines)
+  );
   const [createOpen, setCreateOpen] = useState(false);
   const [fundsOpenFor, setFundsOpenFor] = useState<Goal | null>(null);
   const [createSubmitting, setCreateSubmitting] = useState(false);
@@ -135,6 +151,16 @@ export function GoalsClient({ initialGoals, userId }: Props) {
 
   const hasGoals = goals.length > 0;
 
+  // Goals share monthly savings, so any change moves every goal's prediction
+  const refreshPredictions = async () => {
+    try {
+      const timelines = await getGoalTimelines();
+      setPredictions(byGoalId(timelines.goals));
+    } catch (error) {
+      console.error(error);
+    }
+  };
+
   const statusTone = (status: Goal['status']) => STATUS_TONES[status] ?? STATUS_TONES.Active;
   const priorityTone = (priority: Goal['priority']) =>
     PRIORITY_TONES[priority] ?? PRIORITY_TONES.Medium;
@@ -163,6 +189,7 @@ export function GoalsClient({ initialGoals, userId }: Props) {
 
       const created = await createGoal(payload);
       setGoals((prev) => [created, ...prev]);
+      void refreshPredictions();
       toast.success(t('goalCreated'));
       setCreateForm({
         name: '',
@@ -208,6 +235,7 @@ export function GoalsClient({ initialGoals, userId }: Props) {
       });
 
       setGoals((prev) => prev.map((g) => (g.id === updated.id ? updated : g)));
+      void refreshPredictions();
       toast.success(t('fundsAdded'));
       setFundsForm({ amount: '' });
       setFundsOpenFor(null);
@@ -357,6 +385,7 @@ export function GoalsClient({ initialGoals, userId }: Props) {
             const percent = goalPercent(goal);
             const statusToneClasses = statusTone(goal.status);
             const priorityToneClasses = priorityTone(goal.priority);
+            const prediction = predictions[goal.id];
 
             return (
               <Card
@@ -422,6 +451,25 @@ export function GoalsClient({ initialGoals, userId }: Props) {
                     </span>
                   </div>
 
+                  {prediction ? (
+                    <>
+                      <div className="flex items-center justify-between text-xs text-muted-foreground">
+                        <span>{t('predictedFinish')}</span>
+                        <span className="text-foreground font-medium">
+                          {prediction.deterministic_months === null
+                            ? t('notReachable')
+                            : t('inMonths', { months: Math.ceil(prediction.deterministic_months) })}
+                        </span>
+                      </div>
+                      <div className="flex items-center justify-between text-xs text-muted-foreground">
+                        <span>{t('successRate')}</span>
+                        <span className="text-foreground font-medium">
+                          {prediction.success_probability}%
+                        </span>
+                      </div>
+                    </>
+                  ) : null}
+
                   <Button
                     variant="outline"
                     size="sm"
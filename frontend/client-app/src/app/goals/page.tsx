@@ -1,7 +1,7 @@
 import { getTranslations } from 'next-intl/server';
 
 import { GoalsClient } from './goals-client';
-import { getGoals } from '@/lib/services/goals';
+import { getGoals, getGoalTimelines } from '@/lib/services/goals';
 import { getUser } from '@/lib/services/users';
 import { ErrorState } from '@/components/ui/error-state';
 
@@ -11,8 +11,22 @@ export default async function GoalsPage() {
   const t = await getTranslations('goals');
 
   try {
-    const [goals, user] = await Promise.all([getGoals(), getUser()]);
-    return <GoalsClient initialGoals={goals} userId={user.id} />;
+    // One batched timeline call for all goals; the page still loads without it
+    const [goals, user, timelines] = await Promise.all([
+      getGoals(),
+      getUser(),
+      getGoalTimelines().catch((error) => {
+        console.error('Failed to load goal timelines:', error);
+        return null;
+      }),
+    ]);
+    return (
+      <GoalsClient
+        initialGoals={goals}
+        initialTimelines={timelines?.goals ?? []}
+        userId={user.id}
+      />
+    );
   } catch (error) {
     console.error(error);
     return (
@@ -58,8 +58,30 @@ const timelineDataPointSchema = z.object({
   p90_pessimistic: z.number(),
 });
 
+// Column-oriented timeline: one array per series, aligned by index.
+const timelineColumnsSchema = z.object({
+  month: z.array(z.number()),
+  deterministic: z.array(z.number()),
+  p10_optimistic: z.array(z.number()),
+  p50_median: z.array(z.number()),
+  p90_pessimistic: z.array(z.number()),
+});
+
+function timelineRows(
+  columns?: z.infer<typeof timelineColumnsSchema>
+): z.infer<typeof timelineDataPointSchema>[] {
+  if (!columns) return [];
+  return columns.month.map((month, index) => ({
+    month,
+    deterministic: columns.deterministic[index],
+    p10_optimistic: columns.p10_optimistic[index],
+    p50_median: columns.p50_median[index],
+    p90_pessimistic: columns.p90_pessimistic[index],
+  }));
+}
+
 // Timeline data (fast, no LLM)
-const goalTimelineSchema = z.object({
+const goalTimelineBaseSchema = z.object({
   goal: z
     .object({
       name: z.string(),
@@ -82,9 +104,16 @@ const goalTimelineSchema = z.object({
   deterministic_months: z.number().optional(),
   success_probability: z.number().optional(),
   real_monthly_contribution: z.number().optional(),
-  timeline_data: z.array(timelineDataPointSchema),
+  timeline: timelineColumnsSchema.optional(),
+  // Row view, only sent with `timeline_view=rows`; derived from `timeline` otherwise.
+  timeline_data: z.array(timelineDataPointSchema).optional(),
 });
 
+const goalTimelineSchema = goalTimelineBaseSchema.transform((data) => ({
+  ...data,
+  timeline_data: data.timeline_data ?? timelineRows(data.timeline),
+}));
+
 const goalTimelineResponseSchema = z.object({
   is_success: z.boolean(),
   message: z.string(),
@@ -92,6 +121,38 @@ const goalTimelineResponseSchema = z.object({
   errors: z.array(z.string()).optional().nullable(),
 });
 
+// All active goals in one simulation (fast, no LLM)
+const goalTimelinesSchema = z.object({
+  real_monthly_contribution: z.number(),
+  forecast: z
+    .object({
+      method: z.string(),
+      months_observed: z.number(),
+      expected_income: z.number(),
+      expected_spending: z.number(),
+    })
+    .optional(),
+  goals: z.array(
+    z.object({
+      goal_id: z.string(),
+      name: z.string(),
+      priority: z.enum(GOAL_PRIORITIES).nullable(),
+      remaining_amount: z.number(),
+      monthly_allocation: z.number(),
+      deterministic_months: z.number().nullable(),
+      monte_carlo: monteCarloResultSchema,
+      success_probability: z.number(),
+    })
+  ),
+});
+
+const goalTimelinesResponseSchema = z.object({
+  is_success: z.boolean(),
+  message: z.string(),
+  data: goalTimelinesSchema,
+  errors: z.array(z.string()).optional().nullable(),
+});
+
 // Timeline interpretation (LLM-based, separate endpoint)
 const goalTimelineInterpretationSchema = z.object({
   interpretation: z.string(),
@@ -154,7 +215,8 @@ const updateGoalBodySchema = z.object({
 export type Goal = z.infer<typeof goalSchema>;
 export type CreateGoalBody = z.infer<typeof createGoalBodySchema>;
 export type UpdateGoalBody = z.infer<typeof updateGoalBodySchema>;
-export type GoalTimeline = z.infer<typeof goalTimelineSchema>;
+export type GoalTimeline = z.output<typeof goalTimelineSchema>;
+export type GoalTimelines = z.infer<typeof goalTimelinesSchema>;
 export type GoalTimelineInterpretation = z.infer<typeof goalTimelineInterpretationSchema>;
 export type GoalRecommendations = z.infer<typeof goalRecommendationsSchema>;
 export type SingleGoal = z.infer<typeof goalSchema>;
@@ -208,6 +270,19 @@ export async function getGoalTimeline(
   return parsed.data;
 }
 
+/**
+ * Get timeline predictions for all active goals in one request (fast, no LLM)
+ * Goals share monthly savings by priority in a single Monte Carlo simulation.
+ */
+export async function getGoalTimelines(username = DEFAULT_USERNAME): Promise<GoalTimelines> {
+  const result = await apiFetch<unknown>(`/api/goals/timelines?username=${username}`, {
+    method: 'GET',
+  });
+
+  const parsed = goalTimelinesResponseSchema.parse(result);
+  return parsed.data;
+}
+
 /**
  * Get goal timeline interpretation (LLM-based, may take a few seconds)
  * Returns AI-generated interpretation of the Monte Carlo simulation results.